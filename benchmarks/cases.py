@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import itertools
+import os
+import re
+import subprocess
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+# Each case is a setup function returning the zero-argument operation to time. Setup runs
+# once, inside a scratch working directory with a freshly migrated database.
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    name: str
+    setup: Callable[[Path], Callable[[], Any]]
+    threshold_pct: float | None = None
+
+
+# Checks are pass/fail assertions run before any timing, in the same kind of scratch directory.
+# A check raises AssertionError with a readable message when it fails.
+@dataclass(frozen=True)
+class BenchCheck:
+    name: str
+    run: Callable[[Path], None]
+
+
+CASES: list[BenchCase] = []
+CHECKS: list[BenchCheck] = []
+
+
+def case(name: str, threshold_pct: float | None = None):
+    def register(setup: Callable[[Path], Callable[[], Any]]) -> Callable[[Path], Callable[[], Any]]:
+        CASES.append(BenchCase(name, setup, threshold_pct))
+        return setup
+
+    return register
+
+
+def check(name: str):
+    def register(run: Callable[[Path], None]) -> Callable[[Path], None]:
+        CHECKS.append(BenchCheck(name, run))
+        return run
+
+    return register
+
+
+def _sample_rows(workdir: Path, rows: int = 500) -> list[dict]:
+    from cold_ai.services.benchmark import generate_synthetic_leads
+    from cold_ai.services.csv_io import read_csv_rows
+
+    path = workdir / "bench_leads.csv"
+    if not path.exists():
+        generate_synthetic_leads(path, rows, seed=7)
+    return read_csv_rows(path)
+
+
+def _sample_leads(workdir: Path) -> list[dict]:
+    from cold_ai.services.import_service import ALIASES, _first_present
+
+    return [
+        {
+            "email": _first_present(row, ALIASES["email"]),
+            "phone": _first_present(row, ALIASES["phone"]),
+            "full_name": _first_present(row, ALIASES["full_name"]),
+            "specialty": _first_present(row, ALIASES["specialty"]),
+            "city": _first_present(row, ALIASES["city"]),
+            "address": _first_present(row, ALIASES["address"]),
+        }
+        for row in _sample_rows(workdir)
+    ]
+
+
+_SAMPLE_BODY = (
+    "Hello Dr Benali,\n\n"
+    "Many cardiology practices in Oran lose follow-ups between visits. We built a short weekly routine "
+    "that keeps patients on track without adding work for your front desk.\n\n"
+    "Would you be open to a 15-minute call next week to see if it fits your practice?\n\n"
+    "Best regards,\nFaycal"
+)
+
+
+@case("import_service._normalize_key")
+def normalize_key(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.services.import_service import _normalize_key
+
+    headers = list(_sample_rows(workdir)[0].keys())
+    return lambda: [_normalize_key(header) for header in headers]
+
+
+@case("import_service._first_present")
+def first_present(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.services.import_service import ALIASES, _first_present
+
+    rows = itertools.cycle(_sample_rows(workdir))
+    keys = ALIASES["specialty"]
+    return lambda: _first_present(next(rows), keys)
+
+
+@case("LeadIntelligenceAgent.enrich")
+def enrich(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.agents.lead_intelligence_agent import LeadIntelligenceAgent
+
+    agent = LeadIntelligenceAgent()
+    leads = itertools.cycle(_sample_leads(workdir))
+    return lambda: agent.enrich(next(leads))
+
+
+@case("CopywriterAgent.draft")
+def copywriter_draft(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.agents.copywriter_agent import CopywriterAgent
+
+    agent = CopywriterAgent()
+    subject_template = "A practical idea for {{ specialty }} teams in {{ city }}"
+    body_template = (
+        "Hello {{ first_name }},\n\n{% if personalization_hook %}{{ personalization_hook }}\n\n{% endif %}"
+        "Many {{ specialty }} practices in {{ city }} use a short weekly routine to follow up with patients.\n\n"
+        "Would you be open to a 15-minute call next week?\n\n{{ sender_name }}"
+    )
+    context = {
+        "first_name": "Amine",
+        "specialty": "cardiology",
+        "city": "Oran",
+        "personalization_hook": "I noticed your clinic recently expanded its cardiology unit.",
+        "sender_name": "Faycal",
+    }
+    return lambda: agent.draft(subject_template, body_template, context)
+
+
+@case("guardrails._contains_blocked_terms")
+def contains_blocked_terms(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.services.guardrails import _contains_blocked_terms
+
+    return lambda: _contains_blocked_terms(_SAMPLE_BODY)
+
+
+@case("search_outreach_knowledge")
+def knowledge_search(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.services.outreach_knowledge_base import search_outreach_knowledge
+
+    queries = itertools.cycle(["follow up cadence", "cardiology hook", "price objection", "whatsapp opening"])
+    return lambda: search_outreach_knowledge(next(queries), limit=5)
+
+
+@case("build_memory_seed")
+def memory_seed(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.services.outreach_memory import build_memory_seed
+
+    context = {"owner_key": "global", "channel": "email", "purpose": "demo", "specialty": "cardiology"}
+    return lambda: build_memory_seed(context, "A practical idea", _SAMPLE_BODY, 0.84, "draft_supervised")
+
+
+class _NoopTool:
+    name = "web_search"
+
+    def run(self, payload: dict[str, Any]) -> Any:
+        from cold_ai.tools.base import ToolResult
+
+        return ToolResult(ok=True, tool=self.name, data=payload, error=None)
+
+
+@case("ToolRegistry.run")
+def tool_registry_run(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.tools.registry import ToolRegistry
+
+    registry = ToolRegistry()
+    registry.register(_NoopTool())
+    # Distinct payloads keep loop protection from short-circuiting the call.
+    payloads = itertools.cycle([{"query": f"cardiology clinic {index}"} for index in range(64)])
+    return lambda: registry.run("web_search", next(payloads))
+
+
+# Inserts run the way the pipeline issues them: 100 per unit of work, one commit per batch.
+INSERT_BATCH = 100
+
+
+@case("LeadRepository.upsert_many x100", threshold_pct=50)
+def lead_upsert(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.agents.lead_intelligence_agent import LeadIntelligenceAgent
+    from cold_ai.repositories import LeadRepository
+
+    agent = LeadIntelligenceAgent()
+    template = [agent.enrich(lead) for lead in _sample_leads(workdir)][:INSERT_BATCH]
+    counter = itertools.count()
+
+    def run() -> Any:
+        batch = next(counter)
+        leads = [
+            {**lead, "email": f"bench{batch}.{index}@example.dz", "phone": "", "source_hash": f"bench-{batch}-{index}"}
+            for index, lead in enumerate(template)
+        ]
+        return LeadRepository().upsert_many(leads)
+
+    return run
+
+
+def _draft_targets(count: int) -> list[int]:
+    from cold_ai.repositories import LeadRepository, _connection
+
+    leads = [
+        {"email": f"draft-target{index}@example.dz", "full_name": f"Dr Target {index}", "source_hash": f"target-{index}"}
+        for index in range(count)
+    ]
+    LeadRepository().upsert_many(leads)
+    with _connection() as conn:
+        rows = conn.execute("SELECT id FROM leads WHERE source_hash LIKE 'target-%' ORDER BY id").fetchall()
+    return [int(row["id"]) for row in rows]
+
+
+@case("DraftRepository.create_or_ignore x100", threshold_pct=50)
+def draft_insert(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.repositories import CampaignRepository, DraftRepository, UnitOfWork
+
+    lead_ids = _draft_targets(INSERT_BATCH * 20)
+    batches = itertools.count()
+    campaign = {"id": 0}
+
+    def run() -> Any:
+        batch = next(batches)
+        offset = (batch % 20) * INSERT_BATCH
+        if offset == 0:
+            # Every lead already has a draft in the current campaign; start a new one.
+            campaign["id"] = CampaignRepository().create(f"Bench drafts {batch}", "", "email", "Hi", "Hello")
+        repository = DraftRepository()
+        with UnitOfWork(batch_size=INSERT_BATCH) as unit_of_work:
+            for lead_id in lead_ids[offset : offset + INSERT_BATCH]:
+                unit_of_work.add(
+                    partial(repository.create_or_ignore, campaign["id"], lead_id, "Subject", _SAMPLE_BODY, 0.8)
+                )
+
+    return run
+
+
+@case("EventRepository.log x100", threshold_pct=50)
+def event_insert(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.repositories import EventRepository, UnitOfWork
+
+    payload = {"campaign_id": 1, "template_source": "specialty", "rewrite_status": "disabled", "supervisor_score": 0.8}
+
+    def run() -> Any:
+        repository = EventRepository()
+        with UnitOfWork(batch_size=INSERT_BATCH) as unit_of_work:
+            for _ in range(INSERT_BATCH):
+                unit_of_work.add(partial(repository.log, "draft_created", payload, None))
+
+    return run
+
+
+@case("OutreachMemoryRepository.add_memory x100", threshold_pct=50)
+def memory_insert(workdir: Path) -> Callable[[], Any]:
+    from cold_ai.repositories import OutreachMemoryRepository, UnitOfWork
+
+    def run() -> Any:
+        repository = OutreachMemoryRepository()
+        with UnitOfWork(batch_size=INSERT_BATCH) as unit_of_work:
+            for index in range(INSERT_BATCH):
+                unit_of_work.add(
+                    partial(
+                        repository.add_memory,
+                        "global",
+                        "email",
+                        "demo",
+                        "cardiology",
+                        f"Opener {index}: {_SAMPLE_BODY[:120]}",
+                        0.84,
+                        "draft_supervised",
+                    )
+                )
+
+    return run
+
+
+# CLI startup is measured in a fresh interpreter; cron-driven commands pay it on every run.
+CLI_FORBIDDEN_IMPORTS = ("fastapi", "starlette", "uvicorn")
+_SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(_SRC_DIR), os.getenv("PYTHONPATH")]))}
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True)
+
+
+@check("cold_ai.cli does not import the web stack")
+def cli_imports(workdir: Path) -> None:
+    # -X importtime lists every module imported, as "import time: self | cumulative | name".
+    report = _python("-X", "importtime", "-c", "import cold_ai.cli").stderr
+    modules = {line.rsplit("|", 1)[-1].strip() for line in report.splitlines() if line.startswith("import time:")}
+    loaded = sorted(set(CLI_FORBIDDEN_IMPORTS) & modules)
+    assert not loaded, f"importing cold_ai.cli loads {', '.join(loaded)}; import them inside the command instead"
+
+
+@case("import cold_ai.cli (fresh interpreter)", threshold_pct=50)
+def cli_import_time(workdir: Path) -> Callable[[], Any]:
+    return partial(_python, "-c", "import cold_ai.cli")
+
+
+# The repository calls below are run for real and every SELECT they issue is planned with
+# EXPLAIN QUERY PLAN, so both a rewritten query and a dropped index fail the check.
+_PLAN_NOW = "2100-01-01T00:00:00+00:00"
+PLAN_EXPECTATIONS: list[tuple[str, Callable[[Any], Any], str]] = [
+    ("DraftRepository.iter_due", lambda repos: list(repos.DraftRepository().iter_due(_PLAN_NOW)), "idx_drafts_due"),
+    (
+        "DraftRepository.iter_due(campaign_id)",
+        lambda repos: list(repos.DraftRepository().iter_due(_PLAN_NOW, campaign_id=1)),
+        "idx_drafts_due",
+    ),
+    (
+        "DraftRepository.iter_for_campaign",
+        lambda repos: list(repos.DraftRepository().iter_for_campaign(1)),
+        "idx_drafts_campaign",
+    ),
+    (
+        "LeadRepository.list_for_drafting(email)",
+        lambda repos: repos.LeadRepository().list_for_drafting(10, "email"),
+        "idx_leads_email_reachable",
+    ),
+    (
+        "LeadRepository.list_for_drafting(whatsapp)",
+        lambda repos: repos.LeadRepository().list_for_drafting(10, "whatsapp"),
+        "idx_leads_phone_reachable",
+    ),
+    (
+        "UserRepository.get_by_email",
+        lambda repos: repos.UserRepository().get_by_email("Someone@Example.com"),
+        "idx_users_email_lower",
+    ),
+    (
+        "OutreachMemoryRepository.list_for_context",
+        lambda repos: repos.OutreachMemoryRepository().list_for_context("global", "email", "demo", "cardiology"),
+        "idx_outreach_memory_context",
+    ),
+    (
+        "EventRepository.list_for_campaign_between",
+        lambda repos: repos.EventRepository().list_for_campaign_between(1, 0, 1_000),
+        "idx_events_draft",
+    ),
+    (
+        "EventRepository.list_payloads_for_campaign",
+        lambda repos: repos.EventRepository().list_payloads_for_campaign(1, "draft_created", 5),
+        "idx_events_draft",
+    ),
+]
+
+
+def _traced_selects(call: Callable[[Any], Any]) -> list[str]:
+    import cold_ai.repositories as repos
+
+    statements: list[str] = []
+    get_connection = repos.get_connection
+
+    def traced_connection():
+        conn = get_connection()
+        # The trace callback receives the statement with its parameters already bound.
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    repos.get_connection = traced_connection
+    try:
+        call(repos)
+    finally:
+        repos.get_connection = get_connection
+    return [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+
+
+@check("hot-path queries use their indexes")
+def query_plans(workdir: Path) -> None:
+    from cold_ai.db import get_connection
+
+    problems: list[str] = []
+    conn = get_connection()
+    try:
+        for name, call, index in PLAN_EXPECTATIONS:
+            selects = _traced_selects(call)
+            if not selects:
+                problems.append(f"{name}: issued no SELECT")
+                continue
+            plan = [str(row["detail"]) for sql in selects for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+            if not any(re.search(rf"INDEX {index}\b", detail) for detail in plan):
+                problems.append(f"{name}: expected {index}, plan was {plan}")
+            scans = [detail for detail in plan if detail.startswith("SCAN ") and "INDEX" not in detail]
+            if scans:
+                problems.append(f"{name}: full table scan ({'; '.join(scans)})")
+    finally:
+        conn.close()
+    assert not problems, "\n  " + "\n  ".join(problems)
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+
+from cases import CASES, CHECKS, BenchCase, BenchCheck  # noqa: E402
+
+DEFAULT_BASELINE = BENCH_DIR / "baselines.json"
+DEFAULT_THRESHOLD_PCT = 25.0
+
+
+# A fixed pure-Python workload timed alongside the cases. Baselines are scaled by the ratio
+# between its current and recorded timings, so a slower CI runner is not read as a regression.
+def _calibration_loop() -> int:
+    total = 0
+    for index in range(1000):
+        total += len(str(index)) * (index & 7)
+    return total
+
+
+def measure(operation, repeat: int, min_seconds: float) -> float:
+    timer = timeit.Timer(operation)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_seconds / 5 or number >= 1_000_000:
+            break
+        number *= 4
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        # The fastest repeat is the one least disturbed by the rest of the machine.
+        best = min(timer.repeat(repeat=repeat, number=number))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best / number * 1e9
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {"calibration_ns": None, "cases": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def select_cases(patterns: list[str]) -> list[BenchCase]:
+    if not patterns:
+        return list(CASES)
+    return [item for item in CASES if any(fnmatch.fnmatch(item.name, pattern) for pattern in patterns)]
+
+
+def select_checks(patterns: list[str]) -> list[BenchCheck]:
+    if not patterns:
+        return list(CHECKS)
+    return [item for item in CHECKS if any(fnmatch.fnmatch(item.name, pattern) for pattern in patterns)]
+
+
+@contextmanager
+def _scratch_directory() -> Iterator[Path]:
+    from cold_ai.db import init_db
+
+    previous = Path.cwd()
+    with tempfile.TemporaryDirectory(prefix="cold-ai-microbench-") as workdir:
+        # The database path is relative to the working directory; keep benchmark rows out of data/.
+        os.chdir(workdir)
+        try:
+            init_db()
+            yield Path(workdir)
+        finally:
+            os.chdir(previous)
+
+
+def run_checks(checks: list[BenchCheck]) -> list[str]:
+    failures: list[str] = []
+    with _scratch_directory() as workdir:
+        for item in checks:
+            try:
+                item.run(workdir)
+            except AssertionError as error:
+                failures.append(item.name)
+                print(f"check failed: {item.name}: {error}", file=sys.stderr)
+            else:
+                print(f"check ok: {item.name}")
+    return failures
+
+
+def run_cases(cases: list[BenchCase], repeat: int, min_seconds: float) -> tuple[float, dict[str, float]]:
+    results: dict[str, float] = {}
+    with _scratch_directory() as workdir:
+        # Calibration is sampled between cases and the fastest sample kept, so one noisy
+        # moment at startup does not skew every comparison.
+        calibrations = [measure(_calibration_loop, repeat, min_seconds)]
+        for item in cases:
+            operation = item.setup(workdir)
+            operation()
+            results[item.name] = measure(operation, repeat, min_seconds)
+            calibrations.append(measure(_calibration_loop, repeat, min_seconds / 4))
+            print(f"  measured {item.name}", file=sys.stderr)
+    return min(calibrations), results
+
+
+def _format_ns(value: float) -> str:
+    if value >= 1e6:
+        return f"{value / 1e6:.2f} ms"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f} us"
+    return f"{value:.0f} ns"
+
+
+def compare(
+    cases: list[BenchCase],
+    results: dict[str, float],
+    calibration_ns: float,
+    baseline: dict,
+    threshold_override: float | None,
+) -> list[dict]:
+    recorded = baseline.get("cases", {})
+    baseline_calibration = baseline.get("calibration_ns")
+    scale = calibration_ns / baseline_calibration if baseline_calibration else 1.0
+    rows: list[dict] = []
+    for item in cases:
+        current = results[item.name]
+        threshold = threshold_override or item.threshold_pct or DEFAULT_THRESHOLD_PCT
+        previous = recorded.get(item.name)
+        if previous is None:
+            rows.append({"case": item.name, "ns_per_op": current, "status": "new", "threshold_pct": threshold})
+            continue
+        expected = previous * scale
+        change_pct = (current - expected) / expected * 100
+        rows.append(
+            {
+                "case": item.name,
+                "ns_per_op": current,
+                "baseline_ns_per_op": expected,
+                "change_pct": change_pct,
+                "threshold_pct": threshold,
+                "status": "regressed" if change_pct > threshold else "ok",
+            }
+        )
+    return rows
+
+
+def print_table(rows: list[dict], scale: float) -> None:
+    print(f"Machine speed vs baseline: x{scale:.2f} (baselines scaled accordingly)")
+    print(f"{'case':<44} {'current':>11} {'baseline':>11} {'change':>9} {'limit':>7}  status")
+    for row in rows:
+        baseline = _format_ns(row["baseline_ns_per_op"]) if "baseline_ns_per_op" in row else "-"
+        change = f"{row['change_pct']:+.1f}%" if "change_pct" in row else "-"
+        print(
+            f"{row['case']:<44} {_format_ns(row['ns_per_op']):>11} {baseline:>11} {change:>9} "
+            f"{row['threshold_pct']:>6.0f}%  {row['status']}"
+        )
+
+
+def write_baseline(path: Path, calibration_ns: float, results: dict[str, float], baseline: dict) -> None:
+    cases = dict(baseline.get("cases", {}))
+    # Cases measured against an older calibration are rescaled so the file stays consistent.
+    previous_calibration = baseline.get("calibration_ns")
+    if previous_calibration:
+        cases = {name: value * calibration_ns / previous_calibration for name, value in cases.items()}
+    cases.update(results)
+    payload = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration_ns": round(calibration_ns, 1),
+        "cases": {name: round(value, 1) for name, value in sorted(cases.items())},
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run cold-ai micro-benchmarks against stored baselines.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file.")
+    parser.add_argument("--update", action="store_true", help="Record current timings as the new baseline.")
+    parser.add_argument("--filter", action="append", default=[], help="Glob on case and check names; repeatable.")
+    parser.add_argument("--threshold", type=float, default=None, help="Override every case's regression limit, in %%.")
+    parser.add_argument("--repeat", type=int, default=7, help="Timing repeats per case; the fastest is kept.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Target seconds per repeat.")
+    parser.add_argument("--retries", type=int, default=1, help="Re-measure suspected regressions this many times.")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the comparison as JSON.")
+    parser.add_argument("--list", action="store_true", help="List cases and exit.")
+    parser.add_argument("--checks-only", action="store_true", help="Run the pass/fail checks and skip timing.")
+    args = parser.parse_args(argv)
+
+    cases = [] if args.checks_only else select_cases(args.filter)
+    checks = select_checks(args.filter)
+    if args.list:
+        for check in checks:
+            print(f"{check.name}  (check)")
+        for item in cases:
+            print(f"{item.name}  (limit {item.threshold_pct or DEFAULT_THRESHOLD_PCT:.0f}%)")
+        return 0
+    if not cases and not checks:
+        print("No benchmark matches the given filters.", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    # Checks are cheap and deterministic; a failing one makes the timings moot.
+    failed_checks = run_checks(checks)
+    if failed_checks:
+        print(f"Failed checks: {', '.join(failed_checks)}", file=sys.stderr)
+        return 1
+    if not cases:
+        return 0
+    calibration_ns, results = run_cases(cases, max(1, args.repeat), args.min_time)
+    baseline = load_baseline(args.baseline)
+    if args.update:
+        write_baseline(args.baseline, calibration_ns, results, baseline)
+        for name, value in results.items():
+            print(f"{name:<44} {_format_ns(value):>11}")
+        print(f"Baseline written: {args.baseline} ({time.perf_counter() - started:.1f}s)")
+        return 0
+
+    rows = compare(cases, results, calibration_ns, baseline, args.threshold)
+    suspects = [item for item, row in zip(cases, rows) if row["status"] == "regressed"]
+    for _ in range(args.retries):
+        if not suspects:
+            break
+        # A real regression reproduces; a noisy neighbour usually does not. Keep the best of both runs.
+        print(f"  re-measuring {len(suspects)} suspected regression(s)", file=sys.stderr)
+        retry_calibration, retry_results = run_cases(suspects, max(1, args.repeat), args.min_time)
+        calibration_ns = min(calibration_ns, retry_calibration)
+        for name, value in retry_results.items():
+            results[name] = min(results[name], value)
+        rows = compare(cases, results, calibration_ns, baseline, args.threshold)
+        suspects = [item for item, row in zip(cases, rows) if row["status"] == "regressed"]
+    scale = calibration_ns / baseline["calibration_ns"] if baseline.get("calibration_ns") else 1.0
+    print_table(rows, scale)
+    if args.json:
+        args.json.write_text(json.dumps({"scale": scale, "results": rows}, indent=2) + "\n", encoding="utf-8")
+
+    regressed = [row["case"] for row in rows if row["status"] == "regressed"]
+    if regressed:
+        print(f"Regressed beyond limit: {', '.join(regressed)}", file=sys.stderr)
+        return 1
+    print(f"All {len(rows)} benchmarks within limits ({time.perf_counter() - started:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
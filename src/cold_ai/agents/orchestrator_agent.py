@@ -8,6 +8,8 @@ from .rewrite_agent import RewriteAgent
 from .routing_agent import RoutingAgent
 from .supervisor_agent import SupervisorAgent
 from ..config import settings
+from ..services.ai_agent_runtime import AgentLLMConfig, resolve_agent_llm_config
+from ..services.pipeline_timing import pipeline_stage
 from ..tools import (
     EmailTool,
     OutreachKnowledgeTool,
@@ -21,15 +23,17 @@ from ..tools import (
 
 
 class OrchestratorAgent:
-    def __init__(self, agent_settings: dict | None = None) -> None:
+    def __init__(self, agent_settings: dict | None = None, runtime: AgentLLMConfig | None = None) -> None:
         self.agent_settings = agent_settings or {}
+        # Resolved once and shared, rather than re-parsed by every agent constructor.
+        self.runtime = runtime or resolve_agent_llm_config(self.agent_settings)
         self.lead_agent = LeadIntelligenceAgent()
-        self.research_agent = ResearchAgent(agent_settings=self.agent_settings)
-        self.routing_agent = RoutingAgent(agent_settings=self.agent_settings)
+        self.research_agent = ResearchAgent(runtime=self.runtime)
+        self.routing_agent = RoutingAgent(runtime=self.runtime)
         self.copywriter = CopywriterAgent()
-        self.rewrite_agent = RewriteAgent(agent_settings=self.agent_settings)
-        self.reflection_agent = ReflectionAgent(agent_settings=self.agent_settings)
-        self.supervisor_agent = SupervisorAgent(agent_settings=self.agent_settings)
+        self.rewrite_agent = RewriteAgent(runtime=self.runtime)
+        self.reflection_agent = ReflectionAgent(runtime=self.runtime)
+        self.supervisor_agent = SupervisorAgent(runtime=self.runtime)
         self.tools = ToolRegistry(
             policy=ToolPolicy(
                 profile=settings.tool_profile,
@@ -45,24 +49,31 @@ class OrchestratorAgent:
         self.tools.register(OutreachMemoryTool())
 
     def prepare_lead(self, lead: dict) -> dict:
-        return self.lead_agent.enrich(lead)
+        with pipeline_stage("prepare"):
+            return self.lead_agent.enrich(lead)
 
     def create_draft(self, subject_template: str, body_template: str, context: dict) -> tuple[str, str]:
-        routing_context = self.routing_agent.route(context)
+        with pipeline_stage("routing"):
+            routing_context = self.routing_agent.route(context)
         merged_context = {**context, **routing_context}
-        return self.copywriter.draft(subject_template, body_template, merged_context)
+        with pipeline_stage("copywrite"):
+            return self.copywriter.draft(subject_template, body_template, merged_context)
 
     def research(self, lead: dict) -> dict:
-        return self.research_agent.research(lead)
+        with pipeline_stage("research"):
+            return self.research_agent.research(lead)
 
     def rewrite(self, subject: str, body: str, context: dict) -> tuple[str, str, str]:
-        return self.rewrite_agent.maybe_rewrite(subject, body, context)
+        with pipeline_stage("rewrite"):
+            return self.rewrite_agent.maybe_rewrite(subject, body, context)
 
     def supervise(self, subject: str, body: str, context: dict) -> dict:
-        return self.supervisor_agent.review(subject, body, context)
+        with pipeline_stage("supervision"):
+            return self.supervisor_agent.review(subject, body, context)
 
     def reflect(self, subject: str, body: str, context: dict) -> tuple[str, str, dict]:
-        return self.reflection_agent.critique_and_refine(subject, body, context)
+        with pipeline_stage("reflection"):
+            return self.reflection_agent.critique_and_refine(subject, body, context)
 
     def available_tools(self) -> list[str]:
         return self.tools.available()
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-from ..services.ai_agent_runtime import resolve_agent_llm_config
+from ..services.ai_agent_runtime import AgentLLMConfig, resolve_agent_llm_config
 from ..services.agent_contracts import validate_reflection
 from ..services.llm_router import LLMRouter
 from ..services.outreach_knowledge_base import build_outreach_knowledge_context
 
 
 class ReflectionAgent:
-    def __init__(self, agent_settings: dict | None = None) -> None:
+    def __init__(self, agent_settings: dict | None = None, runtime: AgentLLMConfig | None = None) -> None:
         self.router = LLMRouter()
-        self.runtime = resolve_agent_llm_config(agent_settings)
+        self.runtime = runtime or resolve_agent_llm_config(agent_settings)
 
     def critique_and_refine(self, subject: str, body: str, context: dict) -> tuple[str, str, dict]:
         knowledge = build_outreach_knowledge_context(
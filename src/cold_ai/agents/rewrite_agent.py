@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from ..services.ai_agent_runtime import resolve_agent_llm_config
+from ..services.ai_agent_runtime import AgentLLMConfig, resolve_agent_llm_config
 from ..services.agent_contracts import validate_rewrite
 from ..services.llm_router import LLMRouter
 from ..services.outreach_knowledge_base import build_outreach_knowledge_context
@@ -17,9 +17,9 @@ SPAMMY_TERMS = {
 
 
 class RewriteAgent:
-    def __init__(self, agent_settings: dict | None = None) -> None:
+    def __init__(self, agent_settings: dict | None = None, runtime: AgentLLMConfig | None = None) -> None:
         self.router = LLMRouter()
-        self.runtime = resolve_agent_llm_config(agent_settings)
+        self.runtime = runtime or resolve_agent_llm_config(agent_settings)
 
     def maybe_rewrite(self, subject: str, body: str, context: dict) -> tuple[str, str, str]:
         if not self.runtime.enable_llm_rewrite:
@@ -4,20 +4,25 @@ import os
 import shutil
 import socket
 import subprocess
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
 
 import typer
 
-from .db import init_db
-from .services.approval_service import export_approvals, import_approvals
-from .services.campaign_service import create_campaign
-from .services.draft_service import generate_drafts
-from .services.eval_harness import run_agent_evaluation
-from .services.import_service import import_leads
-from .services.send_service import send_due
-from .web.app import app as web_app
+from .config import settings
+from .db import init_db, migrate, schema_status
+
+# Commands import their services lazily: cron jobs such as send-due should not pay for
+# the agent stack or FastAPI just to start.
 
 app = typer.Typer(help="cold-AI Phase 1 CLI")
+db_app = typer.Typer(help="Database schema migrations")
+app.add_typer(db_app, name="db")
+jobs_app = typer.Typer(help="Background job queue")
+app.add_typer(jobs_app, name="jobs")
+stats_app = typer.Typer(help="Pipeline statistics")
+app.add_typer(stats_app, name="stats")
 
 
 def _port_is_busy(host: str, port: int) -> bool:
@@ -57,14 +62,117 @@ def _find_next_free_port(host: str, start_port: int, max_checks: int = 50) -> in
     return None
 
 
+def _cassette_scope(cassette: Path | None, mode: str, replay_latency: bool) -> AbstractContextManager:
+    if cassette is None:
+        return nullcontext()
+    from .services.llm_cassette import use_cassette
+
+    try:
+        return use_cassette(cassette, mode=mode, replay_latency=replay_latency)
+    except (FileNotFoundError, ValueError) as error:
+        raise typer.BadParameter(str(error)) from error
+
+
+def _echo_cassette_stats(cassette: Path | None) -> None:
+    if cassette is None:
+        return
+    from .services.llm_cassette import get_active_cassette
+
+    active = get_active_cassette()
+    if active:
+        typer.echo(
+            f"Cassette {active.mode}: recorded={active.stats['recorded']} "
+            f"replayed={active.stats['replayed']} misses={active.stats['misses']}"
+        )
+
+
+def _start_profiling(
+    command: str,
+    profile: bool,
+    profile_output: Path | None,
+    profile_top: int,
+    profile_sort: str,
+    trace_memory: bool,
+) -> Callable[[], None]:
+    from datetime import datetime
+
+    from .profiling import CommandProfiler, start_command_profiler, stop_command_profiler
+
+    if profile and profile_output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        profile_output = Path("data/profiles") / f"cold_ai_{command}_{stamp}.pstats"
+    try:
+        profiler = CommandProfiler(
+            cpu_output=profile_output if profile else None,
+            trace_memory=trace_memory,
+            top=profile_top,
+            sort=profile_sort,
+        )
+    except ValueError as error:
+        raise typer.BadParameter(str(error)) from error
+    start_command_profiler(profiler)
+
+    def report() -> None:
+        for line in stop_command_profiler():
+            typer.echo(line, err=True)
+
+    return report
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(False, "--profile", help="Profile the command with cProfile"),
+    profile_output: Path = typer.Option(None, help="Where to write the .pstats file"),
+    profile_top: int = typer.Option(25, help="Rows in the profile and allocation summaries"),
+    profile_sort: str = typer.Option("cumulative", help="cumulative, tottime, calls or ncalls"),
+    trace_memory: bool = typer.Option(False, "--trace-memory", help="Track allocations with tracemalloc"),
+) -> None:
+    if (profile or trace_memory) and ctx.invoked_subcommand:
+        ctx.call_on_close(
+            _start_profiling(ctx.invoked_subcommand, profile, profile_output, profile_top, profile_sort, trace_memory)
+        )
+    if ctx.invoked_subcommand not in {"db", "init-db", "bench", "mock-llm", "load-test", "smtp-sink"}:
+        init_db()
+    if trace_memory:
+        from .profiling import mark_phase
+
+        mark_phase("startup")
+    if settings.metrics_textfile_dir and ctx.invoked_subcommand:
+        from .metrics import start_textfile_exporter
+
+        # One file per command, e.g. cold_ai_send-due.prom, for the node_exporter textfile collector.
+        path = Path(settings.metrics_textfile_dir) / f"cold_ai_{ctx.invoked_subcommand}.prom"
+        start_textfile_exporter(path, settings.metrics_textfile_interval)
+
+
 @app.command("init-db")
 def init_db_command() -> None:
-    init_db()
+    migrate()
     typer.echo("Database initialized")
 
 
+@db_app.command("migrate")
+def db_migrate_command() -> None:
+    applied = migrate()
+    for migration in applied:
+        typer.echo(f"Applied migration {migration.version:04d}_{migration.name}")
+    typer.echo(f"Schema is up to date ({len(applied)} migration(s) applied)")
+
+
+@db_app.command("status")
+def db_status_command() -> None:
+    status = schema_status()
+    typer.echo(f"Schema version: {status['current_version']} (latest: {status['latest_version']})")
+    for migration in status["migrations"]:
+        state = f"applied {migration['applied_at']}" if migration["applied_at"] else "pending"
+        typer.echo(f"  {migration['version']:04d}_{migration['name']}: {state}")
+
+
 @app.command("import-leads")
 def import_leads_command(csv_path: Path = typer.Option(..., exists=True, readable=True)) -> None:
+    from .services.import_service import import_leads
+
     inserted, skipped = import_leads(csv_path)
     typer.echo(f"Leads imported: {inserted}, skipped: {skipped}")
 
@@ -77,6 +185,8 @@ def create_campaign_command(
     purpose: str = typer.Option(""),
     channel: str = typer.Option("email"),
 ) -> None:
+    from .services.campaign_service import create_campaign
+
     campaign_id = create_campaign(name, subject_template, body_template, purpose=purpose, channel=channel)
     typer.echo(f"Campaign created with id={campaign_id}")
 
@@ -85,34 +195,203 @@ def create_campaign_command(
 def generate_drafts_command(
     campaign_id: int = typer.Option(...),
     limit: int = typer.Option(100),
+    background: bool = typer.Option(False, help="Submit to the job queue instead of running inline"),
 ) -> None:
+    if background:
+        from .services.job_service import submit_generate_drafts
+
+        job_id = submit_generate_drafts(campaign_id, limit)
+        typer.echo(f"Draft generation queued: job {job_id}")
+        return
+    from .services.draft_service import generate_drafts
+
     created, ignored = generate_drafts(campaign_id, limit)
     typer.echo(f"Drafts generated: {created}, ignored: {ignored}")
 
 
+def _echo_job(job: dict) -> None:
+    typer.echo(
+        f"Job {job['id']} [{job['kind']}] campaign={job['campaign_id']} status={job['status']} "
+        f"processed={job['processed']}/{job['total']} created={job['created']} ignored={job['ignored']}"
+        + (f" error={job['error']}" if job.get("error") else "")
+    )
+
+
+@jobs_app.command("work")
+def jobs_work_command(
+    workers: int = typer.Option(0, help="Worker threads (default: COLD_AI_JOB_WORKERS)"),
+    until_empty: bool = typer.Option(False, help="Exit once the queue is drained"),
+) -> None:
+    from .services.job_service import JobWorkerPool
+
+    pool = JobWorkerPool(workers=workers or None)
+    if until_empty:
+        completed = pool.run_until_empty()
+        typer.echo(f"Jobs processed: {completed}")
+        return
+    pool.start()
+    typer.echo(f"Job workers running ({pool.workers}); press Ctrl+C to stop")
+    try:
+        while True:
+            pool.wait(3600)
+    except KeyboardInterrupt:
+        typer.echo("Stopping job workers…")
+    finally:
+        pool.stop()
+
+
+@jobs_app.command("status")
+def jobs_status_command(
+    job_id: int = typer.Option(0),
+    campaign_id: int = typer.Option(0),
+) -> None:
+    from .repositories import JobRepository
+
+    repository = JobRepository()
+    if job_id:
+        job = repository.get(job_id)
+        if not job:
+            raise typer.BadParameter(f"Job {job_id} not found")
+        _echo_job(job)
+        return
+    if not campaign_id:
+        raise typer.BadParameter("Pass --job-id or --campaign-id")
+    for job in repository.list_for_campaign(campaign_id):
+        _echo_job(job)
+
+
+@jobs_app.command("cancel")
+def jobs_cancel_command(job_id: int = typer.Option(...)) -> None:
+    from .repositories import JobRepository
+
+    if JobRepository().request_cancel(job_id):
+        typer.echo(f"Cancellation requested for job {job_id}")
+    else:
+        typer.echo(f"Job {job_id} is not queued or running")
+
+
+@app.command("campaign-stats")
+def campaign_stats_command(
+    campaign_id: int = typer.Option(0, help="Limit to one campaign (default: all)"),
+    rebuild: bool = typer.Option(False, help="Recompute the counters from the drafts table first"),
+) -> None:
+    from .repositories import CampaignStatsRepository
+
+    repository = CampaignStatsRepository()
+    if rebuild:
+        rebuilt = repository.rebuild(campaign_id or None)
+        typer.echo(f"Rebuilt stats for {rebuilt} campaign(s)")
+    rows = [repository.get(campaign_id)] if campaign_id else repository.list_all()
+    for stats in rows:
+        if not stats:
+            raise typer.BadParameter(f"Campaign {campaign_id} not found")
+        average = stats["avg_supervisor_score"]
+        typer.echo(
+            f"Campaign {stats['campaign_id']}: total={stats['total']} draft={stats['draft']} "
+            f"approved={stats['approved']} rejected={stats['rejected']} sent={stats['sent']} "
+            f"failed={stats['failed']} avg_score={'-' if average is None else f'{average:.3f}'}"
+        )
+
+
+@stats_app.command("pipeline")
+def stats_pipeline_command(
+    campaign_id: int = typer.Option(...),
+    last: int = typer.Option(0, help="Only the most recent N drafts (default: all)"),
+    histogram: bool = typer.Option(False, help="Print the latency histogram of every stage"),
+    output: Path = typer.Option(None, help="Also write the full report as JSON"),
+) -> None:
+    import json
+
+    from .repositories import CampaignRepository, EventRepository
+    from .services.pipeline_timing import summarize_pipeline
+
+    if not CampaignRepository().get(campaign_id):
+        raise typer.BadParameter(f"Campaign {campaign_id} not found")
+    payloads = EventRepository().list_payloads_for_campaign(campaign_id, "draft_created", limit=last or None)
+    report = summarize_pipeline(payloads)
+    if not report["drafts"]:
+        typer.echo(f"Campaign {campaign_id}: no timed drafts yet")
+        return
+
+    total = report["total_ms"]
+    typer.echo(
+        f"Campaign {campaign_id}: {report['drafts']} drafts, per draft p50={total['p50']:.2f}ms "
+        f"p95={total['p95']:.2f}ms p99={total['p99']:.2f}ms max={total['max']:.2f}ms"
+    )
+    grand_total = sum(stage["total"] for stage in report["stages"].values()) or 1.0
+    typer.echo(f"{'stage':<12} {'p50':>9} {'p90':>9} {'p95':>9} {'p99':>9} {'max':>9} {'share':>7} {'llm':>6}")
+    for name, stage in report["stages"].items():
+        typer.echo(
+            f"{name:<12} {stage['p50']:>9.2f} {stage['p90']:>9.2f} {stage['p95']:>9.2f} {stage['p99']:>9.2f} "
+            f"{stage['max']:>9.2f} {stage['total'] / grand_total:>7.1%} {report['llm']['attempts'].get(name, 0):>6}"
+        )
+        if histogram:
+            peak = max(stage["histogram"].values()) or 1
+            for bucket, count in stage["histogram"].items():
+                if count:
+                    typer.echo(f"  {bucket:>10} {count:>7} {'#' * max(1, round(count / peak * 40))}")
+    if report["llm"]["models"]:
+        models = ", ".join(f"{model}={count}" for model, count in report["llm"]["models"].items())
+        typer.echo(f"LLM answers by model: {models}")
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        typer.echo(f"Report written: {output}")
+
+
 @app.command("export-approvals")
 def export_approvals_command(campaign_id: int = typer.Option(...)) -> None:
+    from .services.approval_service import export_approvals
+
     file_path = export_approvals(campaign_id)
     typer.echo(f"Approval file exported: {file_path}")
 
 
 @app.command("import-approvals")
 def import_approvals_command(csv_path: Path = typer.Option(..., exists=True, readable=True)) -> None:
-    approved, rejected = import_approvals(csv_path)
-    typer.echo(f"Approvals imported: approved={approved}, rejected={rejected}")
+    from .services.approval_service import import_approvals
+
+    result = import_approvals(csv_path)
+    typer.echo(f"Approvals imported: approved={result['approved']}, rejected={result['rejected']}")
+    if result["skipped"]:
+        typer.echo(f"Skipped (already sent): {', '.join(map(str, result['skipped']))}", err=True)
+    if result["not_found"]:
+        typer.echo(f"Unknown draft ids: {', '.join(map(str, result['not_found']))}", err=True)
 
 
 @app.command("send-due")
-def send_due_command(dry_run: bool = typer.Option(False)) -> None:
-    sent, failed = send_due(dry_run=dry_run)
+def send_due_command(
+    dry_run: bool = typer.Option(False),
+    capture: Path = typer.Option(None, help="Dry run into a .jsonl or .mbox file instead of printing each message"),
+) -> None:
+    from .services.email_provider import dry_run_email_provider
+    from .services.send_service import send_due
+    from .services.whatsapp_provider import dry_run_whatsapp_provider
+
+    if capture:
+        sent, failed = send_due(
+            dry_run=True,
+            email_provider=dry_run_email_provider(capture),
+            whatsapp_provider=dry_run_whatsapp_provider(capture),
+        )
+        typer.echo(f"Messages captured in {capture.resolve()}")
+    else:
+        sent, failed = send_due(dry_run=dry_run)
     typer.echo(f"Send finished: sent={sent}, failed={failed}")
 
 
 @app.command("eval-agents")
 def eval_agents_command(
     output: Path = typer.Option(Path("data/exports/agent_eval_report.json")),
+    cassette: Path = typer.Option(None, help="LLM cassette file (.jsonl or .jsonl.gz)"),
+    cassette_mode: str = typer.Option("replay", help="record or replay"),
+    replay_latency: bool = typer.Option(False, help="Sleep for the recorded latency on replay"),
 ) -> None:
-    report = run_agent_evaluation(output_path=output)
+    from .services.eval_harness import run_agent_evaluation
+
+    with _cassette_scope(cassette, cassette_mode, replay_latency):
+        report = run_agent_evaluation(output_path=output)
+        _echo_cassette_stats(cassette)
     summary = report.get("summary") or {}
     typer.echo(
         "Agent eval complete: "
@@ -123,6 +402,249 @@ def eval_agents_command(
     typer.echo(f"Report written: {output}")
 
 
+@app.command("bench")
+def bench_command(
+    rows: int = typer.Option(10_000, min=1, help="Synthetic leads to generate and import"),
+    draft_limit: int = typer.Option(1_000, min=1, help="Leads drafted per mode"),
+    mode: list[str] = typer.Option(["deterministic", "mock-llm"], help="Drafting mode(s): deterministic, mock-llm"),
+    llm_latency_ms: float = typer.Option(0.0, min=0.0, help="Simulated latency per mocked LLM call"),
+    seed: int = typer.Option(42),
+    workdir: Path = typer.Option(None, help="Directory for the bench database and files (default: temporary)"),
+    keep_workdir: bool = typer.Option(False, help="Keep the temporary working directory"),
+    output: Path = typer.Option(Path("data/exports/bench_report.json")),
+    cassette: Path = typer.Option(None, help="LLM cassette file (.jsonl or .jsonl.gz)"),
+    cassette_mode: str = typer.Option("replay", help="record or replay"),
+    replay_latency: bool = typer.Option(False, help="Sleep for the recorded latency on replay"),
+    send_via: str = typer.Option("capture", help="Send phase: capture, console or smtp-sink"),
+    smtp_latency_ms: float = typer.Option(0.0, min=0.0, help="Latency per message in the bundled SMTP sink"),
+) -> None:
+    from .services.benchmark import run_benchmark
+
+    try:
+        with _cassette_scope(cassette, cassette_mode, replay_latency):
+            report = run_benchmark(
+                rows=rows,
+                draft_limit=draft_limit,
+                modes=tuple(mode),
+                seed=seed,
+                llm_latency_ms=llm_latency_ms,
+                workdir=workdir,
+                keep_workdir=keep_workdir,
+                output_path=output,
+                send_via=send_via,
+                smtp_latency_ms=smtp_latency_ms,
+            )
+    except ValueError as error:
+        raise typer.BadParameter(str(error)) from error
+
+    for name, phase in report["phases"].items():
+        latency = phase["latency_ms"]
+        percentiles = (
+            f" p50={latency['p50']:.2f}ms p95={latency['p95']:.2f}ms p99={latency['p99']:.2f}ms" if latency else ""
+        )
+        typer.echo(
+            f"{name:<22} items={phase['items']:<8} {phase['seconds']:>9.3f}s "
+            f"{phase['rows_per_second'] or 0:>10.1f}/s{percentiles}"
+        )
+    typer.echo(f"Peak RSS: {report['peak_rss_mb']} MB")
+    typer.echo(f"Report written: {output}")
+
+
+@app.command("mock-llm")
+def mock_llm_command(
+    host: str = typer.Option("127.0.0.1"),
+    port: int = typer.Option(8010),
+    latency_ms: float = typer.Option(0.0, min=0.0, help="Latency per call (median for lognormal, mean for exponential)"),
+    latency_distribution: str = typer.Option("fixed", help="fixed, uniform, exponential or lognormal"),
+    latency_jitter_ms: float = typer.Option(0.0, min=0.0, help="Half-width of the uniform distribution"),
+    latency_sigma: float = typer.Option(0.5, min=0.0, help="Shape of the lognormal distribution"),
+    error_rate: float = typer.Option(0.0, min=0.0, max=1.0, help="Share of calls answered with HTTP 500"),
+    rate_limit_rate: float = typer.Option(0.0, min=0.0, max=1.0, help="Share of calls answered with HTTP 429"),
+    malformed_rate: float = typer.Option(0.0, min=0.0, max=1.0, help="Share of calls with unusable output"),
+    fail_model: list[str] = typer.Option([], help="Model that always fails (repeatable), to exercise fallbacks"),
+    seed: int = typer.Option(42),
+) -> None:
+    from .services.mock_llm import MockLLMConfig, MockLLMServer
+
+    try:
+        config = MockLLMConfig(
+            latency_ms=latency_ms,
+            latency_distribution=latency_distribution,
+            latency_jitter_ms=latency_jitter_ms,
+            latency_sigma=latency_sigma,
+            error_rate=error_rate,
+            rate_limit_rate=rate_limit_rate,
+            malformed_rate=malformed_rate,
+            failing_models=tuple(fail_model),
+            seed=seed,
+        )
+    except ValueError as error:
+        raise typer.BadParameter(str(error)) from error
+
+    server = MockLLMServer(config, host=host, port=port)
+    typer.echo(f"Mock LLM listening on {server.url}")
+    typer.echo(f"  OpenAI-compatible: COLD_AI_LLM_BASE_URL={server.url}/v1")
+    typer.echo(f"  Anthropic / Gemini: use {server.url} as the provider base URL")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        typer.echo(f"Stopping mock LLM; stats: {server.snapshot()}")
+
+
+@app.command("load-test")
+def load_test_command(
+    url: str = typer.Option(None, help="Review API to load (default: seed a database and start uvicorn)"),
+    workers: int = typer.Option(1, min=1, help="uvicorn worker processes when the server is started here"),
+    rps: float = typer.Option(20.0, min=0.1, help="Target requests per second"),
+    duration: float = typer.Option(30.0, min=1.0, help="Seconds of load"),
+    concurrency: int = typer.Option(16, min=1, help="Simulated operators, each with its own session"),
+    mix: list[str] = typer.Option([], help="Endpoint weight, e.g. send_due=10 (repeatable)"),
+    email: str = typer.Option(None, help="Sign-in email (default: the seeded load-test user)"),
+    password: str = typer.Option(None, help="Sign-in password"),
+    leads: int = typer.Option(5_000, min=1, help="Synthetic leads to seed"),
+    campaigns: int = typer.Option(3, min=1, help="Campaigns to seed"),
+    drafts_per_campaign: int = typer.Option(500, min=1, help="Drafts generated per seeded campaign"),
+    seed: int = typer.Option(42),
+    workdir: Path = typer.Option(None, help="Directory for the seeded database (default: temporary)"),
+    keep_workdir: bool = typer.Option(False, help="Keep the temporary working directory"),
+    output: Path = typer.Option(Path("data/exports/load_test_report.json")),
+) -> None:
+    import json
+    import tempfile
+
+    from .services.load_test import (
+        LOAD_TEST_USER_EMAIL,
+        LOAD_TEST_USER_PASSWORD,
+        LoadTestConfig,
+        UvicornProcess,
+        parse_mix,
+        run_load_test,
+        seed_load_test_database,
+    )
+
+    output = output.resolve()
+    try:
+        mix_weights = parse_mix(mix)
+    except ValueError as error:
+        raise typer.BadParameter(str(error)) from error
+
+    server = None
+    owns_workdir = workdir is None
+    if url is None:
+        workdir = Path(tempfile.mkdtemp(prefix="cold-ai-load-")) if owns_workdir else workdir.resolve()
+        typer.echo(f"Seeding {workdir} ({leads} leads, {campaigns} campaigns)")
+        seeded = seed_load_test_database(
+            workdir, leads=leads, campaigns=campaigns, drafts_per_campaign=drafts_per_campaign, seed=seed
+        )
+        typer.echo(f"Seeded {seeded['leads']} leads and {seeded['drafts']} drafts")
+        server = UvicornProcess(workdir, workers=workers)
+        try:
+            server.start()
+        except RuntimeError as error:
+            typer.echo(str(error))
+            raise typer.Exit(code=1) from error
+        url = server.url
+        typer.echo(f"Started uvicorn with {workers} worker(s) at {url}")
+
+    try:
+        config = LoadTestConfig(
+            base_url=url.rstrip("/"),
+            email=email or LOAD_TEST_USER_EMAIL,
+            password=password or LOAD_TEST_USER_PASSWORD,
+            rps=rps,
+            duration_seconds=duration,
+            concurrency=concurrency,
+            mix=mix_weights,
+            seed=seed,
+        )
+        typer.echo(f"Loading {url} at {rps:g} req/s for {duration:g}s with {concurrency} operators")
+        report = run_load_test(
+            config, on_progress=lambda done, total: typer.echo(f"  {done}/{total} requests completed")
+        )
+    except (RuntimeError, ValueError, OSError) as error:
+        typer.echo(f"Load test failed: {error}")
+        raise typer.Exit(code=1) from error
+    finally:
+        if server:
+            server.stop()
+            if owns_workdir and not keep_workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    if server:
+        kept = keep_workdir or not owns_workdir
+        report["server"] = {"workers": workers, "log": str(server.log_path) if kept else None}
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    typer.echo(f"{'endpoint':<18} {'requests':>8} {'errors':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}  statuses")
+    for name, block in [*report["endpoints"].items(), ("overall", report["overall"])]:
+        latency = block["latency_ms"] or {}
+        statuses = " ".join(f"{status}:{count}" for status, count in block["statuses"].items())
+        typer.echo(
+            f"{name:<18} {block['requests']:>8} {block['error_rate']:>7.1%} "
+            + " ".join(f"{latency.get(key, 0):>7.1f}ms" for key in ("p50", "p95", "p99", "max"))
+            + f"  {statuses}"
+        )
+        for sample in block["error_samples"]:
+            typer.echo(f"    {sample}")
+    if report["sign_in_errors"]:
+        typer.echo(f"Sign-in failures: {len(report['sign_in_errors'])} ({report['sign_in_errors'][0]})")
+    typer.echo(f"Achieved {report['overall']['achieved_rps']} req/s of {rps:g} targeted")
+    typer.echo(f"Report written: {output}")
+
+
+@app.command("smtp-sink")
+def smtp_sink_command(
+    host: str = typer.Option("127.0.0.1"),
+    port: int = typer.Option(8025),
+    latency_ms: float = typer.Option(0.0, min=0.0, help="Delay before answering DATA (median for lognormal)"),
+    latency_distribution: str = typer.Option("fixed", help="fixed, uniform, exponential or lognormal"),
+    latency_jitter_ms: float = typer.Option(0.0, min=0.0, help="Half-width of the uniform distribution"),
+    latency_sigma: float = typer.Option(0.5, min=0.0, help="Shape of the lognormal distribution"),
+    connect_latency_ms: float = typer.Option(0.0, min=0.0, help="Delay before the 220 greeting"),
+    reject_rate: float = typer.Option(0.0, min=0.0, max=1.0, help="Share of messages refused at RCPT (550)"),
+    temp_failure_rate: float = typer.Option(0.0, min=0.0, max=1.0, help="Share answered 451 after DATA"),
+    disconnect_rate: float = typer.Option(0.0, min=0.0, max=1.0, help="Share dropped mid-conversation"),
+    capture: Path = typer.Option(None, help="Keep accepted messages in a .jsonl or .mbox file"),
+    seed: int = typer.Option(42),
+) -> None:
+    import signal
+
+    from .services.smtp_sink import SMTPSinkConfig, SMTPSinkServer
+
+    try:
+        config = SMTPSinkConfig(
+            latency_ms=latency_ms,
+            latency_distribution=latency_distribution,
+            latency_jitter_ms=latency_jitter_ms,
+            latency_sigma=latency_sigma,
+            connect_latency_ms=connect_latency_ms,
+            reject_rate=reject_rate,
+            temp_failure_rate=temp_failure_rate,
+            disconnect_rate=disconnect_rate,
+            seed=seed,
+        )
+    except ValueError as error:
+        raise typer.BadParameter(str(error)) from error
+
+    def interrupt(*_args: object) -> None:
+        raise KeyboardInterrupt
+
+    # Stopping on SIGTERM too flushes the buffered capture file instead of losing its tail.
+    signal.signal(signal.SIGTERM, interrupt)
+    server = SMTPSinkServer(config, host=host, port=port, capture_path=capture)
+    typer.echo(f"SMTP sink listening on {server.host}:{server.port}")
+    typer.echo(
+        f"  COLD_AI_SMTP_HOST={server.host} COLD_AI_SMTP_PORT={server.port} COLD_AI_SMTP_USER=sink "
+        "COLD_AI_SMTP_PASSWORD=sink COLD_AI_SMTP_FROM=outreach@example.com COLD_AI_SMTP_STARTTLS=false"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+        typer.echo(f"Stopping SMTP sink; stats: {server.snapshot()}")
+
+
 @app.command("review-ui")
 def review_ui_command(
     host: str = typer.Option("127.0.0.1"),
@@ -173,7 +695,7 @@ def review_ui_command(
             raise typer.Exit(code=1)
 
     typer.echo(f"Starting review UI at http://{host}:{port}")
-    uvicorn.run(web_app, host=host, port=port)
+    uvicorn.run("cold_ai.web.app:create_app", factory=True, host=host, port=port)
 
 
 if __name__ == "__main__":
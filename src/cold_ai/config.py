@@ -14,6 +14,17 @@ def _csv_env(name: str, default: str = "") -> tuple[str, ...]:
 class Settings:
     db_path: Path = Path("data/cold_ai.db")
     export_dir: Path = Path("data/exports")
+    db_page_size: int = int(os.getenv("COLD_AI_DB_PAGE_SIZE", "500"))
+    db_write_batch_size: int = int(os.getenv("COLD_AI_DB_WRITE_BATCH_SIZE", "50"))
+    event_sink_mode: str = os.getenv("COLD_AI_EVENT_SINK_MODE", "async").strip().lower()
+    event_sink_queue_size: int = int(os.getenv("COLD_AI_EVENT_SINK_QUEUE_SIZE", "10000"))
+    event_sink_batch_size: int = int(os.getenv("COLD_AI_EVENT_SINK_BATCH_SIZE", "200"))
+    job_workers: int = int(os.getenv("COLD_AI_JOB_WORKERS", "2"))
+    job_poll_interval: float = float(os.getenv("COLD_AI_JOB_POLL_INTERVAL", "1.0"))
+    job_stale_seconds: int = int(os.getenv("COLD_AI_JOB_STALE_SECONDS", "600"))
+    job_progress_interval: float = float(os.getenv("COLD_AI_JOB_PROGRESS_INTERVAL", "1.0"))
+    live_poll_interval: float = float(os.getenv("COLD_AI_LIVE_POLL_INTERVAL", "1.0"))
+    gzip_minimum_size: int = int(os.getenv("COLD_AI_GZIP_MIN_SIZE", "1024"))
 
     smtp_host: str | None = os.getenv("COLD_AI_SMTP_HOST")
     smtp_port: int = int(os.getenv("COLD_AI_SMTP_PORT", "587"))
@@ -21,6 +32,8 @@ class Settings:
     smtp_password: str | None = os.getenv("COLD_AI_SMTP_PASSWORD")
     smtp_from: str | None = os.getenv("COLD_AI_SMTP_FROM")
     smtp_starttls: bool = os.getenv("COLD_AI_SMTP_STARTTLS", "true").lower() == "true"
+    dry_run_capture_path: str | None = os.getenv("COLD_AI_DRY_RUN_CAPTURE")
+    capture_buffer_size: int = int(os.getenv("COLD_AI_CAPTURE_BUFFER_SIZE", str(1024 * 1024)))
 
     enable_web_research: bool = os.getenv("COLD_AI_ENABLE_WEB_RESEARCH", "false").lower() == "true"
     enable_llm_rewrite: bool = os.getenv("COLD_AI_ENABLE_LLM_REWRITE", "false").lower() == "true"
@@ -32,6 +45,9 @@ class Settings:
         for model in os.getenv("COLD_AI_LLM_MODELS", "gpt-4o-mini,gpt-4.1-mini").split(",")
         if model.strip()
     )
+    llm_cassette_path: str | None = os.getenv("COLD_AI_LLM_CASSETTE")
+    llm_cassette_mode: str = os.getenv("COLD_AI_LLM_CASSETTE_MODE", "replay").strip().lower()
+    llm_cassette_replay_latency: bool = os.getenv("COLD_AI_LLM_CASSETTE_REPLAY_LATENCY", "false").lower() == "true"
 
     app_base_url: str = os.getenv("COLD_AI_APP_BASE_URL", "http://127.0.0.1:8000")
     session_secret: str = os.getenv("COLD_AI_SESSION_SECRET", "change-me-in-production")
@@ -58,5 +74,15 @@ class Settings:
         os.getenv("COLD_AI_TOOL_LOOP_CRITICAL_THRESHOLD", "10")
     )
 
+    metrics_db_timing: bool = os.getenv("COLD_AI_METRICS_DB_TIMING", "true").lower() == "true"
+    metrics_textfile_dir: str | None = os.getenv("COLD_AI_METRICS_TEXTFILE_DIR")
+    metrics_textfile_interval: float = float(os.getenv("COLD_AI_METRICS_TEXTFILE_INTERVAL", "15"))
+    metrics_token: str | None = os.getenv("COLD_AI_METRICS_TOKEN")
+    metrics_cache_seconds: float = float(os.getenv("COLD_AI_METRICS_CACHE_SECONDS", "10"))
+
+    trace_sample_rate: float = float(os.getenv("COLD_AI_TRACE_SAMPLE_RATE", "0"))
+    trace_slow_ms: float = float(os.getenv("COLD_AI_TRACE_SLOW_MS", "0"))
+    trace_path: Path = Path(os.getenv("COLD_AI_TRACE_PATH", "data/traces/cold_ai_trace.json"))
+
 
 settings = Settings()
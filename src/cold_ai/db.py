@@ -1,174 +1,187 @@
 from __future__ import annotations
 
+import importlib
+import pkgutil
+import re
 import sqlite3
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
-from passlib.context import CryptContext
-
 from .config import settings
+from .metrics import DB_QUERY_SECONDS
+from .tracing import record_span, tracing_active
+
+MIGRATIONS_PACKAGE = "cold_ai.migrations"
+_MIGRATION_MODULE_PATTERN = re.compile(r"^m(\d{4})_(\w+)$")
+_current_schema: set[Path] = set()
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[sqlite3.Connection], None]
+
+
+@lru_cache(maxsize=1024)
+def _statement_operation(sql: str) -> str:
+    words = sql.split(None, 1)
+    return words[0].lower() if words else "unknown"
+
+
+_WRITE_OPERATIONS = {"insert", "update", "delete", "replace"}
+
+
+def _observe_statement(sql: str, started_ns: int) -> None:
+    elapsed_ns = time.perf_counter_ns() - started_ns
+    operation = _statement_operation(sql)
+    DB_QUERY_SECONDS.observe(elapsed_ns / 1e9, operation)
+    if operation in _WRITE_OPERATIONS and tracing_active():
+        record_span(f"db {operation}", "db", started_ns, elapsed_ns / 1000, sql=" ".join(sql.split())[:200])
+
+
+class TimedConnection(sqlite3.Connection):
+    def execute(self, sql: str, parameters=(), /) -> sqlite3.Cursor:
+        started = time.perf_counter_ns()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _observe_statement(sql, started)
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+    def executemany(self, sql: str, parameters, /) -> sqlite3.Cursor:
+        started = time.perf_counter_ns()
+        try:
+            return super().executemany(sql, parameters)
+        finally:
+            _observe_statement(sql, started)
 
 
 def get_connection() -> sqlite3.Connection:
     settings.db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(settings.db_path)
+    factory = TimedConnection if settings.metrics_db_timing else sqlite3.Connection
+    conn = sqlite3.connect(settings.db_path, factory=factory)
     conn.row_factory = sqlite3.Row
     return conn
 
 
-def init_db() -> None:
-    with get_connection() as conn:
-        conn.executescript(
+def discover_migrations() -> list[Migration]:
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    migrations: list[Migration] = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        match = _MIGRATION_MODULE_PATTERN.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{module_info.name}")
+        migrations.append(Migration(version=int(match.group(1)), name=match.group(2), upgrade=module.upgrade))
+
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate schema migration versions in {MIGRATIONS_PACKAGE}")
+    return migrations
+
+
+def _latest_version() -> int:
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    versions = [
+        int(match.group(1))
+        for module_info in pkgutil.iter_modules(package.__path__)
+        if (match := _MIGRATION_MODULE_PATTERN.match(module_info.name))
+    ]
+    return max(versions, default=0)
+
+
+def current_schema_version(conn: sqlite3.Connection) -> int:
+    try:
+        row = conn.execute("SELECT max(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return int(row[0] or 0)
+
+
+def schema_status() -> dict:
+    migrations = discover_migrations()
+    conn = get_connection()
+    try:
+        current = current_schema_version(conn)
+        applied = {
+            int(row["version"]): row["applied_at"]
+            for row in (
+                conn.execute("SELECT version, applied_at FROM schema_version").fetchall() if current else []
+            )
+        }
+    finally:
+        conn.close()
+
+    return {
+        "current_version": current,
+        "latest_version": migrations[-1].version if migrations else 0,
+        "migrations": [
+            {
+                "version": migration.version,
+                "name": migration.name,
+                "applied_at": applied.get(migration.version),
+            }
+            for migration in migrations
+        ],
+    }
+
+
+def migrate() -> list[Migration]:
+    conn = get_connection()
+    conn.isolation_level = None
+    applied: list[Migration] = []
+    try:
+        conn.execute(
             """
-            PRAGMA foreign_keys = ON;
-
-            CREATE TABLE IF NOT EXISTS leads (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                full_name TEXT,
-                first_name TEXT,
-                last_name TEXT,
-                email TEXT NOT NULL UNIQUE,
-                phone TEXT,
-                specialty TEXT,
-                city TEXT,
-                address TEXT,
-                source_hash TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS campaigns (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
                 name TEXT NOT NULL,
-                purpose TEXT,
-                channel TEXT NOT NULL DEFAULT 'email',
-                subject_template TEXT NOT NULL,
-                body_template TEXT NOT NULL,
-                status TEXT NOT NULL DEFAULT 'active',
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS drafts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                campaign_id INTEGER NOT NULL,
-                lead_id INTEGER NOT NULL,
-                subject TEXT NOT NULL,
-                body TEXT NOT NULL,
-                status TEXT NOT NULL DEFAULT 'draft',
-                scheduled_at TEXT,
-                approved_at TEXT,
-                sent_at TEXT,
-                error_message TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(campaign_id, lead_id),
-                FOREIGN KEY(campaign_id) REFERENCES campaigns(id),
-                FOREIGN KEY(lead_id) REFERENCES leads(id)
-            );
-
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                draft_id INTEGER,
-                event_type TEXT NOT NULL,
-                payload TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(draft_id) REFERENCES drafts(id)
-            );
-
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT NOT NULL UNIQUE,
-                password_hash TEXT NOT NULL,
-                full_name TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS template_library (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                owner_key TEXT NOT NULL,
-                title TEXT NOT NULL,
-                category TEXT NOT NULL,
-                content TEXT NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS agent_settings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                owner_key TEXT NOT NULL UNIQUE,
-                llm_provider TEXT NOT NULL DEFAULT 'openai',
-                llm_base_url TEXT,
-                llm_api_key TEXT,
-                llm_models_json TEXT,
-                enable_web_research INTEGER NOT NULL DEFAULT 0,
-                enable_llm_rewrite INTEGER NOT NULL DEFAULT 0,
-                prompt_search TEXT,
-                prompt_routing TEXT,
-                prompt_supervisor TEXT,
-                prompt_rewrite TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS outreach_memory (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                owner_key TEXT NOT NULL,
-                channel TEXT NOT NULL,
-                purpose TEXT,
-                specialty TEXT,
-                pattern_text TEXT NOT NULL,
-                quality_score REAL NOT NULL DEFAULT 0.5,
-                source_event TEXT NOT NULL,
-                usage_count INTEGER NOT NULL DEFAULT 0,
-                last_used_at TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
+                applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
             """
         )
+        for migration in discover_migrations():
+            # Each migration commits on its own; re-checking the version under the
+            # write lock keeps concurrent processes from applying it twice.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if current_schema_version(conn) >= migration.version:
+                    conn.execute("ROLLBACK")
+                    continue
+                migration.upgrade(conn)
+                conn.execute(
+                    "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+                    (migration.version, migration.name),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            applied.append(migration)
+    finally:
+        conn.close()
+
+    _current_schema.add(settings.db_path.resolve())
+    return applied
 
-        campaign_columns = {
-            row["name"]
-            for row in conn.execute("PRAGMA table_info(campaigns)").fetchall()
-        }
-        if "purpose" not in campaign_columns:
-            conn.execute("ALTER TABLE campaigns ADD COLUMN purpose TEXT")
-        if "channel" not in campaign_columns:
-            conn.execute("ALTER TABLE campaigns ADD COLUMN channel TEXT NOT NULL DEFAULT 'email'")
-
-        lead_columns = {
-            row["name"]
-            for row in conn.execute("PRAGMA table_info(leads)").fetchall()
-        }
-        if "phone" not in lead_columns:
-            conn.execute("ALTER TABLE leads ADD COLUMN phone TEXT")
-
-        agent_settings_columns = {
-            row["name"]
-            for row in conn.execute("PRAGMA table_info(agent_settings)").fetchall()
-        }
-        if "llm_provider" not in agent_settings_columns:
-            conn.execute(
-                "ALTER TABLE agent_settings ADD COLUMN llm_provider TEXT NOT NULL DEFAULT 'openai'"
-            )
 
-        outreach_memory_columns = {
-            row["name"]
-            for row in conn.execute("PRAGMA table_info(outreach_memory)").fetchall()
-        }
-        if outreach_memory_columns and "usage_count" not in outreach_memory_columns:
-            conn.execute("ALTER TABLE outreach_memory ADD COLUMN usage_count INTEGER NOT NULL DEFAULT 0")
-        if outreach_memory_columns and "last_used_at" not in outreach_memory_columns:
-            conn.execute("ALTER TABLE outreach_memory ADD COLUMN last_used_at TEXT")
-
-        existing = conn.execute(
-            "SELECT id FROM users WHERE lower(email) = lower(?)",
-            ("mock.admin@cold-ai.com",),
-        ).fetchone()
-        if not existing:
-            conn.execute(
-                """
-                INSERT INTO users (email, password_hash, full_name)
-                VALUES (?, ?, ?)
-                """,
-                ("mock.admin@cold-ai.com", pwd_context.hash("MockAdmin123!"), "Mock Admin"),
-            )
+def init_db() -> None:
+    db_path = settings.db_path.resolve()
+    if db_path in _current_schema:
+        return
+
+    conn = get_connection()
+    try:
+        is_current = current_schema_version(conn) >= _latest_version()
+    finally:
+        conn.close()
+
+    if is_current:
+        _current_schema.add(db_path)
+        return
+    migrate()
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import atexit
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PROCESS_START_TIME = time.time()
+
+# (name, help, [(labels, value), ...]) gauges computed at scrape time.
+GaugeFamily = tuple[str, str, list[tuple[dict[str, str], float]]]
+
+_metrics: list[_Metric] = []
+_collectors: list[Callable[[], Iterable[GaugeFamily]]] = []
+_registry_lock = threading.Lock()
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+# Every thread records into its own shard, so the hot path takes no lock; a scrape
+# merges the shards. Shards of finished threads are kept because counters never go down.
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._shards_lock = threading.Lock()
+        with _registry_lock:
+            _metrics.append(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: dict = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _snapshots(self) -> list[dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        return [shard.copy() for shard in shards]
+
+    def _labels(self, values: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def values(self) -> dict[tuple[str, ...], float]:
+        merged: dict[tuple[str, ...], float] = {}
+        for shard in self._snapshots():
+            for labels, value in shard.items():
+                merged[labels] = merged.get(labels, 0.0) + value
+        return merged
+
+    def render(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self._labels(labels))} {_format_value(value)}"
+            for labels, value in sorted(self.values().items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        row = shard.get(labels)
+        if row is None:
+            # One slot per bucket plus +Inf, then sum and count.
+            row = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    def render(self) -> list[str]:
+        merged: dict[tuple[str, ...], list] = {}
+        for shard in self._snapshots():
+            for labels, row in shard.items():
+                row = list(row)
+                total = merged.get(labels)
+                merged[labels] = row if total is None else [a + b for a, b in zip(total, row)]
+
+        lines: list[str] = []
+        for labels, row in sorted(merged.items()):
+            base = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), row):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels({**base, 'le': _format_value(bound)})} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_format_labels(base)} {_format_value(row[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(base)} {row[-1]}")
+        return lines
+
+
+def register_collector(collector: Callable[[], Iterable[GaugeFamily]]) -> None:
+    with _registry_lock:
+        _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    with _registry_lock:
+        metrics, collectors = list(_metrics), list(_collectors)
+    lines: list[str] = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    for collector in collectors:
+        try:
+            families = list(collector())
+        except Exception:
+            # A failing collector (e.g. the database is locked) must not break the scrape.
+            continue
+        for name, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written aside and renamed so the node_exporter textfile collector never reads a partial file.
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(render_metrics(), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def start_textfile_exporter(path: Path, interval: float) -> threading.Thread:
+    stop = threading.Event()
+
+    def run() -> None:
+        while not stop.wait(interval):
+            try:
+                write_textfile(path)
+            except OSError:
+                continue
+
+    def finish() -> None:
+        stop.set()
+        write_textfile(path)
+
+    thread = threading.Thread(target=run, name="cold-ai-metrics-textfile", daemon=True)
+    thread.start()
+    atexit.register(finish)
+    return thread
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "cold_ai_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+DB_QUERY_SECONDS = Histogram(
+    "cold_ai_db_query_duration_seconds",
+    "SQLite statement execution time by statement type.",
+    ("operation",),
+    buckets=DB_BUCKETS,
+)
+LLM_REQUESTS_TOTAL = Counter(
+    "cold_ai_llm_requests_total",
+    "LLM attempts by provider, model and outcome.",
+    ("provider", "model", "outcome"),
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "cold_ai_llm_request_duration_seconds",
+    "LLM attempt latency by provider and model.",
+    ("provider", "model"),
+)
+PIPELINE_STAGE_SECONDS = Histogram(
+    "cold_ai_pipeline_stage_duration_seconds",
+    "Drafting pipeline stage latency.",
+    ("stage",),
+)
+MESSAGES_SENT_TOTAL = Counter(
+    "cold_ai_messages_sent_total",
+    "Outreach send attempts by channel and outcome.",
+    ("channel", "outcome"),
+)
+SEND_SECONDS = Histogram(
+    "cold_ai_send_duration_seconds",
+    "Provider send latency by channel.",
+    ("channel",),
+)
+CACHE_REQUESTS_TOTAL = Counter(
+    "cold_ai_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+
+
+def _builtin_gauges() -> Iterable[GaugeFamily]:
+    lookups: dict[str, dict[str, float]] = {}
+    for (cache, result), value in CACHE_REQUESTS_TOTAL.values().items():
+        lookups.setdefault(cache, {})[result] = value
+    ratios = [
+        ({"cache": cache}, counts.get("hit", 0.0) / total)
+        for cache, counts in sorted(lookups.items())
+        if (total := sum(counts.values()))
+    ]
+    yield "cold_ai_cache_hit_ratio", "Share of cache lookups served from the cache.", ratios
+    yield "cold_ai_process_start_time_seconds", "Start time of the process since the epoch.", [({}, PROCESS_START_TIME)]
+
+
+register_collector(_builtin_gauges)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import sqlite3
+
+STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS leads (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        full_name TEXT,
+        first_name TEXT,
+        last_name TEXT,
+        email TEXT NOT NULL UNIQUE,
+        phone TEXT,
+        specialty TEXT,
+        city TEXT,
+        address TEXT,
+        source_hash TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS campaigns (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        purpose TEXT,
+        channel TEXT NOT NULL DEFAULT 'email',
+        subject_template TEXT NOT NULL,
+        body_template TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'active',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS drafts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        campaign_id INTEGER NOT NULL,
+        lead_id INTEGER NOT NULL,
+        subject TEXT NOT NULL,
+        body TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'draft',
+        scheduled_at TEXT,
+        approved_at TEXT,
+        sent_at TEXT,
+        error_message TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(campaign_id, lead_id),
+        FOREIGN KEY(campaign_id) REFERENCES campaigns(id),
+        FOREIGN KEY(lead_id) REFERENCES leads(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        draft_id INTEGER,
+        event_type TEXT NOT NULL,
+        payload TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(draft_id) REFERENCES drafts(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT NOT NULL UNIQUE,
+        password_hash TEXT NOT NULL,
+        full_name TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS template_library (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        owner_key TEXT NOT NULL,
+        title TEXT NOT NULL,
+        category TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS agent_settings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        owner_key TEXT NOT NULL UNIQUE,
+        llm_provider TEXT NOT NULL DEFAULT 'openai',
+        llm_base_url TEXT,
+        llm_api_key TEXT,
+        llm_models_json TEXT,
+        enable_web_research INTEGER NOT NULL DEFAULT 0,
+        enable_llm_rewrite INTEGER NOT NULL DEFAULT 0,
+        prompt_search TEXT,
+        prompt_routing TEXT,
+        prompt_supervisor TEXT,
+        prompt_rewrite TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS outreach_memory (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        owner_key TEXT NOT NULL,
+        channel TEXT NOT NULL,
+        purpose TEXT,
+        specialty TEXT,
+        pattern_text TEXT NOT NULL,
+        quality_score REAL NOT NULL DEFAULT 0.5,
+        source_event TEXT NOT NULL,
+        usage_count INTEGER NOT NULL DEFAULT 0,
+        last_used_at TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    for statement in STATEMENTS:
+        conn.execute(statement)
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import sqlite3
+
+LEGACY_COLUMNS = (
+    ("campaigns", "purpose", "TEXT"),
+    ("campaigns", "channel", "TEXT NOT NULL DEFAULT 'email'"),
+    ("leads", "phone", "TEXT"),
+    ("agent_settings", "llm_provider", "TEXT NOT NULL DEFAULT 'openai'"),
+    ("outreach_memory", "usage_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("outreach_memory", "last_used_at", "TEXT"),
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    for table, column, definition in LEGACY_COLUMNS:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import sqlite3
+
+MOCK_ADMIN_EMAIL = "mock.admin@cold-ai.com"
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    existing = conn.execute(
+        "SELECT id FROM users WHERE lower(email) = lower(?)",
+        (MOCK_ADMIN_EMAIL,),
+    ).fetchone()
+    if existing:
+        return
+
+    from passlib.context import CryptContext
+
+    pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+    conn.execute(
+        """
+        INSERT INTO users (email, password_hash, full_name)
+        VALUES (?, ?, ?)
+        """,
+        (MOCK_ADMIN_EMAIL, pwd_context.hash("MockAdmin123!"), "Mock Admin"),
+    )
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import sqlite3
+
+STATEMENTS = (
+    # DraftRepository.list_due: approved drafts ordered by schedule time.
+    """
+    CREATE INDEX IF NOT EXISTS idx_drafts_due
+    ON drafts(status, scheduled_at)
+    WHERE status = 'approved'
+    """,
+    # DraftRepository.list_for_campaign: per-campaign drafts in id order without a sort step.
+    """
+    CREATE INDEX IF NOT EXISTS idx_drafts_campaign
+    ON drafts(campaign_id, id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_events_draft
+    ON events(draft_id)
+    """,
+    # OutreachMemoryRepository.list_for_context / list_by_owner(channel=...): top-N by quality.
+    """
+    CREATE INDEX IF NOT EXISTS idx_outreach_memory_context
+    ON outreach_memory(owner_key, channel, quality_score DESC, usage_count DESC, id DESC)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_template_library_owner
+    ON template_library(owner_key, updated_at DESC, id DESC)
+    """,
+    # UserRepository.get_by_email compares lower(email).
+    """
+    CREATE INDEX IF NOT EXISTS idx_users_email_lower
+    ON users(lower(email))
+    """,
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    for statement in STATEMENTS:
+        conn.execute(statement)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import sqlite3
+
+# SQLite can only add VIRTUAL generated columns to an existing table; the partial
+# indexes below store the computed values, so lead selection never evaluates them per row.
+_DIGITS_ONLY_PHONE = (
+    "replace(replace(replace(replace(replace(replace(trim(phone), ' ', ''), '-', ''), '.', ''), '(', ''), ')', ''), '/', '')"
+)
+
+STATEMENTS = (
+    """
+    ALTER TABLE leads ADD COLUMN has_real_email INTEGER
+    GENERATED ALWAYS AS (
+        email IS NOT NULL AND email != '' AND lower(email) NOT LIKE '%@no-email.invalid'
+    ) VIRTUAL
+    """,
+    """
+    ALTER TABLE leads ADD COLUMN has_phone INTEGER
+    GENERATED ALWAYS AS (phone IS NOT NULL AND trim(phone) != '') VIRTUAL
+    """,
+    f"""
+    ALTER TABLE leads ADD COLUMN phone_e164 TEXT
+    GENERATED ALWAYS AS (
+        CASE
+            WHEN phone IS NULL OR trim(phone) = '' THEN NULL
+            WHEN {_DIGITS_ONLY_PHONE} LIKE '+%' THEN {_DIGITS_ONLY_PHONE}
+            WHEN {_DIGITS_ONLY_PHONE} LIKE '00%' THEN '+' || substr({_DIGITS_ONLY_PHONE}, 3)
+            WHEN {_DIGITS_ONLY_PHONE} LIKE '213%' THEN '+' || {_DIGITS_ONLY_PHONE}
+            WHEN {_DIGITS_ONLY_PHONE} LIKE '0%' THEN '+213' || substr({_DIGITS_ONLY_PHONE}, 2)
+            ELSE '+213' || {_DIGITS_ONLY_PHONE}
+        END
+    ) VIRTUAL
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_leads_email_reachable
+    ON leads(has_real_email)
+    WHERE has_real_email = 1
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_leads_phone_reachable
+    ON leads(has_phone)
+    WHERE has_phone = 1
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_leads_phone_e164
+    ON leads(phone_e164)
+    WHERE phone_e164 IS NOT NULL
+    """,
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    for statement in STATEMENTS:
+        conn.execute(statement)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import sqlite3
+
+STATEMENTS = (
+    "ALTER TABLE drafts ADD COLUMN supervisor_score REAL",
+    # Keyset pagination of the review list, filtered by status and/or sorted by score.
+    """
+    CREATE INDEX IF NOT EXISTS idx_drafts_campaign_status
+    ON drafts(campaign_id, status, id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_drafts_campaign_score
+    ON drafts(campaign_id, ifnull(supervisor_score, -1), id)
+    """,
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    for statement in STATEMENTS:
+        conn.execute(statement)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import sqlite3
+
+STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        campaign_id INTEGER,
+        owner_key TEXT,
+        params TEXT NOT NULL DEFAULT '{}',
+        status TEXT NOT NULL DEFAULT 'queued',
+        total INTEGER NOT NULL DEFAULT 0,
+        processed INTEGER NOT NULL DEFAULT 0,
+        created INTEGER NOT NULL DEFAULT 0,
+        ignored INTEGER NOT NULL DEFAULT 0,
+        checkpoint_lead_id INTEGER,
+        checkpoint_processed INTEGER NOT NULL DEFAULT 0,
+        cancel_requested INTEGER NOT NULL DEFAULT 0,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        started_at TEXT,
+        heartbeat_at TEXT,
+        finished_at TEXT,
+        FOREIGN KEY(campaign_id) REFERENCES campaigns(id)
+    )
+    """,
+    # Workers claim the oldest queued job; stale running jobs are found by heartbeat.
+    """
+    CREATE INDEX IF NOT EXISTS idx_jobs_status
+    ON jobs(status, id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_jobs_campaign
+    ON jobs(campaign_id, id)
+    """,
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    for statement in STATEMENTS:
+        conn.execute(statement)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import sqlite3
+
+STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS campaign_stats (
+        campaign_id INTEGER PRIMARY KEY,
+        total INTEGER NOT NULL DEFAULT 0,
+        draft INTEGER NOT NULL DEFAULT 0,
+        approved INTEGER NOT NULL DEFAULT 0,
+        rejected INTEGER NOT NULL DEFAULT 0,
+        sent INTEGER NOT NULL DEFAULT 0,
+        failed INTEGER NOT NULL DEFAULT 0,
+        score_sum REAL NOT NULL DEFAULT 0,
+        score_count INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(campaign_id) REFERENCES campaigns(id)
+    )
+    """,
+    """
+    INSERT OR REPLACE INTO campaign_stats (
+        campaign_id, total, draft, approved, rejected, sent, failed, score_sum, score_count
+    )
+    SELECT
+        c.id,
+        count(d.id),
+        ifnull(sum(d.status = 'draft'), 0),
+        ifnull(sum(d.status = 'approved'), 0),
+        ifnull(sum(d.status = 'rejected'), 0),
+        ifnull(sum(d.status = 'sent'), 0),
+        ifnull(sum(d.status = 'failed'), 0),
+        ifnull(sum(d.supervisor_score), 0),
+        count(d.supervisor_score)
+    FROM campaigns c
+    LEFT JOIN drafts d ON d.campaign_id = c.id
+    GROUP BY c.id
+    """,
+    # Triggers keep the counters in the same transaction as every draft write,
+    # whichever code path (single, bulk, send loop) makes it.
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_campaign_stats_campaign_insert
+    AFTER INSERT ON campaigns
+    BEGIN
+        INSERT OR IGNORE INTO campaign_stats (campaign_id) VALUES (NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_campaign_stats_draft_insert
+    AFTER INSERT ON drafts
+    BEGIN
+        INSERT OR IGNORE INTO campaign_stats (campaign_id) VALUES (NEW.campaign_id);
+        UPDATE campaign_stats
+        SET total = total + 1,
+            draft = draft + (NEW.status = 'draft'),
+            approved = approved + (NEW.status = 'approved'),
+            rejected = rejected + (NEW.status = 'rejected'),
+            sent = sent + (NEW.status = 'sent'),
+            failed = failed + (NEW.status = 'failed'),
+            score_sum = score_sum + ifnull(NEW.supervisor_score, 0),
+            score_count = score_count + (NEW.supervisor_score IS NOT NULL),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE campaign_id = NEW.campaign_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_campaign_stats_draft_update
+    AFTER UPDATE OF status, supervisor_score ON drafts
+    WHEN OLD.status IS NOT NEW.status OR OLD.supervisor_score IS NOT NEW.supervisor_score
+    BEGIN
+        UPDATE campaign_stats
+        SET draft = draft + (NEW.status = 'draft') - (OLD.status = 'draft'),
+            approved = approved + (NEW.status = 'approved') - (OLD.status = 'approved'),
+            rejected = rejected + (NEW.status = 'rejected') - (OLD.status = 'rejected'),
+            sent = sent + (NEW.status = 'sent') - (OLD.status = 'sent'),
+            failed = failed + (NEW.status = 'failed') - (OLD.status = 'failed'),
+            score_sum = score_sum + ifnull(NEW.supervisor_score, 0) - ifnull(OLD.supervisor_score, 0),
+            score_count = score_count + (NEW.supervisor_score IS NOT NULL) - (OLD.supervisor_score IS NOT NULL),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE campaign_id = NEW.campaign_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_campaign_stats_draft_delete
+    AFTER DELETE ON drafts
+    BEGIN
+        UPDATE campaign_stats
+        SET total = total - 1,
+            draft = draft - (OLD.status = 'draft'),
+            approved = approved - (OLD.status = 'approved'),
+            rejected = rejected - (OLD.status = 'rejected'),
+            sent = sent - (OLD.status = 'sent'),
+            failed = failed - (OLD.status = 'failed'),
+            score_sum = score_sum - ifnull(OLD.supervisor_score, 0),
+            score_count = score_count - (OLD.supervisor_score IS NOT NULL),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE campaign_id = OLD.campaign_id;
+    END
+    """,
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    for statement in STATEMENTS:
+        conn.execute(statement)
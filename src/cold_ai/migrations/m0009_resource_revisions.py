@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import sqlite3
+
+
+def _bump(*resources: str) -> str:
+    return "\n".join(
+        f"""
+        INSERT INTO resource_revisions (resource, revision, updated_at)
+        VALUES ({resource}, 1, strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+        ON CONFLICT(resource) DO UPDATE SET revision = revision + 1, updated_at = excluded.updated_at;
+        """
+        for resource in resources
+    )
+
+
+def _trigger(name: str, event: str, table: str, *resources: str) -> str:
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS {name}
+    AFTER {event} ON {table}
+    BEGIN
+        {_bump(*resources)}
+    END
+    """
+
+
+# Revision counters back the ETag/Last-Modified validators of the read API; every
+# write to a resource bumps its counter in the same transaction.
+STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS resource_revisions (
+        resource TEXT PRIMARY KEY,
+        revision INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    _trigger("trg_revision_campaign_insert", "INSERT", "campaigns", "'campaigns'", "'campaign:' || NEW.id"),
+    _trigger("trg_revision_campaign_update", "UPDATE", "campaigns", "'campaigns'", "'campaign:' || NEW.id"),
+    _trigger("trg_revision_campaign_delete", "DELETE", "campaigns", "'campaigns'", "'campaign:' || OLD.id"),
+    _trigger("trg_revision_campaign_stats", "UPDATE", "campaign_stats", "'campaign:' || NEW.campaign_id"),
+    _trigger("trg_revision_agent_settings_insert", "INSERT", "agent_settings", "'agent_settings:' || NEW.owner_key"),
+    _trigger("trg_revision_agent_settings_update", "UPDATE", "agent_settings", "'agent_settings:' || NEW.owner_key"),
+    _trigger("trg_revision_agent_settings_delete", "DELETE", "agent_settings", "'agent_settings:' || OLD.owner_key"),
+    _trigger("trg_revision_outreach_memory_insert", "INSERT", "outreach_memory", "'outreach_memory:' || NEW.owner_key"),
+    _trigger("trg_revision_outreach_memory_update", "UPDATE", "outreach_memory", "'outreach_memory:' || NEW.owner_key"),
+    _trigger("trg_revision_outreach_memory_delete", "DELETE", "outreach_memory", "'outreach_memory:' || OLD.owner_key"),
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    for statement in STATEMENTS:
+        conn.execute(statement)
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import sqlite3
+
+# Bumped on every settings write; in-process caches of the resolved agent config compare it
+# to decide whether their entry is still current.
+STATEMENTS = (
+    """
+    ALTER TABLE agent_settings ADD COLUMN version INTEGER NOT NULL DEFAULT 1
+    """,
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    for statement in STATEMENTS:
+        conn.execute(statement)
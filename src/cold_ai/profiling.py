@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+PROFILE_SORT_KEYS = ("cumulative", "tottime", "calls", "ncalls")
+
+
+@dataclass(frozen=True)
+class MemoryPhase:
+    name: str
+    seconds: float
+    current_mb: float
+    peak_mb: float
+    snapshot: tracemalloc.Snapshot
+
+
+def _mb(size: int) -> float:
+    return size / (1024 * 1024)
+
+
+def _site(stat: tracemalloc.Statistic | tracemalloc.StatisticDiff) -> str:
+    frame = stat.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class CommandProfiler:
+    def __init__(
+        self,
+        cpu_output: Path | None = None,
+        trace_memory: bool = False,
+        top: int = 25,
+        sort: str = "cumulative",
+    ) -> None:
+        if sort not in PROFILE_SORT_KEYS:
+            raise ValueError(f"Profile sort must be one of: {', '.join(PROFILE_SORT_KEYS)}")
+        self.cpu_output = cpu_output
+        self.trace_memory = trace_memory
+        self.top = max(1, top)
+        self.sort = sort
+        self.phases: list[MemoryPhase] = []
+        self._profile: cProfile.Profile | None = None
+        self._started = time.perf_counter()
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.cpu_output is not None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    # Peak is reset at every boundary, so each phase reports its own high-water mark.
+    def mark_phase(self, name: str) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        # Snapshots are expensive; keep them out of the CPU profile.
+        if self._profile is not None:
+            self._profile.disable()
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<unknown>"))
+        )
+        self.phases.append(
+            MemoryPhase(name, time.perf_counter() - self._started, _mb(current), _mb(peak), snapshot)
+        )
+        tracemalloc.reset_peak()
+        if self._profile is not None:
+            self._profile.enable()
+
+    def stop(self) -> list[str]:
+        profile, self._profile = self._profile, None
+        if profile is not None:
+            profile.disable()
+        # The last snapshot is taken before the stats are dumped so the report leaves out the profiler itself.
+        memory_lines: list[str] = []
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.mark_phase("end")
+            tracemalloc.stop()
+            memory_lines = self._memory_report()
+
+        lines: list[str] = []
+        if profile is not None:
+            self.cpu_output.parent.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(self.cpu_output)
+            buffer = io.StringIO()
+            pstats.Stats(profile, stream=buffer).strip_dirs().sort_stats(self.sort).print_stats(self.top)
+            lines.append(f"CPU profile written: {self.cpu_output} (top {self.top} by {self.sort})")
+            lines.extend(line for line in buffer.getvalue().splitlines() if line.strip())
+        return lines + memory_lines
+
+    def _memory_report(self) -> list[str]:
+        lines = [f"Memory peak: {max(phase.peak_mb for phase in self.phases):.1f} MB (tracemalloc)"]
+        lines.append(f"{'phase':<22} {'at':>9} {'current':>11} {'peak':>11}")
+        for phase in self.phases:
+            lines.append(
+                f"{phase.name:<22} {phase.seconds:>8.2f}s {phase.current_mb:>8.1f} MB {phase.peak_mb:>8.1f} MB"
+            )
+
+        previous = None
+        for phase in self.phases:
+            if previous is not None:
+                growth = [
+                    stat for stat in phase.snapshot.compare_to(previous.snapshot, "lineno") if stat.size_diff > 0
+                ][: self.top]
+                if growth:
+                    lines.append(f"Top allocation growth {previous.name} -> {phase.name}:")
+                    lines.extend(
+                        f"  {_mb(stat.size_diff):>8.2f} MB {stat.count_diff:>+9} blocks  {_site(stat)}"
+                        for stat in growth
+                    )
+            previous = phase
+
+        final = self.phases[-1]
+        lines.append(f"Top allocation sites still live at {final.name}:")
+        lines.extend(
+            f"  {_mb(stat.size):>8.2f} MB {stat.count:>9} blocks  {_site(stat)}"
+            for stat in final.snapshot.statistics("lineno")[: self.top]
+        )
+        return lines
+
+
+_active_profiler: CommandProfiler | None = None
+
+
+def start_command_profiler(profiler: CommandProfiler) -> CommandProfiler:
+    global _active_profiler
+    _active_profiler = profiler
+    profiler.start()
+    return profiler
+
+
+def stop_command_profiler() -> list[str]:
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    return profiler.stop() if profiler else []
+
+
+def mark_phase(name: str) -> None:
+    if _active_profiler is not None:
+        _active_profiler.mark_phase(name)
@@ -1,20 +1,157 @@
 from __future__ import annotations
 
+import atexit
 import json
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
 
+from .config import settings
 from .db import get_connection
+from .metrics import GaugeFamily, register_collector
+
+_active_connection: ContextVar[sqlite3.Connection | None] = ContextVar("cold_ai_uow_connection", default=None)
 
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+@contextmanager
+def _connection() -> Iterator[sqlite3.Connection]:
+    shared = _active_connection.get()
+    if shared is not None:
+        yield shared
+        return
+
+    conn = get_connection()
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+class Record(sqlite3.Row):
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except IndexError:
+            return default
+
+
+def _iter_keyset(
+    build_query: Callable[[Record | None], tuple[str, tuple]],
+    page_size: int | None = None,
+) -> Iterator[Record]:
+    size = max(1, page_size or settings.db_page_size)
+    last: Record | None = None
+    while True:
+        sql, params = build_query(last)
+        # One short-lived connection per page: the iterator may be advanced from
+        # different threads (e.g. a streaming response) and may be abandoned early.
+        conn = get_connection()
+        try:
+            conn.row_factory = Record
+            rows = conn.execute(f"{sql}\nLIMIT ?", (*params, size)).fetchall()
+        finally:
+            conn.close()
+        yield from rows
+        if len(rows) < size:
+            return
+        last = rows[-1]
+
+
+def _describe_operation(operation: Callable[[], object]) -> str:
+    func = getattr(operation, "func", operation)
+    name = getattr(func, "__qualname__", repr(func))
+    scalars = (int, float, type(None))
+    args = [repr(value) for value in getattr(operation, "args", ()) if isinstance(value, scalars)]
+    args += [f"{key}={value!r}" for key, value in getattr(operation, "keywords", {}).items() if isinstance(value, scalars)]
+    return f"{name}({', '.join(args)})"
+
+
+class UnitOfWork:
+    def __init__(self, batch_size: int | None = None) -> None:
+        self.batch_size = max(1, batch_size or settings.db_write_batch_size)
+        self._pending: list[tuple[Callable[[], None], Callable[[], object] | None]] = []
+
+    def __enter__(self) -> UnitOfWork:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Queued operations belong to items that already completed, so they are persisted
+        # even when the caller is unwinding. A failing flush is raised (chained to the
+        # original error) rather than dropped.
+        self.flush()
+
+    # after_commit runs once the item is committed and the connection closed, for slow side
+    # effects (e.g. file I/O) that must not hold the database write lock. It is skipped when
+    # the item itself fails and is rolled back.
+    def add(self, operation: Callable[[], None], after_commit: Callable[[], object] | None = None) -> None:
+        self._pending.append((operation, after_commit))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        items, self._pending = self._pending, []
+
+        conn = get_connection()
+        conn.isolation_level = None
+        token = _active_connection.set(conn)
+        committed: list[Callable[[], object]] = []
+        failures: list[tuple[Callable[[], None], Exception]] = []
+        # Each queued item gets its own savepoint: a failing item is rolled back alone,
+        # the rest of the batch is committed and the first error is re-raised.
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for operation, after_commit in items:
+                conn.execute("SAVEPOINT uow_item")
+                try:
+                    operation()
+                except Exception as exc:
+                    conn.execute("ROLLBACK TO uow_item")
+                    failures.append((operation, exc))
+                else:
+                    if after_commit is not None:
+                        committed.append(after_commit)
+                finally:
+                    conn.execute("RELEASE uow_item")
+            conn.execute("COMMIT")
+        except Exception:
+            # Nothing was committed (e.g. the database is locked): keep the batch queued.
+            self._pending = items + self._pending
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            _active_connection.reset(token)
+            conn.close()
+
+        for after_commit in committed:
+            after_commit()
+        if failures:
+            # The flush may be triggered by an unrelated later add(); name the item that failed.
+            operation, error = failures[0]
+            error.add_note(
+                f"Raised by unit-of-work item {_describe_operation(operation)} "
+                f"({len(failures)} of {len(items)} items in the batch failed and were rolled back)"
+            )
+            raise error
+
+
 class LeadRepository:
     def upsert_many(self, leads: list[dict]) -> tuple[int, int]:
         inserted = 0
         skipped = 0
-        with get_connection() as conn:
+        with _connection() as conn:
             for lead in leads:
                 try:
                     conn.execute(
@@ -39,34 +176,31 @@ class LeadRepository:
                     skipped += 1
         return inserted, skipped
 
-    def list_for_drafting(self, limit: int, channel: str) -> list[dict]:
-        if channel == "whatsapp":
-            where_clause = "l.phone IS NOT NULL AND trim(l.phone) != ''"
-        else:
-            where_clause = "l.email IS NOT NULL AND lower(l.email) NOT LIKE '%@no-email.invalid'"
+    def list_for_drafting(self, limit: int, channel: str, after_lead_id: int | None = None) -> list[dict]:
+        where_clause = "l.has_phone = 1" if channel == "whatsapp" else "l.has_real_email = 1"
 
-        with get_connection() as conn:
+        with _connection() as conn:
             rows = conn.execute(
                 f"""
                 SELECT l.*
                 FROM leads l
-                WHERE {where_clause}
+                WHERE {where_clause} AND l.id > ?
                 ORDER BY l.id ASC
                 LIMIT ?
                 """,
-                (limit,),
+                (after_lead_id or 0, limit),
             ).fetchall()
         return [dict(row) for row in rows]
 
     def get_by_id(self, lead_id: int) -> dict | None:
-        with get_connection() as conn:
+        with _connection() as conn:
             row = conn.execute("SELECT * FROM leads WHERE id = ?", (lead_id,)).fetchone()
         return dict(row) if row else None
 
 
 class CampaignRepository:
     def create(self, name: str, purpose: str | None, channel: str, subject_template: str, body_template: str) -> int:
-        with get_connection() as conn:
+        with _connection() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO campaigns (name, purpose, channel, subject_template, body_template)
@@ -77,51 +211,287 @@ class CampaignRepository:
             return int(cursor.lastrowid)
 
     def get(self, campaign_id: int) -> dict | None:
-        with get_connection() as conn:
+        with _connection() as conn:
             row = conn.execute("SELECT * FROM campaigns WHERE id = ?", (campaign_id,)).fetchone()
         return dict(row) if row else None
 
     def list_all(self) -> list[dict]:
-        with get_connection() as conn:
-            rows = conn.execute(
-                """
+        return [dict(row) for row in self.iter_all()]
+
+    def iter_all(self, page_size: int | None = None) -> Iterator[Record]:
+        def build_query(last: Record | None) -> tuple[str, tuple]:
+            after = "WHERE id < ?" if last is not None else ""
+            sql = f"""
                 SELECT *
                 FROM campaigns
+                {after}
                 ORDER BY id DESC
                 """
+            return sql, ((last["id"],) if last is not None else ())
+
+        return _iter_keyset(build_query, page_size)
+
+
+DRAFT_STATUSES = ("draft", "approved", "rejected", "sent", "failed")
+
+_CAMPAIGN_STATS_COLUMNS = """
+campaign_id, total, draft, approved, rejected, sent, failed,
+CASE WHEN score_count > 0 THEN score_sum / score_count END AS avg_supervisor_score,
+score_count, updated_at
+"""
+
+
+class CampaignStatsRepository:
+    def get(self, campaign_id: int) -> dict | None:
+        with _connection() as conn:
+            row = conn.execute(
+                f"SELECT {_CAMPAIGN_STATS_COLUMNS} FROM campaign_stats WHERE campaign_id = ?",
+                (campaign_id,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list_all(self) -> list[dict]:
+        with _connection() as conn:
+            rows = conn.execute(
+                f"SELECT {_CAMPAIGN_STATS_COLUMNS} FROM campaign_stats ORDER BY campaign_id DESC"
             ).fetchall()
         return [dict(row) for row in rows]
 
+    def rebuild(self, campaign_id: int | None = None) -> int:
+        scope, params = ("WHERE c.id = ?", (campaign_id,)) if campaign_id is not None else ("", ())
+        with _connection() as conn:
+            result = conn.execute(
+                f"""
+                INSERT OR REPLACE INTO campaign_stats (
+                    campaign_id, total, draft, approved, rejected, sent, failed, score_sum, score_count, updated_at
+                )
+                SELECT
+                    c.id,
+                    count(d.id),
+                    ifnull(sum(d.status = 'draft'), 0),
+                    ifnull(sum(d.status = 'approved'), 0),
+                    ifnull(sum(d.status = 'rejected'), 0),
+                    ifnull(sum(d.status = 'sent'), 0),
+                    ifnull(sum(d.status = 'failed'), 0),
+                    ifnull(sum(d.supervisor_score), 0),
+                    count(d.supervisor_score),
+                    CURRENT_TIMESTAMP
+                FROM campaigns c
+                LEFT JOIN drafts d ON d.campaign_id = c.id
+                {scope}
+                GROUP BY c.id
+                """,
+                params,
+            )
+            return int(result.rowcount or 0)
+
+
+DRAFT_SORTS = {
+    "id": ("d.id", "ASC"),
+    "-id": ("d.id", "DESC"),
+    "score": ("ifnull(d.supervisor_score, -1)", "ASC"),
+    "-score": ("ifnull(d.supervisor_score, -1)", "DESC"),
+}
+
+
+def _draft_filter(
+    campaign_id: int,
+    status: str | None,
+    min_score: float | None,
+    max_score: float | None,
+    query: str | None,
+) -> tuple[list[str], list]:
+    conditions = ["d.campaign_id = ?"]
+    params: list = [campaign_id]
+    if status:
+        conditions.append("d.status = ?")
+        params.append(status)
+    if min_score is not None:
+        conditions.append("ifnull(d.supervisor_score, -1) >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        conditions.append("ifnull(d.supervisor_score, -1) <= ?")
+        params.append(max_score)
+    if query and query.strip():
+        pattern = f"%{query.strip().lower()}%"
+        conditions.append(
+            "lower(ifnull(l.full_name, '') || ' ' || ifnull(l.email, '') || ' ' || ifnull(l.phone, '')"
+            " || ' ' || d.subject || ' ' || ifnull(l.specialty, '') || ' ' || ifnull(l.city, '')) LIKE ?"
+        )
+        params.append(pattern)
+    return conditions, params
+
 
 class DraftRepository:
-    def create_or_ignore(self, campaign_id: int, lead_id: int, subject: str, body: str) -> bool:
-        with get_connection() as conn:
+    def create_or_ignore(
+        self,
+        campaign_id: int,
+        lead_id: int,
+        subject: str,
+        body: str,
+        supervisor_score: float | None = None,
+    ) -> int | None:
+        with _connection() as conn:
             result = conn.execute(
                 """
-                INSERT OR IGNORE INTO drafts (campaign_id, lead_id, subject, body, status)
-                VALUES (?, ?, ?, ?, 'draft')
+                INSERT OR IGNORE INTO drafts (campaign_id, lead_id, subject, body, status, supervisor_score)
+                VALUES (?, ?, ?, ?, 'draft', ?)
                 """,
-                (campaign_id, lead_id, subject, body),
+                (campaign_id, lead_id, subject, body, supervisor_score),
             )
-            return result.rowcount > 0
+            return int(result.lastrowid) if result.rowcount > 0 else None
 
-    def list_for_campaign(self, campaign_id: int) -> list[dict]:
-        with get_connection() as conn:
-            rows = conn.execute(
-                """
+    def exists_for_lead(self, campaign_id: int, lead_id: int) -> bool:
+        with _connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM drafts WHERE campaign_id = ? AND lead_id = ?",
+                (campaign_id, lead_id),
+            ).fetchone()
+        return row is not None
+
+    def page_for_campaign(
+        self,
+        campaign_id: int,
+        status: str | None = None,
+        min_score: float | None = None,
+        max_score: float | None = None,
+        query: str | None = None,
+        sort: str = "id",
+        after: tuple | None = None,
+        limit: int = 50,
+    ) -> list[Record]:
+        sort_expression, direction = DRAFT_SORTS.get(sort, DRAFT_SORTS["id"])
+        comparison = ">" if direction == "ASC" else "<"
+        conditions, params = _draft_filter(campaign_id, status, min_score, max_score, query)
+        if after is not None:
+            if sort_expression == "d.id":
+                conditions.append(f"d.id {comparison} ?")
+                params.append(after[-1])
+            else:
+                # The plain bound on the sort expression lets SQLite seek the index;
+                # the row-value comparison breaks ties on id.
+                conditions.append(f"{sort_expression} {comparison}= ?")
+                conditions.append(f"({sort_expression}, d.id) {comparison} (?, ?)")
+                params.extend([after[0], *after])
+
+        with _connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Record
+            return cursor.execute(
+                f"""
+                SELECT d.id, d.campaign_id, d.lead_id, d.subject, substr(d.body, 1, 180) AS body_preview,
+                       d.status, d.scheduled_at, d.approved_at, d.sent_at, d.error_message,
+                       d.supervisor_score, d.created_at,
+                       l.email, l.phone, l.full_name, l.specialty, l.city
+                FROM drafts d
+                JOIN leads l ON l.id = d.lead_id
+                WHERE {" AND ".join(conditions)}
+                ORDER BY {sort_expression} {direction}, d.id {direction}
+                LIMIT ?
+                """,
+                (*params, max(1, limit)),
+            ).fetchall()
+
+    def get_many(self, draft_ids: list[int]) -> list[Record]:
+        if not draft_ids:
+            return []
+        placeholders = ", ".join("?" for _ in draft_ids)
+        with _connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Record
+            return cursor.execute(
+                f"""
                 SELECT d.*, l.email, l.phone, l.full_name, l.specialty, l.city, c.channel
                 FROM drafts d
                 JOIN leads l ON l.id = d.lead_id
                 JOIN campaigns c ON c.id = d.campaign_id
-                WHERE d.campaign_id = ?
+                WHERE d.id IN ({placeholders})
                 ORDER BY d.id ASC
                 """,
-                (campaign_id,),
+                tuple(draft_ids),
             ).fetchall()
-        return [dict(row) for row in rows]
+
+    def select_for_bulk(
+        self,
+        draft_ids: list[int] | None = None,
+        campaign_id: int | None = None,
+        status: str | None = None,
+        min_score: float | None = None,
+        max_score: float | None = None,
+        query: str | None = None,
+    ) -> list[Record]:
+        if draft_ids is not None:
+            # json_each binds any number of ids as a single parameter.
+            conditions = ["d.id IN (SELECT value FROM json_each(?))"]
+            params: list = [json.dumps(draft_ids)]
+            if campaign_id is not None:
+                conditions.append("d.campaign_id = ?")
+                params.append(campaign_id)
+        elif campaign_id is not None:
+            conditions, params = _draft_filter(campaign_id, status, min_score, max_score, query)
+        else:
+            raise ValueError("Bulk selection needs draft ids or a campaign filter")
+
+        with _connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Record
+            return cursor.execute(
+                f"""
+                SELECT d.id, d.campaign_id, d.status
+                FROM drafts d
+                JOIN leads l ON l.id = d.lead_id
+                WHERE {" AND ".join(conditions)}
+                ORDER BY d.id ASC
+                """,
+                tuple(params),
+            ).fetchall()
+
+    def approve_many(self, schedule: list[tuple[str, int]]) -> None:
+        approved_at = utc_now_iso()
+        with _connection() as conn:
+            conn.executemany(
+                """
+                UPDATE drafts
+                SET status = 'approved', approved_at = ?, scheduled_at = ?
+                WHERE id = ?
+                """,
+                [(approved_at, scheduled_at, draft_id) for scheduled_at, draft_id in schedule],
+            )
+
+    def reschedule_many(self, schedule: list[tuple[str, int]]) -> None:
+        with _connection() as conn:
+            conn.executemany("UPDATE drafts SET scheduled_at = ? WHERE id = ?", schedule)
+
+    def reject_many(self, draft_ids: list[int]) -> None:
+        with _connection() as conn:
+            conn.executemany("UPDATE drafts SET status = 'rejected' WHERE id = ?", [(draft_id,) for draft_id in draft_ids])
+
+    def status_counts(self, campaign_id: int) -> dict[str, int]:
+        stats = CampaignStatsRepository().get(campaign_id)
+        if not stats:
+            return {}
+        return {status: int(stats[status]) for status in DRAFT_STATUSES}
+
+    def list_for_campaign(self, campaign_id: int) -> list[dict]:
+        return [dict(row) for row in self.iter_for_campaign(campaign_id)]
+
+    def iter_for_campaign(self, campaign_id: int, page_size: int | None = None) -> Iterator[Record]:
+        def build_query(last: Record | None) -> tuple[str, tuple]:
+            sql = """
+                SELECT d.*, l.email, l.phone, l.full_name, l.specialty, l.city, c.channel
+                FROM drafts d
+                JOIN leads l ON l.id = d.lead_id
+                JOIN campaigns c ON c.id = d.campaign_id
+                WHERE d.campaign_id = ?
+                  AND d.id > ?
+                ORDER BY d.id ASC
+                """
+            return sql, (campaign_id, last["id"] if last is not None else 0)
+
+        return _iter_keyset(build_query, page_size)
 
     def approve_and_schedule(self, draft_id: int, scheduled_at: str) -> None:
-        with get_connection() as conn:
+        with _connection() as conn:
             conn.execute(
                 """
                 UPDATE drafts
@@ -132,14 +502,14 @@ class DraftRepository:
             )
 
     def mark_rejected(self, draft_id: int) -> None:
-        with get_connection() as conn:
+        with _connection() as conn:
             conn.execute(
                 "UPDATE drafts SET status = 'rejected' WHERE id = ?",
                 (draft_id,),
             )
 
     def update_content(self, draft_id: int, subject: str, body: str) -> None:
-        with get_connection() as conn:
+        with _connection() as conn:
             conn.execute(
                 """
                 UPDATE drafts
@@ -150,13 +520,22 @@ class DraftRepository:
             )
 
     def list_due(self, now_iso: str, campaign_id: int | None = None) -> list[dict]:
+        return [dict(row) for row in self.iter_due(now_iso, campaign_id=campaign_id)]
+
+    def iter_due(
+        self,
+        now_iso: str,
+        campaign_id: int | None = None,
+        page_size: int | None = None,
+    ) -> Iterator[Record]:
         where_campaign = "AND d.campaign_id = ?" if campaign_id is not None else ""
-        params: tuple = (now_iso, campaign_id) if campaign_id is not None else (now_iso,)
+        campaign_params: tuple = (campaign_id,) if campaign_id is not None else ()
 
-        with get_connection() as conn:
-            rows = conn.execute(
-                f"""
-                SELECT d.*, l.email, l.phone, c.channel
+        def build_query(last: Record | None) -> tuple[str, tuple]:
+            after = "AND (d.scheduled_at, d.id) > (?, ?)" if last is not None else ""
+            after_params: tuple = (last["scheduled_at"], last["id"]) if last is not None else ()
+            sql = f"""
+                SELECT d.*, l.email, l.phone_e164, c.channel
                       , l.specialty, c.purpose
                 FROM drafts d
                 JOIN leads l ON l.id = d.lead_id
@@ -165,14 +544,27 @@ class DraftRepository:
                   AND d.scheduled_at IS NOT NULL
                   AND d.scheduled_at <= ?
                   {where_campaign}
-                ORDER BY d.scheduled_at ASC
+                  {after}
+                ORDER BY d.scheduled_at ASC, d.id ASC
+                """
+            return sql, (now_iso, *campaign_params, *after_params)
+
+        return _iter_keyset(build_query, page_size)
+
+    def count_due(self, now_iso: str) -> int:
+        with _connection() as conn:
+            row = conn.execute(
+                """
+                SELECT count(*) AS due
+                FROM drafts
+                WHERE status = 'approved' AND scheduled_at IS NOT NULL AND scheduled_at <= ?
                 """,
-                params,
-            ).fetchall()
-        return [dict(row) for row in rows]
+                (now_iso,),
+            ).fetchone()
+        return int(row["due"] or 0)
 
     def mark_sent(self, draft_id: int) -> None:
-        with get_connection() as conn:
+        with _connection() as conn:
             conn.execute(
                 """
                 UPDATE drafts
@@ -183,7 +575,7 @@ class DraftRepository:
             )
 
     def mark_failed(self, draft_id: int, error: str) -> None:
-        with get_connection() as conn:
+        with _connection() as conn:
             conn.execute(
                 """
                 UPDATE drafts
@@ -194,21 +586,180 @@ class DraftRepository:
             )
 
 
+_INSERT_EVENT_SQL = """
+INSERT INTO events (draft_id, event_type, payload)
+VALUES (?, ?, ?)
+"""
+
+EventRow = tuple[int | None, str, str]
+
+
+class EventSink:
+    def __init__(
+        self,
+        mode: str | None = None,
+        max_queue_size: int | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        self.synchronous = (mode or settings.event_sink_mode) == "sync"
+        self.batch_size = max(1, batch_size or settings.event_sink_batch_size)
+        self.dropped = 0
+        self._queue: queue.Queue[EventRow | None] = queue.Queue(
+            maxsize=max(1, max_queue_size or settings.event_sink_queue_size)
+        )
+        self._lock = threading.Lock()
+        self._writer: threading.Thread | None = None
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, row: EventRow) -> None:
+        if self.synchronous:
+            self._write([row])
+            return
+        self._ensure_writer()
+        # put() blocks while the queue is full, which applies backpressure to producers.
+        self._queue.put(row)
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        self._queue.put(None)
+        writer.join()
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run, name="cold-ai-event-sink", daemon=True)
+                self._writer.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            batch = [first] if first is not None else []
+            stop = first is None
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            try:
+                if batch:
+                    self._write(batch)
+            except Exception:
+                # The writer must outlive any bad batch: if it died, the bounded queue would
+                # fill up and every producer would block on put() forever.
+                self.dropped += len(batch)
+            finally:
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, rows: list[EventRow]) -> None:
+        try:
+            with _connection() as conn:
+                conn.executemany(_INSERT_EVENT_SQL, rows)
+            return
+        except Exception:
+            if self.synchronous:
+                raise
+        # Retry row by row so one bad row (e.g. a value SQLite cannot bind) only drops itself.
+        for row in rows:
+            try:
+                with _connection() as conn:
+                    conn.execute(_INSERT_EVENT_SQL, row)
+            except Exception:
+                self.dropped += 1
+
+
+_event_sink: EventSink | None = None
+_event_sink_lock = threading.Lock()
+
+
+def get_event_sink() -> EventSink:
+    global _event_sink
+    if _event_sink is None:
+        with _event_sink_lock:
+            if _event_sink is None:
+                _event_sink = EventSink()
+                atexit.register(_event_sink.close)
+    return _event_sink
+
+
 class EventRepository:
     def log(self, event_type: str, payload: dict, draft_id: int | None = None) -> None:
-        with get_connection() as conn:
-            conn.execute(
+        row: EventRow = (draft_id, event_type, json.dumps(payload, ensure_ascii=False))
+        shared = _active_connection.get()
+        if shared is not None:
+            # Inside a unit of work the event commits atomically with the item that produced it.
+            shared.execute(_INSERT_EVENT_SQL, row)
+            return
+        get_event_sink().submit(row)
+
+    def log_many(self, event_type: str, entries: list[tuple[int | None, dict]]) -> None:
+        rows: list[EventRow] = [
+            (draft_id, event_type, json.dumps(payload, ensure_ascii=False)) for draft_id, payload in entries
+        ]
+        shared = _active_connection.get()
+        if shared is not None:
+            shared.executemany(_INSERT_EVENT_SQL, rows)
+            return
+        for row in rows:
+            get_event_sink().submit(row)
+
+    def latest_id(self) -> int:
+        with _connection() as conn:
+            row = conn.execute("SELECT max(id) AS latest FROM events").fetchone()
+        return int(row["latest"] or 0)
+
+    def list_for_campaign_between(self, campaign_id: int, after_id: int, until_id: int, limit: int = 500) -> list[dict]:
+        with _connection() as conn:
+            rows = conn.execute(
                 """
-                INSERT INTO events (draft_id, event_type, payload)
-                VALUES (?, ?, ?)
+                SELECT e.id, e.draft_id, e.event_type, e.payload, e.created_at
+                FROM events e
+                JOIN drafts d ON d.id = e.draft_id
+                WHERE e.id > ? AND e.id <= ? AND d.campaign_id = ?
+                ORDER BY e.id ASC
+                LIMIT ?
                 """,
-                (draft_id, event_type, json.dumps(payload, ensure_ascii=False)),
-            )
+                (after_id, until_id, campaign_id, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def list_payloads_for_campaign(self, campaign_id: int, event_type: str, limit: int | None = None) -> list[dict]:
+        with _connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT e.payload
+                FROM events e
+                JOIN drafts d ON d.id = e.draft_id
+                WHERE d.campaign_id = ? AND e.event_type = ?
+                ORDER BY e.id DESC
+                LIMIT ?
+                """,
+                (campaign_id, event_type, -1 if limit is None else limit),
+            ).fetchall()
+        return [json.loads(row["payload"]) for row in rows]
 
 
 class UserRepository:
     def create(self, email: str, password_hash: str, full_name: str | None = None) -> int:
-        with get_connection() as conn:
+        with _connection() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO users (email, password_hash, full_name)
@@ -219,7 +770,7 @@ class UserRepository:
             return int(cursor.lastrowid)
 
     def get_by_email(self, email: str) -> dict | None:
-        with get_connection() as conn:
+        with _connection() as conn:
             row = conn.execute(
                 "SELECT * FROM users WHERE lower(email) = lower(?)",
                 (email,),
@@ -227,12 +778,12 @@ class UserRepository:
         return dict(row) if row else None
 
     def get_by_id(self, user_id: int) -> dict | None:
-        with get_connection() as conn:
+        with _connection() as conn:
             row = conn.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
         return dict(row) if row else None
 
     def update_password_hash(self, user_id: int, password_hash: str) -> None:
-        with get_connection() as conn:
+        with _connection() as conn:
             conn.execute(
                 "UPDATE users SET password_hash = ? WHERE id = ?",
                 (password_hash, user_id),
@@ -241,7 +792,7 @@ class UserRepository:
 
 class TemplateLibraryRepository:
     def list_by_owner(self, owner_key: str) -> list[dict]:
-        with get_connection() as conn:
+        with _connection() as conn:
             rows = conn.execute(
                 """
                 SELECT *
@@ -254,7 +805,7 @@ class TemplateLibraryRepository:
         return [dict(row) for row in rows]
 
     def create(self, owner_key: str, title: str, category: str, content: str) -> int:
-        with get_connection() as conn:
+        with _connection() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO template_library (owner_key, title, category, content)
@@ -265,7 +816,7 @@ class TemplateLibraryRepository:
             return int(cursor.lastrowid)
 
     def get_by_id_for_owner(self, entry_id: int, owner_key: str) -> dict | None:
-        with get_connection() as conn:
+        with _connection() as conn:
             row = conn.execute(
                 "SELECT * FROM template_library WHERE id = ? AND owner_key = ?",
                 (entry_id, owner_key),
@@ -273,7 +824,7 @@ class TemplateLibraryRepository:
         return dict(row) if row else None
 
     def update_for_owner(self, entry_id: int, owner_key: str, title: str, category: str, content: str) -> bool:
-        with get_connection() as conn:
+        with _connection() as conn:
             result = conn.execute(
                 """
                 UPDATE template_library
@@ -285,7 +836,7 @@ class TemplateLibraryRepository:
             return result.rowcount > 0
 
     def delete_for_owner(self, entry_id: int, owner_key: str) -> bool:
-        with get_connection() as conn:
+        with _connection() as conn:
             result = conn.execute(
                 "DELETE FROM template_library WHERE id = ? AND owner_key = ?",
                 (entry_id, owner_key),
@@ -295,7 +846,7 @@ class TemplateLibraryRepository:
 
 class AgentSettingsRepository:
     def get_by_owner(self, owner_key: str) -> dict | None:
-        with get_connection() as conn:
+        with _connection() as conn:
             row = conn.execute(
                 "SELECT * FROM agent_settings WHERE owner_key = ?",
                 (owner_key,),
@@ -310,6 +861,14 @@ class AgentSettingsRepository:
             payload["llm_models"] = []
         return payload
 
+    def get_version(self, owner_key: str) -> int | None:
+        with _connection() as conn:
+            row = conn.execute(
+                "SELECT version FROM agent_settings WHERE owner_key = ?",
+                (owner_key,),
+            ).fetchone()
+        return int(row["version"]) if row else None
+
     def upsert_for_owner(
         self,
         owner_key: str,
@@ -327,7 +886,7 @@ class AgentSettingsRepository:
         existing = self.get_by_owner(owner_key)
         effective_key = llm_api_key if llm_api_key is not None else (existing or {}).get("llm_api_key")
 
-        with get_connection() as conn:
+        with _connection() as conn:
             if existing:
                 conn.execute(
                     """
@@ -342,6 +901,7 @@ class AgentSettingsRepository:
                         prompt_routing = ?,
                         prompt_supervisor = ?,
                         prompt_rewrite = ?,
+                        version = version + 1,
                         updated_at = CURRENT_TIMESTAMP
                     WHERE owner_key = ?
                     """,
@@ -400,7 +960,7 @@ class OutreachMemoryRepository:
         limit: int = 20,
         channel: str | None = None,
     ) -> list[dict]:
-        with get_connection() as conn:
+        with _connection() as conn:
             if channel and channel.strip():
                 rows = conn.execute(
                     """
@@ -433,7 +993,7 @@ class OutreachMemoryRepository:
         specialty: str | None,
         limit: int = 5,
     ) -> list[dict]:
-        with get_connection() as conn:
+        with _connection() as conn:
             rows = conn.execute(
                 """
                 SELECT *
@@ -467,7 +1027,7 @@ class OutreachMemoryRepository:
         quality_score: float,
         source_event: str,
     ) -> None:
-        with get_connection() as conn:
+        with _connection() as conn:
             conn.execute(
                 """
                 INSERT INTO outreach_memory (
@@ -496,7 +1056,7 @@ class OutreachMemoryRepository:
     def mark_used(self, memory_ids: list[int]) -> None:
         if not memory_ids:
             return
-        with get_connection() as conn:
+        with _connection() as conn:
             for memory_id in memory_ids:
                 conn.execute(
                     """
@@ -510,7 +1070,7 @@ class OutreachMemoryRepository:
                 )
 
     def clear_by_owner(self, owner_key: str, channel: str | None = None) -> int:
-        with get_connection() as conn:
+        with _connection() as conn:
             if channel and channel.strip():
                 result = conn.execute(
                     "DELETE FROM outreach_memory WHERE owner_key = ? AND channel = ?",
@@ -522,3 +1082,186 @@ class OutreachMemoryRepository:
                     (owner_key,),
                 )
             return int(result.rowcount or 0)
+
+
+class JobRepository:
+    def enqueue(self, kind: str, campaign_id: int | None, owner_key: str | None, params: dict, total: int) -> int:
+        with _connection() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO jobs (kind, campaign_id, owner_key, params, total)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (kind, campaign_id, owner_key, json.dumps(params, ensure_ascii=False), total),
+            )
+            return int(cursor.lastrowid)
+
+    def get(self, job_id: int) -> dict | None:
+        with _connection() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_for_campaign(self, campaign_id: int, limit: int = 20) -> list[dict]:
+        with _connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT *
+                FROM jobs
+                WHERE campaign_id = ?
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (campaign_id, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def claim_next(self) -> dict | None:
+        now_iso = utc_now_iso()
+        with _connection() as conn:
+            # A single UPDATE claims the job atomically, so concurrent workers never share one.
+            rows = conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'running',
+                    attempts = attempts + 1,
+                    processed = checkpoint_processed,
+                    started_at = ?,
+                    heartbeat_at = ?
+                WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY id ASC LIMIT 1)
+                  AND status = 'queued'
+                RETURNING *
+                """,
+                (now_iso, now_iso),
+            ).fetchall()
+        return dict(rows[0]) if rows else None
+
+    def update_progress(self, job_id: int, processed: int, total: int) -> None:
+        with _connection() as conn:
+            conn.execute(
+                """
+                UPDATE jobs
+                SET processed = ?, total = ?, heartbeat_at = ?
+                WHERE id = ?
+                """,
+                (processed, total, utc_now_iso(), job_id),
+            )
+
+    def checkpoint(self, job_id: int, lead_id: int, processed: int, created: int, ignored: int) -> None:
+        with _connection() as conn:
+            conn.execute(
+                """
+                UPDATE jobs
+                SET checkpoint_lead_id = ?, checkpoint_processed = ?, created = ?, ignored = ?,
+                    processed = max(processed, ?), heartbeat_at = ?
+                WHERE id = ?
+                """,
+                (lead_id, processed, created, ignored, processed, utc_now_iso(), job_id),
+            )
+
+    def is_cancel_requested(self, job_id: int) -> bool:
+        with _connection() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def request_cancel(self, job_id: int) -> bool:
+        # Only live jobs can be cancelled; a finished job (including an already cancelled one) reports False.
+        with _connection() as conn:
+            queued = conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'cancelled', cancel_requested = 1, finished_at = ?
+                WHERE id = ? AND status = 'queued'
+                """,
+                (utc_now_iso(), job_id),
+            ).rowcount
+            running = conn.execute(
+                """
+                UPDATE jobs
+                SET cancel_requested = 1
+                WHERE id = ? AND status = 'running'
+                """,
+                (job_id,),
+            ).rowcount
+            return queued + running > 0
+
+    def finish(self, job_id: int, status: str, error: str | None = None) -> None:
+        with _connection() as conn:
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = ?, error = ?, finished_at = ?, heartbeat_at = ?
+                WHERE id = ?
+                """,
+                (status, error[:1000] if error else None, utc_now_iso(), utc_now_iso(), job_id),
+            )
+
+    def release(self, job_id: int) -> None:
+        with _connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', heartbeat_at = NULL WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+
+    def count_active(self) -> dict[str, int]:
+        with _connection() as conn:
+            rows = conn.execute(
+                "SELECT status, count(*) AS jobs FROM jobs WHERE status IN ('queued', 'running') GROUP BY status"
+            ).fetchall()
+        counts = {"queued": 0, "running": 0}
+        counts.update({row["status"]: int(row["jobs"]) for row in rows})
+        return counts
+
+    def requeue_stale(self, heartbeat_before_iso: str) -> int:
+        with _connection() as conn:
+            result = conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'queued'
+                WHERE status = 'running'
+                  AND (heartbeat_at IS NULL OR heartbeat_at < ?)
+                """,
+                (heartbeat_before_iso,),
+            )
+            return int(result.rowcount or 0)
+
+
+class RevisionRepository:
+    def get(self, resource: str) -> dict | None:
+        with _connection() as conn:
+            row = conn.execute(
+                "SELECT resource, revision, updated_at FROM resource_revisions WHERE resource = ?",
+                (resource,),
+            ).fetchone()
+        return dict(row) if row else None
+
+
+_database_depths: tuple[float, dict[str, int], int] | None = None
+_database_depths_lock = threading.Lock()
+
+
+# The job and send depths are COUNT queries; scrapes within COLD_AI_METRICS_CACHE_SECONDS reuse them.
+def _cached_database_depths() -> tuple[dict[str, int], int]:
+    global _database_depths
+    with _database_depths_lock:
+        now = time.monotonic()
+        if _database_depths is None or now - _database_depths[0] >= settings.metrics_cache_seconds:
+            _database_depths = (now, JobRepository().count_active(), DraftRepository().count_due(utc_now_iso()))
+        return _database_depths[1], _database_depths[2]
+
+
+def _queue_depths() -> Iterable[GaugeFamily]:
+    sink = _event_sink
+    yield "cold_ai_event_sink_queue_depth", "Events waiting for the background writer.", [
+        ({}, sink.pending() if sink else 0)
+    ]
+    yield "cold_ai_event_sink_dropped", "Events dropped after a failed write.", [({}, sink.dropped if sink else 0)]
+    jobs, due = _cached_database_depths()
+    yield "cold_ai_jobs_queue_depth", "Background jobs by status.", [
+        ({"status": status}, count) for status, count in jobs.items()
+    ]
+    yield "cold_ai_send_queue_depth", "Approved drafts whose send time has passed.", [
+        ({}, due)
+    ]
+
+
+register_collector(_queue_depths)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 
 from ..config import settings
+from ..metrics import CACHE_REQUESTS_TOTAL
+from ..repositories import AgentSettingsRepository
 
 
 @dataclass(frozen=True)
@@ -104,3 +107,44 @@ def resolve_agent_llm_config(agent_settings: dict | None = None) -> AgentLLMConf
         prompt_supervisor=str(row.get("prompt_supervisor") or DEFAULT_PROMPT_SUPERVISOR),
         prompt_rewrite=str(row.get("prompt_rewrite") or DEFAULT_PROMPT_REWRITE),
     )
+
+
+# Resolved configs are kept per owner and revalidated against agent_settings.version, which
+# upsert_for_owner bumps, so a save in any process is picked up on the next lookup.
+class AgentConfigCache:
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[int | None, AgentLLMConfig]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, owner_key: str | None) -> AgentLLMConfig:
+        if not owner_key:
+            return resolve_agent_llm_config(None)
+        repository = AgentSettingsRepository()
+        cached = self._entries.get(owner_key)
+        if cached and cached[0] == repository.get_version(owner_key):
+            CACHE_REQUESTS_TOTAL.inc("agent_config", "hit")
+            return cached[1]
+        CACHE_REQUESTS_TOTAL.inc("agent_config", "miss")
+
+        row = repository.get_by_owner(owner_key)
+        config = resolve_agent_llm_config(row)
+        with self._lock:
+            self._entries[owner_key] = (row["version"] if row else None, config)
+        return config
+
+    def invalidate(self, owner_key: str | None = None) -> None:
+        with self._lock:
+            if owner_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(owner_key, None)
+
+
+agent_config_cache = AgentConfigCache()
+
+
+# Every agent settings write goes through here so this process's cache is invalidated with it;
+# the version check in AgentConfigCache.get still catches writes made by other processes.
+def save_agent_settings(owner_key: str, **fields: object) -> None:
+    AgentSettingsRepository().upsert_for_owner(owner_key=owner_key, **fields)
+    agent_config_cache.invalidate(owner_key)
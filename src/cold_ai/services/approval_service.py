@@ -1,32 +1,31 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 
 from dateutil import parser
 
 from ..config import settings
-from ..repositories import DraftRepository
+from ..repositories import DraftRepository, EventRepository, UnitOfWork
 from .csv_io import read_csv_rows, write_csv_rows
 
 
 def export_approvals(campaign_id: int) -> Path:
-    rows = DraftRepository().list_for_campaign(campaign_id)
-    output_rows = []
-    for row in rows:
-        output_rows.append(
-            {
-                "draft_id": row["id"],
-                "lead_email": row["email"],
-                "full_name": row.get("full_name") or "",
-                "specialty": row.get("specialty") or "",
-                "city": row.get("city") or "",
-                "subject": row["subject"],
-                "body": row["body"],
-                "approved": "",
-                "scheduled_at": row.get("scheduled_at") or "",
-            }
-        )
+    output_rows = (
+        {
+            "draft_id": row["id"],
+            "lead_email": row["email"],
+            "full_name": row.get("full_name") or "",
+            "specialty": row.get("specialty") or "",
+            "city": row.get("city") or "",
+            "subject": row["subject"],
+            "body": row["body"],
+            "approved": "",
+            "scheduled_at": row.get("scheduled_at") or "",
+        }
+        for row in DraftRepository().iter_for_campaign(campaign_id)
+    )
 
     settings.export_dir.mkdir(parents=True, exist_ok=True)
     output_path = settings.export_dir / f"campaign_{campaign_id}_approvals.csv"
@@ -57,21 +56,128 @@ def _parse_scheduled_at(value: str) -> str:
     return dt.astimezone(timezone.utc).isoformat()
 
 
-def import_approvals(csv_path: Path) -> tuple[int, int]:
-    rows = read_csv_rows(csv_path)
+def apply_approval(draft_id: int, scheduled_at: str) -> None:
+    DraftRepository().approve_and_schedule(draft_id, scheduled_at)
+    EventRepository().log("draft_approved", {"scheduled_at": scheduled_at}, draft_id=draft_id)
+
+
+def apply_rejection(draft_id: int) -> None:
+    DraftRepository().mark_rejected(draft_id)
+    EventRepository().log("draft_rejected", {}, draft_id=draft_id)
+
+
+BULK_ALLOWED_STATUSES = {
+    "approve": {"draft", "approved", "rejected", "failed"},
+    "reject": {"draft", "approved", "rejected", "failed"},
+    "schedule": {"approved"},
+}
+BULK_DEFAULT_STATUS = {"approve": "draft", "reject": "draft", "schedule": "approved"}
+BULK_OUTCOMES = {"approve": "approved", "reject": "rejected", "schedule": "rescheduled"}
+
+
+def _apply_bulk(
+    outcomes: list[dict],
+    action: str,
+    selection: dict,
+    scheduled_at: str | None,
+    schedule_by_draft: dict[int, str] | None,
+) -> None:
     repository = DraftRepository()
-    approved = 0
-    rejected = 0
+    selected = repository.select_for_bulk(**selection)
+    found = {int(row["id"]): row for row in selected}
+    allowed = BULK_ALLOWED_STATUSES[action]
+    eligible = [draft_id for draft_id, row in found.items() if row["status"] in allowed]
 
+    if action == "reject":
+        repository.reject_many(eligible)
+        EventRepository().log_many("draft_rejected", [(draft_id, {"bulk": True}) for draft_id in eligible])
+    else:
+        default_at = scheduled_at or datetime.now(timezone.utc).isoformat()
+        schedule = [((schedule_by_draft or {}).get(draft_id, default_at), draft_id) for draft_id in eligible]
+        if action == "approve":
+            repository.approve_many(schedule)
+        else:
+            repository.reschedule_many(schedule)
+        EventRepository().log_many(
+            "draft_approved" if action == "approve" else "draft_rescheduled",
+            [(draft_id, {"scheduled_at": at, "bulk": True}) for at, draft_id in schedule],
+        )
+
+    requested = selection.get("draft_ids")
+    eligible_ids = set(eligible)
+    for draft_id in requested if requested is not None else list(found):
+        row = found.get(draft_id)
+        if row is None:
+            outcome = "not_found"
+        elif draft_id in eligible_ids:
+            outcome = BULK_OUTCOMES[action]
+        else:
+            outcome = "skipped"
+        outcomes.append(
+            {"draft_id": draft_id, "outcome": outcome, "previous_status": row["status"] if row else None}
+        )
+
+
+def bulk_apply(
+    action: str,
+    draft_ids: list[int] | None = None,
+    campaign_id: int | None = None,
+    status: str | None = None,
+    min_score: float | None = None,
+    max_score: float | None = None,
+    query: str | None = None,
+    scheduled_at: str | None = None,
+) -> list[dict]:
+    if action not in BULK_ALLOWED_STATUSES:
+        raise ValueError(f"Unsupported bulk action: {action}")
+    if draft_ids is not None:
+        selection: dict = {"draft_ids": list(dict.fromkeys(draft_ids)), "campaign_id": campaign_id}
+    elif campaign_id is not None:
+        selection = {
+            "campaign_id": campaign_id,
+            "status": None if status == "all" else (status or BULK_DEFAULT_STATUS[action]),
+            "min_score": min_score,
+            "max_score": max_score,
+            "query": query,
+        }
+    else:
+        raise ValueError("Pass draft ids or a campaign filter")
+
+    outcomes: list[dict] = []
+    with UnitOfWork() as unit_of_work:
+        unit_of_work.add(partial(_apply_bulk, outcomes, action, selection, scheduled_at, None))
+    return outcomes
+
+
+def import_approvals(csv_path: Path) -> dict:
+    rows = read_csv_rows(csv_path)
+    # One decision per draft, the last row winning, as when rows were applied one by one.
+    decisions: dict[int, tuple[str, str | None]] = {}
     for row in rows:
         draft_id = int(row["draft_id"])
         decision = (row.get("approved") or "").strip().lower()
         if decision in {"yes", "y", "1", "true", "approved"}:
-            scheduled_at = _parse_scheduled_at((row.get("scheduled_at") or "").strip())
-            repository.approve_and_schedule(draft_id, scheduled_at)
-            approved += 1
+            decisions[draft_id] = ("approve", _parse_scheduled_at((row.get("scheduled_at") or "").strip()))
         elif decision in {"no", "n", "0", "false", "rejected"}:
-            repository.mark_rejected(draft_id)
-            rejected += 1
+            decisions[draft_id] = ("reject", None)
+
+    schedule_by_draft = {draft_id: at for draft_id, (action, at) in decisions.items() if action == "approve" and at}
+    rejected_ids = [draft_id for draft_id, (action, _at) in decisions.items() if action == "reject"]
+
+    outcomes: list[dict] = []
+    with UnitOfWork() as unit_of_work:
+        if schedule_by_draft:
+            selection = {"draft_ids": list(schedule_by_draft)}
+            unit_of_work.add(partial(_apply_bulk, outcomes, "approve", selection, None, schedule_by_draft))
+        if rejected_ids:
+            unit_of_work.add(partial(_apply_bulk, outcomes, "reject", {"draft_ids": rejected_ids}, None, None))
 
-    return approved, rejected
+    by_outcome: dict[str, list[int]] = {"approved": [], "rejected": [], "skipped": [], "not_found": []}
+    for outcome in outcomes:
+        by_outcome[outcome["outcome"]].append(outcome["draft_id"])
+    return {
+        "approved": len(by_outcome["approved"]),
+        "rejected": len(by_outcome["rejected"]),
+        "skipped": sorted(by_outcome["skipped"]),
+        "not_found": sorted(by_outcome["not_found"]),
+    }
@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import csv
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import unicodedata
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .. import __version__
+from .llm_cassette import get_active_cassette
+from .mock_llm import MockLLMConfig, MockLLMServer
+from .pipeline_timing import percentile
+
+BENCH_MODES = ("deterministic", "mock-llm")
+BENCH_SEND_MODES = ("capture", "console", "smtp-sink")
+BENCH_MOCK_OWNER = "bench-mock-llm"
+
+# Rough weights from Algerian private-practice directories: general practice and dentistry dominate.
+SPECIALTIES = (
+    ("Médecine générale", 30),
+    ("Chirurgie dentaire", 16),
+    ("Dentiste", 6),
+    ("Pédiatrie", 7),
+    ("Gynécologie obstétrique", 7),
+    ("Cardiologie", 5),
+    ("Ophtalmologie", 4),
+    ("Dermatologie", 4),
+    ("Kinésithérapie", 4),
+    ("ORL", 3),
+    ("Radiologie", 3),
+    ("Traumatologie orthopédie", 3),
+    ("Diabétologie endocrinologie", 2),
+    ("Nutrition", 2),
+    ("Pneumologie", 2),
+    ("Rhumatologie", 2),
+    ("Psychiatrie", 2),
+    ("Urologie", 2),
+    ("Néphrologie", 1),
+    ("Neurologie", 1),
+)
+
+# (wilaya, population weight, landline area code, communes)
+WILAYAS = (
+    ("Alger", 16, "23", ("Bab Ezzouar", "Hydra", "Kouba", "El Harrach", "Bir Mourad Raïs", "Chéraga", "Dély Ibrahim")),
+    ("Oran", 10, "41", ("Oran", "Es Sénia", "Bir El Djir", "Arzew")),
+    ("Constantine", 7, "31", ("Constantine", "El Khroub", "Ali Mendjeli", "Hamma Bouziane")),
+    ("Sétif", 7, "36", ("Sétif", "El Eulma", "Aïn Arnat")),
+    ("Tizi Ouzou", 5, "26", ("Tizi Ouzou", "Azazga", "Draâ Ben Khedda")),
+    ("Blida", 5, "25", ("Blida", "Boufarik", "Ouled Yaïch")),
+    ("Batna", 5, "33", ("Batna", "Barika", "Arris")),
+    ("Djelfa", 4, "27", ("Djelfa", "Aïn Oussera", "Messaad")),
+    ("Chlef", 4, "27", ("Chlef", "Ténès", "Boukadir")),
+    ("Annaba", 4, "38", ("Annaba", "El Bouni", "El Hadjar")),
+    ("Béjaïa", 4, "34", ("Béjaïa", "Akbou", "Amizour")),
+    ("Tlemcen", 4, "43", ("Tlemcen", "Maghnia", "Mansourah")),
+    ("Boumerdès", 3, "24", ("Boumerdès", "Bordj Menaïel", "Khemis El Khechna")),
+    ("M'Sila", 3, "35", ("M'Sila", "Bou Saâda")),
+    ("Sidi Bel Abbès", 3, "48", ("Sidi Bel Abbès", "Telagh")),
+    ("Biskra", 3, "33", ("Biskra", "Tolga", "Sidi Okba")),
+    ("Tiaret", 3, "46", ("Tiaret", "Frenda")),
+    ("Médéa", 3, "25", ("Médéa", "Berrouaghia")),
+    ("Mostaganem", 3, "45", ("Mostaganem", "Aïn Tédelès")),
+    ("Skikda", 3, "38", ("Skikda", "Azzaba")),
+    ("Jijel", 2, "34", ("Jijel", "Taher")),
+    ("Ouargla", 2, "29", ("Ouargla", "Hassi Messaoud", "Touggourt")),
+    ("Ghardaïa", 2, "29", ("Ghardaïa", "Metlili")),
+    ("Béchar", 1, "49", ("Béchar", "Kenadsa")),
+    ("Tamanrasset", 1, "29", ("Tamanrasset", "In Salah")),
+)
+
+# Mobile prefixes: 5 Ooredoo, 6 Mobilis, 7 Djezzy.
+MOBILE_PREFIXES = (("5", 30), ("6", 35), ("7", 35))
+FIRST_NAMES = (
+    "Mohamed", "Ahmed", "Yacine", "Karim", "Amine", "Sofiane", "Nassim", "Rachid", "Mourad", "Bilal",
+    "Walid", "Hichem", "Abdelkader", "Redouane", "Fatima", "Amina", "Meriem", "Nadia", "Samira", "Lynda",
+    "Sara", "Imane", "Khadidja", "Yasmine", "Nesrine", "Houda", "Souad", "Wafa", "Lamia", "Asma",
+)
+LAST_NAMES = (
+    "Benali", "Bensalem", "Boudiaf", "Belkacem", "Haddad", "Saidi", "Mansouri", "Bouzid", "Cherif", "Hamidi",
+    "Khelifi", "Meziane", "Amrani", "Djebbar", "Ait Ahmed", "Benamar", "Brahimi", "Zerrouki", "Ouali", "Rahmani",
+    "Kaci", "Touati", "Ferhat", "Larbi", "Bouchama", "Guerfi", "Hamdi", "Mebarki", "Slimani", "Yahiaoui",
+)
+EMAIL_DOMAINS = (("gmail.com", 50), ("yahoo.fr", 20), ("hotmail.com", 15), ("outlook.fr", 5), ("cabinet-dz.com", 10))
+
+SYNTHETIC_LEAD_FIELDS = ["nom", "specialite", "telephone", "email", "commune", "wilaya", "adresse"]
+
+DEFAULT_SUBJECT_TEMPLATE = "{{ first_name }}, quick idea for {{ specialty }} workflows in {{ city }}"
+DEFAULT_BODY_TEMPLATE = (
+    "Hello Dr. {{ full_name }},\n\n"
+    "I noticed your work around {{ personalization_hook }} and thought this might be useful.\n\n"
+    "We built {{ product_name }} to help teams run focused outreach and follow-ups without sounding robotic.\n\n"
+    "If useful, here is a short resource on digital health trends:\n{{ resource_link }}\n\n"
+    "If you're open to it, I can share a 2-minute walkthrough tailored to {{ specialty }} practices.\n\n"
+    "Best regards,\n{{ sender_name }}"
+)
+
+
+def _ascii_slug(value: str) -> str:
+    text = unicodedata.normalize("NFKD", value)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return "".join(char for char in text.lower() if char.isalnum())
+
+
+def _phone(rng: random.Random, area_code: str) -> str:
+    if rng.random() < 0.75:
+        prefix = rng.choices([p for p, _ in MOBILE_PREFIXES], [w for _, w in MOBILE_PREFIXES])[0]
+        digits = f"{prefix}{rng.randrange(10**8):08d}"
+        style = rng.random()
+        if style < 0.4:
+            return f"0{digits[:3]} {digits[3:5]} {digits[5:7]} {digits[7:]}"
+        if style < 0.7:
+            return f"0{digits}"
+        if style < 0.9:
+            return f"+213 {digits[:3]} {digits[3:5]} {digits[5:7]} {digits[7:]}"
+        return f"00213{digits}"
+    digits = f"{area_code}{rng.randrange(10**6):06d}"
+    return f"0{digits[:2]} {digits[2:4]} {digits[4:6]} {digits[6:]}"
+
+
+def generate_synthetic_leads(path: Path, rows: int, seed: int = 42) -> int:
+    rng = random.Random(seed)
+    specialties = [name for name, _ in SPECIALTIES]
+    specialty_weights = [weight for _, weight in SPECIALTIES]
+    wilaya_weights = [entry[1] for entry in WILAYAS]
+    domains = [name for name, _ in EMAIL_DOMAINS]
+    domain_weights = [weight for _, weight in EMAIL_DOMAINS]
+    emails: list[str] = []
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="", buffering=1024 * 1024) as handle:
+        writer = csv.writer(handle)
+        writer.writerow(SYNTHETIC_LEAD_FIELDS)
+        for index in range(rows):
+            first = rng.choice(FIRST_NAMES)
+            last = rng.choice(LAST_NAMES)
+            wilaya, _, area_code, communes = rng.choices(WILAYAS, wilaya_weights)[0]
+            name = f"Dr {first} {last}" if rng.random() < 0.7 else f"{last.upper()} {first}"
+
+            roll = rng.random()
+            if roll < 0.01 and emails:
+                email = rng.choice(emails)  # duplicate row, skipped on import
+            elif roll < 0.62:
+                email = f"{_ascii_slug(first)}.{_ascii_slug(last)}{index}@{rng.choices(domains, domain_weights)[0]}"
+                if len(emails) < 1000:
+                    emails.append(email)
+            else:
+                email = ""
+            phone = _phone(rng, area_code) if (not email or rng.random() < 0.85) else ""
+            if rng.random() < 0.02:
+                email, phone = "", ""  # unreachable row, skipped on import
+
+            writer.writerow(
+                [
+                    name,
+                    rng.choices(specialties, specialty_weights)[0],
+                    phone,
+                    email,
+                    rng.choice(communes),
+                    wilaya,
+                    f"Cité {rng.randint(1, 400)} logements, {rng.choice(communes)}",
+                ]
+            )
+    return rows
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _latency_summary(latencies: list[float]) -> dict | None:
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+    return {
+        "p50": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99": round(percentile(ordered, 0.99) * 1000, 3),
+        "max": round(ordered[-1] * 1000, 3),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+    }
+
+
+class _ItemClock:
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self._last = time.perf_counter()
+
+    def tick(self, *_args: object) -> None:
+        now = time.perf_counter()
+        self.latencies.append(now - self._last)
+        self._last = now
+
+    def reset(self) -> None:
+        self._last = time.perf_counter()
+
+
+def _run_phase(phases: dict, name: str, func: Callable[[_ItemClock], dict]) -> dict:
+    gc.collect()
+    clock = _ItemClock()
+    started = time.perf_counter()
+    result = func(clock)
+    seconds = time.perf_counter() - started
+    items = int(result.pop("items"))
+    phase = {
+        "items": items,
+        "seconds": round(seconds, 4),
+        "rows_per_second": round(items / seconds, 1) if seconds > 0 else None,
+        "latency_ms": _latency_summary(clock.latencies),
+        "peak_rss_mb": _peak_rss_mb(),
+        **result,
+    }
+    phases[name] = phase
+    return phase
+
+
+@contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _write_templates(workdir: Path, templates_dir: Path | None) -> tuple[Path, Path]:
+    target = workdir / "templates"
+    if templates_dir and templates_dir.is_dir():
+        shutil.copytree(templates_dir, target, dirs_exist_ok=True)
+    target.mkdir(parents=True, exist_ok=True)
+    subject_path = target / "subject_default.txt"
+    body_path = target / "body_default.txt"
+    if not subject_path.exists():
+        subject_path.write_text(DEFAULT_SUBJECT_TEMPLATE, encoding="utf-8")
+    if not body_path.exists():
+        body_path.write_text(DEFAULT_BODY_TEMPLATE, encoding="utf-8")
+    return subject_path, body_path
+
+
+def run_benchmark(
+    rows: int = 10_000,
+    draft_limit: int = 1_000,
+    modes: tuple[str, ...] = BENCH_MODES,
+    seed: int = 42,
+    llm_latency_ms: float = 0.0,
+    workdir: Path | None = None,
+    templates_dir: Path | None = Path("templates"),
+    keep_workdir: bool = False,
+    output_path: Path | None = None,
+    send_via: str = "capture",
+    smtp_latency_ms: float = 0.0,
+) -> dict:
+    unknown = [mode for mode in modes if mode not in BENCH_MODES]
+    if unknown:
+        raise ValueError(f"Unknown bench mode(s): {', '.join(unknown)}")
+    if send_via not in BENCH_SEND_MODES:
+        raise ValueError(f"send_via must be one of: {', '.join(BENCH_SEND_MODES)}")
+
+    templates_dir = templates_dir.resolve() if templates_dir else None
+    output_path = output_path.resolve() if output_path else None
+    owns_workdir = workdir is None
+    workdir = Path(tempfile.mkdtemp(prefix="cold-ai-bench-")) if workdir is None else workdir.resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    report: dict = {
+        "benchmark": "cold-ai-pipeline",
+        "version": __version__,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlite": sqlite3.sqlite_version,
+            "cpu_count": os.cpu_count(),
+        },
+        "params": {
+            "rows": rows,
+            "draft_limit": draft_limit,
+            "modes": list(modes),
+            "seed": seed,
+            "llm_latency_ms": llm_latency_ms,
+            "send_via": send_via,
+            "smtp_latency_ms": smtp_latency_ms,
+        },
+        "phases": {},
+    }
+    phases = report["phases"]
+
+    try:
+        with _working_directory(workdir):
+            from ..db import init_db
+            from .ai_agent_runtime import save_agent_settings
+            from .approval_service import export_approvals, import_approvals
+            from .campaign_service import create_campaign
+            from .csv_io import read_csv_rows, write_csv_rows
+            from .draft_service import generate_drafts
+            from .email_provider import CaptureEmailProvider, SMTPEmailProvider
+            from .import_service import import_leads
+            from .send_service import send_due
+            from .smtp_sink import SMTPSinkConfig, SMTPSinkServer
+            from .whatsapp_provider import CaptureWhatsAppProvider
+
+            init_db()
+            leads_path = workdir / "leads.csv"
+            subject_path, body_path = _write_templates(workdir, templates_dir)
+
+            def generate(clock: _ItemClock) -> dict:
+                generate_synthetic_leads(leads_path, rows, seed=seed)
+                return {"items": rows, "bytes": leads_path.stat().st_size}
+
+            def import_phase(clock: _ItemClock) -> dict:
+                inserted, skipped = import_leads(leads_path)
+                return {
+                    "items": rows,
+                    "inserted": inserted,
+                    "skipped": skipped,
+                    "unreachable": rows - inserted - skipped,
+                }
+
+            _run_phase(phases, "generate_csv", generate)
+            _run_phase(phases, "import_leads", import_phase)
+
+            campaign_ids: list[int] = []
+            for mode in modes:
+                campaign_id = create_campaign(
+                    f"Bench {mode}", subject_path, body_path, purpose="lead generation", channel="email"
+                )
+                campaign_ids.append(campaign_id)
+                owner_key = None
+                mock_server = None
+                if mode == "mock-llm":
+                    owner_key = BENCH_MOCK_OWNER
+                    mock_server = MockLLMServer(MockLLMConfig(latency_ms=llm_latency_ms, seed=seed)).start()
+                    save_agent_settings(
+                        owner_key,
+                        llm_provider="openai",
+                        llm_base_url=f"{mock_server.url}/v1",
+                        llm_api_key="bench",
+                        llm_models=["mock-model"],
+                        enable_web_research=False,
+                        enable_llm_rewrite=True,
+                        prompt_search="",
+                        prompt_routing="",
+                        prompt_supervisor="",
+                        prompt_rewrite="",
+                    )
+
+                def drafts_phase(
+                    clock: _ItemClock, campaign_id=campaign_id, owner_key=owner_key, mock_server=mock_server
+                ) -> dict:
+                    def on_progress(processed: int, total: int) -> None:
+                        if processed:
+                            clock.tick()
+                        else:
+                            clock.reset()
+
+                    created, ignored = generate_drafts(
+                        campaign_id, draft_limit, owner_key=owner_key, on_progress=on_progress
+                    )
+                    result = {"items": created + ignored, "created": created, "ignored": ignored}
+                    if mock_server:
+                        result["llm_calls"] = mock_server.snapshot()
+                    return result
+
+                try:
+                    _run_phase(phases, f"drafts_{mode.replace('-', '_')}", drafts_phase)
+                finally:
+                    if mock_server:
+                        mock_server.stop()
+
+            approval_files: list[Path] = []
+
+            def export_phase(clock: _ItemClock) -> dict:
+                exported = 0
+                for campaign_id in campaign_ids:
+                    path = export_approvals(campaign_id)
+                    rows_out = read_csv_rows(path)
+                    for row in rows_out:
+                        row["approved"] = "yes"
+                    exported += len(rows_out)
+                    approved_path = path.with_name(f"{path.stem}_approved.csv")
+                    write_csv_rows(approved_path, rows_out, fieldnames=list(rows_out[0]) if rows_out else ["draft_id"])
+                    approval_files.append(approved_path)
+                return {"items": exported}
+
+            def approvals_phase(clock: _ItemClock) -> dict:
+                approved = rejected = 0
+                for path in approval_files:
+                    result = import_approvals(path)
+                    approved += result["approved"]
+                    rejected += result["rejected"]
+                return {"items": approved + rejected, "approved": approved, "rejected": rejected}
+
+            def send_phase(clock: _ItemClock) -> dict:
+                if send_via == "console":
+                    # Console providers print every message; keep that cost but not the output.
+                    with open(os.devnull, "w", encoding="utf-8") as sink, redirect_stdout(sink):
+                        sent, failed = send_due(dry_run=True, on_progress=clock.tick)
+                    return {"items": sent + failed, "sent": sent, "failed": failed}
+                if send_via == "capture":
+                    capture_path = workdir / "outbox" / "capture.jsonl"
+                    sent, failed = send_due(
+                        dry_run=True,
+                        on_progress=clock.tick,
+                        email_provider=CaptureEmailProvider(capture_path),
+                        whatsapp_provider=CaptureWhatsAppProvider(capture_path),
+                    )
+                    return {"items": sent + failed, "sent": sent, "failed": failed}
+                # A real SMTP conversation per message (connect, EHLO, AUTH, MAIL, RCPT, DATA, QUIT).
+                config = SMTPSinkConfig(latency_ms=smtp_latency_ms, seed=seed)
+                with SMTPSinkServer(config) as smtp_sink:
+                    provider = SMTPEmailProvider(
+                        host=smtp_sink.host,
+                        port=smtp_sink.port,
+                        user="bench",
+                        password="bench",
+                        sender="bench@cold-ai.local",
+                        starttls=False,
+                    )
+                    sent, failed = send_due(on_progress=clock.tick, email_provider=provider)
+                    return {"items": sent + failed, "sent": sent, "failed": failed, "smtp": smtp_sink.snapshot()}
+
+            _run_phase(phases, "approvals_export", export_phase)
+            _run_phase(phases, "approvals_import", approvals_phase)
+            _run_phase(phases, "send_smtp_sink" if send_via == "smtp-sink" else "send_dry_run", send_phase)
+    finally:
+        if owns_workdir and not keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    cassette = get_active_cassette()
+    if cassette:
+        report["cassette"] = {"path": str(cassette.path), "mode": cassette.mode, **cassette.stats}
+    report["workdir"] = str(workdir) if (keep_workdir or not owns_workdir) else None
+    report["peak_rss_mb"] = _peak_rss_mb()
+    report["finished_at"] = datetime.now(timezone.utc).isoformat()
+
+    if output_path:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    return report
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import csv
+from collections.abc import Iterable
 from pathlib import Path
 
 
@@ -10,7 +11,7 @@ def read_csv_rows(csv_path: Path) -> list[dict]:
         return [dict(row) for row in reader]
 
 
-def write_csv_rows(csv_path: Path, rows: list[dict], fieldnames: list[str]) -> None:
+def write_csv_rows(csv_path: Path, rows: Iterable[dict], fieldnames: list[str]) -> None:
     csv_path.parent.mkdir(parents=True, exist_ok=True)
     with csv_path.open("w", encoding="utf-8", newline="") as file:
         writer = csv.DictWriter(file, fieldnames=fieldnames)
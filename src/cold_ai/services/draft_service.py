@@ -1,139 +1,241 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from contextlib import nullcontext
+from functools import partial
+
 from ..agents.orchestrator_agent import OrchestratorAgent
+from ..profiling import mark_phase
 from ..repositories import (
-    AgentSettingsRepository,
     CampaignRepository,
     DraftRepository,
     EventRepository,
     LeadRepository,
     OutreachMemoryRepository,
+    UnitOfWork,
 )
+from ..tracing import LeadTrace, start_lead_trace
+from .ai_agent_runtime import agent_config_cache
 from .template_router import SpecialtyTemplateRouter
 from .outreach_knowledge_base import build_outreach_knowledge_context
 from .outreach_memory import build_memory_seed, format_memory_for_prompt
+from .pipeline_timing import PipelineTimer, pipeline_stage
+
+
+def _record_memory_feedback(
+    memory_repository: OutreachMemoryRepository,
+    context: dict,
+    subject: str,
+    body: str,
+    memories: list[dict],
+    supervision: dict,
+) -> None:
+    memory_ids = [int(item["id"]) for item in memories if item.get("id") is not None]
+    memory_repository.mark_used(memory_ids)
+
+    if float(supervision.get("score") or 0.0) >= 0.78:
+        candidate = build_memory_seed(
+            context=context,
+            subject=subject,
+            body=body,
+            score=float(supervision.get("score") or 0.0),
+            source_event="draft_supervised",
+        )
+        memory_repository.add_memory(
+            owner_key=candidate.owner_key,
+            channel=candidate.channel,
+            purpose=candidate.purpose,
+            specialty=candidate.specialty,
+            pattern_text=candidate.pattern_text,
+            quality_score=candidate.quality_score,
+            source_event=candidate.source_event,
+        )
 
 
-def generate_drafts(campaign_id: int, limit: int, owner_key: str | None = None) -> tuple[int, int]:
+def _persist_draft(
+    counts: dict[str, int],
+    campaign_id: int,
+    lead_id: int,
+    subject: str,
+    body: str,
+    context: dict,
+    template_source: str,
+    rewrite_status: str,
+    reflection: dict,
+    supervision: dict,
+    timer: PipelineTimer,
+    trace: LeadTrace | None = None,
+) -> None:
+    score = supervision.get("score")
+    with trace or nullcontext(), timer, pipeline_stage("persist"):
+        draft_id = DraftRepository().create_or_ignore(
+            campaign_id,
+            lead_id,
+            subject,
+            body,
+            supervisor_score=float(score) if score is not None else None,
+        )
+        if draft_id is None:
+            counts["ignored"] += 1
+            return
+        if trace:
+            trace.args["draft_id"] = draft_id
+
+    EventRepository().log(
+        "draft_created",
+        {
+            "campaign_id": campaign_id,
+            "template_source": template_source,
+            "rewrite_status": rewrite_status,
+            "reflection_mode": reflection.get("mode"),
+            "reflection_confidence": reflection.get("confidence"),
+            "supervisor_status": supervision.get("status"),
+            "supervisor_score": supervision.get("score"),
+            "has_research_snippet": bool(context["research_snippet"]),
+            **timer.as_payload(),
+        },
+        draft_id=draft_id,
+    )
+
+    counts["created"] += 1
+
+
+def update_draft_content(draft_id: int, subject: str, body: str) -> None:
+    DraftRepository().update_content(draft_id=draft_id, subject=subject, body=body)
+    EventRepository().log("draft_updated", {}, draft_id=draft_id)
+
+
+def generate_drafts(
+    campaign_id: int,
+    limit: int,
+    owner_key: str | None = None,
+    after_lead_id: int | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    on_checkpoint: Callable[[int, int, dict[str, int]], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+) -> tuple[int, int]:
     campaign = CampaignRepository().get(campaign_id)
     if not campaign:
         raise ValueError(f"Campaign {campaign_id} not found")
 
     channel = campaign.get("channel") or "email"
-    leads = LeadRepository().list_for_drafting(limit, channel=channel)
-    draft_repository = DraftRepository()
-    event_repository = EventRepository()
+    leads = LeadRepository().list_for_drafting(limit, channel=channel, after_lead_id=after_lead_id)
     memory_repository = OutreachMemoryRepository()
-    agent_settings = AgentSettingsRepository().get_by_owner(owner_key) if owner_key else None
-    orchestrator = OrchestratorAgent(agent_settings=agent_settings)
+    draft_repository = DraftRepository()
+    orchestrator = OrchestratorAgent(runtime=agent_config_cache.get(owner_key))
     template_router = SpecialtyTemplateRouter()
 
-    created = 0
-    ignored = 0
-
-    for lead in leads:
-        enriched = orchestrator.prepare_lead(lead)
-        research = orchestrator.research(enriched)
-
-        selected_subject_template, selected_body_template, template_source = template_router.select(
-            enriched.get("specialty") or "",
-            campaign["subject_template"],
-            campaign["body_template"],
-        )
-
-        context = {
-            "first_name": enriched.get("first_name") or "Doctor",
-            "full_name": enriched.get("full_name") or "Doctor",
-            "email": enriched.get("email"),
-            "phone": enriched.get("phone"),
-            "specialty": enriched.get("specialty") or "your specialty",
-            "city": enriched.get("city") or "your city",
-            "address": enriched.get("address") or "",
-            "channel": campaign.get("channel") or "email",
-            "purpose": campaign.get("purpose") or "",
-            "personalization_hook": enriched.get("personalization_hook"),
-            "resource_link": research.get("resource_link"),
-            "research_snippet": research.get("research_snippet") or "",
-            "research_source_link": research.get("research_source_link") or "",
-            "sender_name": "Faycal",
-            "product_name": "Cold AI",
-            "owner_key": owner_key or "global",
-        }
-
-        memories = memory_repository.list_for_context(
-            owner_key=str(owner_key or "global"),
-            channel=context["channel"],
-            purpose=context["purpose"] or None,
-            specialty=context["specialty"] or None,
-            limit=5,
-        )
-        context["memory_patterns"] = format_memory_for_prompt(memories)
-
-        kb_context = build_outreach_knowledge_context(
-            channel=context["channel"],
-            purpose=context["purpose"],
-            specialty=context["specialty"],
-        )
-        context.update(
-            {
-                "knowledge_principles": kb_context.get("principles") or [],
-                "knowledge_followup_plan": kb_context.get("followup_plan") or [],
-                "knowledge_purpose_angles": kb_context.get("purpose_angles") or [],
-                "knowledge_specialty_hook": kb_context.get("specialty_hook") or "",
-                "knowledge_objection_handling": kb_context.get("objection_handling") or [],
-                "knowledge_cta_examples": kb_context.get("cta_examples") or [],
-            }
-        )
-
-        subject, body = orchestrator.create_draft(
-            selected_subject_template,
-            selected_body_template,
-            context,
-        )
-
-        subject, body, rewrite_status = orchestrator.rewrite(subject, body, context)
-        subject, body, reflection = orchestrator.reflect(subject, body, context)
-        supervision = orchestrator.supervise(subject, body, context)
-
-        inserted = draft_repository.create_or_ignore(campaign_id, enriched["id"], subject, body)
-        if inserted:
-            created += 1
-            event_repository.log(
-                "draft_created",
-                {
-                    "campaign_id": campaign_id,
-                    "template_source": template_source,
-                    "rewrite_status": rewrite_status,
-                    "reflection_mode": reflection.get("mode"),
-                    "reflection_confidence": reflection.get("confidence"),
-                    "supervisor_status": supervision.get("status"),
-                    "supervisor_score": supervision.get("score"),
-                    "has_research_snippet": bool(context["research_snippet"]),
-                },
-                draft_id=None,
-            )
-
-            memory_ids = [int(item["id"]) for item in memories if item.get("id") is not None]
-            memory_repository.mark_used(memory_ids)
+    counts = {"created": 0, "ignored": 0}
+    mark_phase("leads_loaded")
+
+    if on_progress:
+        on_progress(0, len(leads))
+
+    with UnitOfWork() as unit_of_work:
+        for processed, lead in enumerate(leads, start=1):
+            if should_cancel and should_cancel():
+                break
+
+            timer = PipelineTimer()
+            trace = start_lead_trace(f"lead {lead['id']}", lead_id=lead["id"], campaign_id=campaign_id)
+            with trace or nullcontext(), timer:
+                enriched = orchestrator.prepare_lead(lead)
+                research = orchestrator.research(enriched)
+
+                with pipeline_stage("template"):
+                    selected_subject_template, selected_body_template, template_source = template_router.select(
+                        enriched.get("specialty") or "",
+                        campaign["subject_template"],
+                        campaign["body_template"],
+                    )
+
+                context = {
+                    "first_name": enriched.get("first_name") or "Doctor",
+                    "full_name": enriched.get("full_name") or "Doctor",
+                    "email": enriched.get("email"),
+                    "phone": enriched.get("phone"),
+                    "specialty": enriched.get("specialty") or "your specialty",
+                    "city": enriched.get("city") or "your city",
+                    "address": enriched.get("address") or "",
+                    "channel": campaign.get("channel") or "email",
+                    "purpose": campaign.get("purpose") or "",
+                    "personalization_hook": enriched.get("personalization_hook"),
+                    "resource_link": research.get("resource_link"),
+                    "research_snippet": research.get("research_snippet") or "",
+                    "research_source_link": research.get("research_source_link") or "",
+                    "sender_name": "Faycal",
+                    "product_name": "Cold AI",
+                    "owner_key": owner_key or "global",
+                }
+
+                with pipeline_stage("memory"):
+                    memories = memory_repository.list_for_context(
+                        owner_key=str(owner_key or "global"),
+                        channel=context["channel"],
+                        purpose=context["purpose"] or None,
+                        specialty=context["specialty"] or None,
+                        limit=5,
+                    )
+                    context["memory_patterns"] = format_memory_for_prompt(memories)
+
+                with pipeline_stage("knowledge"):
+                    kb_context = build_outreach_knowledge_context(
+                        channel=context["channel"],
+                        purpose=context["purpose"],
+                        specialty=context["specialty"],
+                    )
+                    context.update(
+                        {
+                            "knowledge_principles": kb_context.get("principles") or [],
+                            "knowledge_followup_plan": kb_context.get("followup_plan") or [],
+                            "knowledge_purpose_angles": kb_context.get("purpose_angles") or [],
+                            "knowledge_specialty_hook": kb_context.get("specialty_hook") or "",
+                            "knowledge_objection_handling": kb_context.get("objection_handling") or [],
+                            "knowledge_cta_examples": kb_context.get("cta_examples") or [],
+                        }
+                    )
+
+                subject, body = orchestrator.create_draft(
+                    selected_subject_template,
+                    selected_body_template,
+                    context,
+                )
 
-            if float(supervision.get("score") or 0.0) >= 0.78:
-                candidate = build_memory_seed(
-                    context=context,
+                subject, body, rewrite_status = orchestrator.rewrite(subject, body, context)
+                subject, body, reflection = orchestrator.reflect(subject, body, context)
+                supervision = orchestrator.supervise(subject, body, context)
+
+                # Memory feedback is written right away, not with the draft batch, so the next
+                # leads retrieve the updated usage counts and any new seed. Leads that already
+                # have a draft in this campaign are skipped, as the insert below will ignore them.
+                if not draft_repository.exists_for_lead(campaign_id, enriched["id"]):
+                    with pipeline_stage("memory"):
+                        _record_memory_feedback(memory_repository, context, subject, body, memories, supervision)
+
+            unit_of_work.add(
+                partial(
+                    _persist_draft,
+                    counts=counts,
+                    campaign_id=campaign_id,
+                    lead_id=enriched["id"],
                     subject=subject,
                     body=body,
-                    score=float(supervision.get("score") or 0.0),
-                    source_event="draft_supervised",
-                )
-                memory_repository.add_memory(
-                    owner_key=candidate.owner_key,
-                    channel=candidate.channel,
-                    purpose=candidate.purpose,
-                    specialty=candidate.specialty,
-                    pattern_text=candidate.pattern_text,
-                    quality_score=candidate.quality_score,
-                    source_event=candidate.source_event,
-                )
-        else:
-            ignored += 1
-
-    return created, ignored
+                    context=context,
+                    template_source=template_source,
+                    rewrite_status=rewrite_status,
+                    reflection=reflection,
+                    supervision=supervision,
+                    timer=timer,
+                    trace=trace,
+                ),
+                # The trace is written to its file after the batch commits, not inside the transaction.
+                after_commit=trace.finish if trace else None,
+            )
+            if on_checkpoint:
+                # Queued behind the draft so the checkpoint commits in the same transaction.
+                unit_of_work.add(partial(on_checkpoint, enriched["id"], processed, counts))
+            if on_progress:
+                on_progress(processed, len(leads))
+
+    mark_phase("drafts_written")
+    return counts["created"], counts["ignored"]
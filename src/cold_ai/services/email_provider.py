@@ -2,14 +2,19 @@ from __future__ import annotations
 
 import smtplib
 from email.message import EmailMessage
+from pathlib import Path
 
 from ..config import settings
+from .delivery_capture import CAPTURE_SENDER, get_delivery_capture
 
 
 class EmailProvider:
     def send(self, to_email: str, subject: str, body: str) -> None:
         raise NotImplementedError
 
+    def flush(self) -> None:
+        pass
+
 
 class ConsoleEmailProvider(EmailProvider):
     def send(self, to_email: str, subject: str, body: str) -> None:
@@ -20,19 +25,51 @@ class ConsoleEmailProvider(EmailProvider):
         print("=" * 80)
 
 
+class CaptureEmailProvider(EmailProvider):
+    def __init__(self, path: Path) -> None:
+        self.capture = get_delivery_capture(path)
+
+    def send(self, to_email: str, subject: str, body: str) -> None:
+        self.capture.capture_email(settings.smtp_from or CAPTURE_SENDER, to_email, subject, body)
+
+    def flush(self) -> None:
+        self.capture.flush()
+
+
 class SMTPEmailProvider(EmailProvider):
+    def __init__(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        sender: str | None = None,
+        starttls: bool | None = None,
+    ) -> None:
+        self.host = host or settings.smtp_host
+        self.port = port or settings.smtp_port
+        self.user = user or settings.smtp_user
+        self.password = password or settings.smtp_password
+        self.sender = sender or settings.smtp_from
+        self.starttls = settings.smtp_starttls if starttls is None else starttls
+
     def send(self, to_email: str, subject: str, body: str) -> None:
-        if not all([settings.smtp_host, settings.smtp_user, settings.smtp_password, settings.smtp_from]):
+        if not all([self.host, self.user, self.password, self.sender]):
             raise ValueError("SMTP settings are incomplete. Set COLD_AI_SMTP_* environment variables.")
 
         msg = EmailMessage()
         msg["Subject"] = subject
-        msg["From"] = settings.smtp_from
+        msg["From"] = self.sender
         msg["To"] = to_email
         msg.set_content(body)
 
-        with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-            if settings.smtp_starttls:
+        with smtplib.SMTP(self.host, self.port) as server:
+            if self.starttls:
                 server.starttls()
-            server.login(settings.smtp_user, settings.smtp_password)
+            server.login(self.user, self.password)
             server.send_message(msg)
+
+
+def dry_run_email_provider(capture_path: Path | None = None) -> EmailProvider:
+    path = capture_path or settings.dry_run_capture_path
+    return CaptureEmailProvider(Path(path)) if path else ConsoleEmailProvider()
@@ -8,6 +8,7 @@ from ..agents.reflection_agent import ReflectionAgent
 from ..agents.rewrite_agent import RewriteAgent
 from ..agents.routing_agent import RoutingAgent
 from ..agents.supervisor_agent import SupervisorAgent
+from .ai_agent_runtime import resolve_agent_llm_config
 from .agent_contracts import (
     validate_reflection,
     validate_rewrite,
@@ -106,10 +107,11 @@ def run_agent_evaluation(output_path: Path | None = None) -> dict:
         "llm_models": ["gpt-4o-mini"],
     }
 
-    routing_agent = RoutingAgent(agent_settings=agent_settings)
-    rewrite_agent = RewriteAgent(agent_settings=agent_settings)
-    reflection_agent = ReflectionAgent(agent_settings=agent_settings)
-    supervisor_agent = SupervisorAgent(agent_settings=agent_settings)
+    runtime = resolve_agent_llm_config(agent_settings)
+    routing_agent = RoutingAgent(runtime=runtime)
+    rewrite_agent = RewriteAgent(runtime=runtime)
+    reflection_agent = ReflectionAgent(runtime=runtime)
+    supervisor_agent = SupervisorAgent(runtime=runtime)
 
     routing_ok = 0
     rewrite_status_counts: dict[str, int] = {}
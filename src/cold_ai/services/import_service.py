@@ -4,7 +4,8 @@ import re
 import unicodedata
 from typing import Any
 
-from ..agents.orchestrator_agent import OrchestratorAgent
+from ..agents.lead_intelligence_agent import LeadIntelligenceAgent
+from ..profiling import mark_phase
 from ..repositories import LeadRepository
 from .csv_io import read_csv_rows
 
@@ -69,7 +70,8 @@ def _first_present(row: dict[str, Any], keys: list[str]) -> str:
 
 def import_leads(csv_path) -> tuple[int, int]:
     rows = read_csv_rows(csv_path)
-    orchestrator = OrchestratorAgent()
+    mark_phase("csv_read")
+    lead_agent = LeadIntelligenceAgent()
     normalized: list[dict] = []
 
     for row in rows:
@@ -94,7 +96,8 @@ def import_leads(csv_path) -> tuple[int, int]:
             "city": city,
             "address": _first_present(row, ALIASES["address"]),
         }
-        normalized.append(orchestrator.prepare_lead(lead))
+        normalized.append(lead_agent.enrich(lead))
 
+    mark_phase("leads_normalized")
     repository = LeadRepository()
     return repository.upsert_many(normalized)
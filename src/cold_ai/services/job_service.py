@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from ..config import settings
+from ..repositories import CampaignRepository, JobRepository
+from .draft_service import generate_drafts
+
+JOB_GENERATE_DRAFTS = "generate_drafts"
+
+logger = logging.getLogger(__name__)
+
+
+def submit_generate_drafts(campaign_id: int, limit: int, owner_key: str | None = None) -> int:
+    if not CampaignRepository().get(campaign_id):
+        raise ValueError(f"Campaign {campaign_id} not found")
+    limit = max(1, limit)
+    return JobRepository().enqueue(
+        JOB_GENERATE_DRAFTS,
+        campaign_id=campaign_id,
+        owner_key=owner_key,
+        params={"limit": limit},
+        total=limit,
+    )
+
+
+def run_job(job: dict, stop_event: threading.Event | None = None) -> str:
+    repository = JobRepository()
+    job_id = int(job["id"])
+    base_processed = int(job["checkpoint_processed"] or 0)
+    base_created = int(job["created"] or 0)
+    base_ignored = int(job["ignored"] or 0)
+
+    last_progress_at = 0.0
+
+    # Checkpoints already carry progress with each draft batch. Standalone progress writes are
+    # throttled, so fast leads do not add one commit each outside the batch.
+    def on_progress(processed: int, total: int) -> None:
+        nonlocal last_progress_at
+        now = time.monotonic()
+        if 0 < processed < total and now - last_progress_at < settings.job_progress_interval:
+            return
+        last_progress_at = now
+        repository.update_progress(job_id, base_processed + processed, base_processed + total)
+
+    def on_checkpoint(lead_id: int, processed: int, counts: dict[str, int]) -> None:
+        repository.checkpoint(
+            job_id,
+            lead_id,
+            base_processed + processed,
+            base_created + counts["created"],
+            base_ignored + counts["ignored"],
+        )
+
+    def should_cancel() -> bool:
+        return bool(stop_event and stop_event.is_set()) or repository.is_cancel_requested(job_id)
+
+    try:
+        if job["kind"] != JOB_GENERATE_DRAFTS:
+            raise ValueError(f"Unknown job kind: {job['kind']}")
+        params = json.loads(job["params"] or "{}")
+        remaining = int(params.get("limit") or 0) - base_processed
+        if remaining > 0:
+            generate_drafts(
+                int(job["campaign_id"]),
+                remaining,
+                owner_key=job["owner_key"],
+                after_lead_id=job["checkpoint_lead_id"],
+                on_progress=on_progress,
+                on_checkpoint=on_checkpoint,
+                should_cancel=should_cancel,
+            )
+    except Exception as exc:
+        repository.finish(job_id, "failed", error=str(exc))
+        return "failed"
+
+    if repository.is_cancel_requested(job_id):
+        status = "cancelled"
+    elif stop_event and stop_event.is_set():
+        # Interrupted by shutdown: hand the job back so the next worker resumes from its checkpoint.
+        repository.release(job_id)
+        return "queued"
+    else:
+        status = "succeeded"
+    repository.finish(job_id, status)
+    return status
+
+
+class JobWorkerPool:
+    def __init__(self, workers: int | None = None, poll_interval: float | None = None) -> None:
+        self.workers = max(1, workers or settings.job_workers)
+        self.poll_interval = poll_interval or settings.job_poll_interval
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self.requeue_stale()
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"cold-ai-job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._stop.wait(timeout)
+
+    def requeue_stale(self) -> int:
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.job_stale_seconds)
+        return JobRepository().requeue_stale(stale_before.isoformat())
+
+    def run_until_empty(self) -> int:
+        self.requeue_stale()
+        completed = 0
+        repository = JobRepository()
+        while not self._stop.is_set():
+            job = repository.claim_next()
+            if job is None:
+                break
+            run_job(job, self._stop)
+            completed += 1
+        return completed
+
+    def _run(self) -> None:
+        repository = JobRepository()
+        while not self._stop.is_set():
+            # A database error must not end the worker thread; log it and poll again.
+            try:
+                job = repository.claim_next()
+                if job is not None:
+                    run_job(job, self._stop)
+                    continue
+            except Exception:
+                logger.exception("Job worker %s failed", threading.current_thread().name)
+            self._stop.wait(self.poll_interval)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import atexit
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+from ..config import settings
+
+CASSETTE_MODES = ("record", "replay")
+
+
+def _open_text(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+class LLMCassette:
+    def __init__(self, path: Path, mode: str = "replay", replay_latency: bool = False) -> None:
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Cassette mode must be one of: {', '.join(CASSETTE_MODES)}")
+        self.path = Path(path).absolute()
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self.stats: Counter[str] = Counter()
+        self._entries: dict[str, list[dict]] = defaultdict(list)
+        self._cursor: Counter[str] = Counter()
+        self._handle: IO[str] | None = None
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            if not self.path.exists():
+                raise FileNotFoundError(f"Cassette not found: {self.path}")
+            with _open_text(self.path, "r") as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["fp"]].append(entry)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def fingerprint(
+        provider: str,
+        models: tuple[str, ...],
+        system_prompt: str,
+        payload: dict,
+        temperature: float,
+    ) -> str:
+        # Base URL and API key are left out so a cassette recorded against one endpoint replays anywhere.
+        canonical = json.dumps(
+            [provider, list(models), system_prompt, payload, round(float(temperature), 3)],
+            ensure_ascii=False,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+    def record(self, key: str, result: dict | None, elapsed: float, model: str | None = None) -> None:
+        line = json.dumps(
+            {"fp": key, "ms": round(elapsed * 1000, 1), "model": model, "result": result},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        with self._lock:
+            if self._handle is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._handle = _open_text(self.path, "a")
+            self._handle.write(line + "\n")
+            self.stats["recorded"] += 1
+
+    def replay(self, key: str) -> tuple[dict | None, str | None]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.stats["misses"] += 1
+                return None, None
+            # Repeated identical requests replay in recorded order, then stick to the last answer.
+            entry = entries[min(self._cursor[key], len(entries) - 1)]
+            self._cursor[key] += 1
+            self.stats["replayed"] += 1
+        if self.replay_latency and entry.get("ms"):
+            time.sleep(float(entry["ms"]) / 1000)
+        return entry.get("result"), entry.get("model")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+_active_cassette: LLMCassette | None = None
+_active_cassette_loaded = False
+_active_cassette_lock = threading.Lock()
+
+
+def get_active_cassette() -> LLMCassette | None:
+    global _active_cassette, _active_cassette_loaded
+    if not _active_cassette_loaded:
+        with _active_cassette_lock:
+            if not _active_cassette_loaded:
+                if settings.llm_cassette_path:
+                    _active_cassette = LLMCassette(
+                        Path(settings.llm_cassette_path),
+                        mode=settings.llm_cassette_mode,
+                        replay_latency=settings.llm_cassette_replay_latency,
+                    )
+                    atexit.register(_active_cassette.close)
+                _active_cassette_loaded = True
+    return _active_cassette
+
+
+@contextmanager
+def use_cassette(path: Path, mode: str = "replay", replay_latency: bool = False) -> Iterator[LLMCassette]:
+    global _active_cassette, _active_cassette_loaded
+    cassette = LLMCassette(path, mode=mode, replay_latency=replay_latency)
+    with _active_cassette_lock:
+        previous, previous_loaded = _active_cassette, _active_cassette_loaded
+        _active_cassette, _active_cassette_loaded = cassette, True
+    try:
+        yield cassette
+    finally:
+        cassette.close()
+        with _active_cassette_lock:
+            _active_cassette, _active_cassette_loaded = previous, previous_loaded
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import json
+import time
 from urllib.parse import quote_plus
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
 from ..config import settings
+from ..metrics import LLM_REQUEST_SECONDS, LLM_REQUESTS_TOTAL
+from ..tracing import span
 from .ai_agent_runtime import AgentLLMConfig
+from .llm_cassette import get_active_cassette
+from .pipeline_timing import record_llm_attempt
 
 
 class LLMRouter:
@@ -14,6 +19,9 @@ class LLMRouter:
         return provider not in {"ollama", "vllm"}
 
     def available(self, runtime_config: AgentLLMConfig | None = None) -> bool:
+        cassette = get_active_cassette()
+        if cassette and cassette.replaying:
+            return True
         config = runtime_config
         provider = config.provider if config else "openai"
         api_key = config.api_key if config else settings.llm_api_key
@@ -101,30 +109,64 @@ class LLMRouter:
         models = config.models if config else settings.llm_models
         provider = config.provider if config else "openai"
 
+        cassette = get_active_cassette()
+        key = cassette.fingerprint(provider, tuple(models), system_prompt, payload, temperature) if cassette else ""
+        if cassette and cassette.replaying:
+            started = time.perf_counter()
+            with span("llm replay", "llm", provider=provider) as args:
+                result, model = cassette.replay(key)
+                args.update(model=model, outcome="replayed" if result is not None else "replay_miss")
+            record_llm_attempt(model, result is not None, time.perf_counter() - started)
+            LLM_REQUESTS_TOTAL.inc(provider, model or "", "replayed" if result is not None else "replay_miss")
+            return result
+
         if not models:
             return None
         if self._requires_api_key(provider) and not api_key:
             return None
 
+        started = time.perf_counter()
+        result, model = self._run_models(provider, models, system_prompt, payload, base_url, api_key, temperature)
+        if cassette:
+            cassette.record(key, result, time.perf_counter() - started, model=model)
+        return result
+
+    def _run_models(
+        self,
+        provider: str,
+        models: tuple[str, ...],
+        system_prompt: str,
+        payload: dict,
+        base_url: str,
+        api_key: str | None,
+        temperature: float,
+    ) -> tuple[dict | None, str | None]:
         user_prompt = json.dumps(payload, ensure_ascii=False)
 
-        for model in models:
-            try:
-                result = self._call_chat_completions(
-                    provider=provider,
-                    model=model,
-                    system_prompt=system_prompt,
-                    user_prompt=user_prompt,
-                    base_url=base_url,
-                    api_key=api_key,
-                    temperature=temperature,
-                )
-                if result:
-                    return result
-            except Exception:
-                continue
+        for attempt, model in enumerate(models, start=1):
+            started = time.perf_counter()
+            with span(f"llm {provider}:{model}", "llm", provider=provider, model=model, attempt=attempt) as args:
+                try:
+                    result = self._call_chat_completions(
+                        provider=provider,
+                        model=model,
+                        system_prompt=system_prompt,
+                        user_prompt=user_prompt,
+                        base_url=base_url,
+                        api_key=api_key,
+                        temperature=temperature,
+                    )
+                except Exception:
+                    result = None
+                args["outcome"] = "ok" if result else "error"
+            elapsed = time.perf_counter() - started
+            record_llm_attempt(model, bool(result), elapsed)
+            LLM_REQUESTS_TOTAL.inc(provider, model, "ok" if result else "error")
+            LLM_REQUEST_SECONDS.observe(elapsed, provider, model)
+            if result:
+                return result, model
 
-        return None
+        return None, None
 
     def _call_chat_completions(
         self,
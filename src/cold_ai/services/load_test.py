@@ -0,0 +1,438 @@
+from __future__ import annotations
+
+import gzip
+import http.client
+import json
+import os
+import queue
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from .pipeline_timing import percentile
+
+LOAD_TEST_USER_EMAIL = "loadtest@example.com"
+LOAD_TEST_USER_PASSWORD = "load-test-password"
+
+# Roughly what a reviewer does: mostly browsing campaigns and draft pages, then acting on drafts.
+DEFAULT_MIX = {
+    "list_campaigns": 20.0,
+    "campaign_details": 20.0,
+    "campaign_drafts": 20.0,
+    "approve": 14.0,
+    "reject": 6.0,
+    "update": 14.0,
+    "send_due": 6.0,
+}
+LOAD_TEST_ENDPOINTS = tuple(DEFAULT_MIX)
+
+UPDATE_SUBJECT = "A practical idea for your practice"
+UPDATE_BODY = (
+    "Hello Doctor,\n\nMany practices in your city use a short weekly routine to follow up with patients "
+    "between visits. Would you be open to a 15-minute call next week to see if it fits your practice?\n\nBest regards"
+)
+
+
+def parse_mix(values: list[str]) -> dict[str, float]:
+    mix = dict(DEFAULT_MIX)
+    for value in values:
+        name, separator, weight = value.partition("=")
+        name = name.strip().replace("-", "_")
+        if not separator or name not in DEFAULT_MIX:
+            raise ValueError(f"Mix entries look like name=weight with name in: {', '.join(LOAD_TEST_ENDPOINTS)}")
+        try:
+            mix[name] = float(weight)
+        except ValueError as error:
+            raise ValueError(f"Invalid weight for {name}: {weight}") from error
+    return mix
+
+
+@dataclass(frozen=True)
+class LoadTestConfig:
+    base_url: str
+    email: str = LOAD_TEST_USER_EMAIL
+    password: str = LOAD_TEST_USER_PASSWORD
+    rps: float = 20.0
+    duration_seconds: float = 30.0
+    concurrency: int = 16
+    mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    max_drafts: int = 2_000
+    timeout_seconds: float = 30.0
+    seed: int = 42
+
+    def __post_init__(self) -> None:
+        if self.rps <= 0 or self.duration_seconds <= 0:
+            raise ValueError("rps and duration must be positive")
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if any(weight < 0 for weight in self.mix.values()) or sum(self.mix.values()) <= 0:
+            raise ValueError("Mix weights must be non-negative and not all zero")
+
+
+def seed_load_test_database(
+    workdir: Path,
+    leads: int = 5_000,
+    campaigns: int = 3,
+    drafts_per_campaign: int = 500,
+    email: str = LOAD_TEST_USER_EMAIL,
+    password: str = LOAD_TEST_USER_PASSWORD,
+    seed: int = 42,
+) -> dict:
+    from .benchmark import _working_directory, _write_templates, generate_synthetic_leads
+
+    workdir.mkdir(parents=True, exist_ok=True)
+    with _working_directory(workdir):
+        from ..db import init_db
+        from ..repositories import UserRepository
+        from ..web.app import pwd_context
+        from .campaign_service import create_campaign
+        from .draft_service import generate_drafts
+        from .import_service import import_leads
+
+        init_db()
+        users = UserRepository()
+        if not users.get_by_email(email):
+            users.create(email=email, password_hash=pwd_context.hash(password), full_name="Load test")
+        leads_path = workdir / "leads.csv"
+        generate_synthetic_leads(leads_path, leads, seed=seed)
+        inserted, _skipped = import_leads(leads_path)
+        subject_path, body_path = _write_templates(workdir, None)
+        drafts = 0
+        for index in range(campaigns):
+            campaign_id = create_campaign(
+                f"Load test {index + 1}", subject_path, body_path, purpose="lead generation", channel="email"
+            )
+            created, _ignored = generate_drafts(campaign_id, drafts_per_campaign)
+            drafts += created
+    return {"leads": inserted, "campaigns": campaigns, "drafts": drafts}
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind((host, 0))
+        return int(probe.getsockname()[1])
+
+
+class UvicornProcess:
+    def __init__(self, workdir: Path, workers: int = 1, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.workdir = workdir
+        self.workers = max(1, workers)
+        self.host = host
+        self.port = port or _free_port(host)
+        self.log_path = workdir / "server.log"
+        self._process: subprocess.Popen | None = None
+        self._log = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, ready_timeout: float = 30.0) -> UvicornProcess:
+        package_root = str(Path(__file__).resolve().parents[2])
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [package_root, os.getenv("PYTHONPATH")]))}
+        command = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "cold_ai.web.app:create_app",
+            "--factory",
+            "--host",
+            self.host,
+            "--port",
+            str(self.port),
+            "--workers",
+            str(self.workers),
+            "--log-level",
+            "warning",
+        ]
+        self._log = self.log_path.open("w", encoding="utf-8")
+        # The database path is relative, so the server runs inside the seeded working directory.
+        # Dry-run sends print every message; only stderr (tracebacks, lock errors) is kept.
+        self._process = subprocess.Popen(
+            command, cwd=self.workdir, env=env, stdout=subprocess.DEVNULL, stderr=self._log
+        )
+        deadline = time.monotonic() + ready_timeout
+        while time.monotonic() < deadline:
+            returncode = self._process.poll()
+            if returncode is not None:
+                self.stop()
+                raise RuntimeError(f"uvicorn exited with code {returncode}; see {self.log_path}")
+            try:
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=1)
+                connection.request("GET", "/health")
+                if connection.getresponse().status == 200:
+                    connection.close()
+                    return self
+            except OSError:
+                pass
+            time.sleep(0.1)
+        self.stop()
+        raise RuntimeError(f"uvicorn did not become ready within {ready_timeout:.0f}s; see {self.log_path}")
+
+    def stop(self) -> None:
+        process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def __enter__(self) -> UvicornProcess:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+
+class _Client:
+    def __init__(self, base_url: str, timeout: float) -> None:
+        parts = urlsplit(base_url)
+        self._host = parts.hostname or "127.0.0.1"
+        self._port = parts.port or (443 if parts.scheme == "https" else 80)
+        self._https = parts.scheme == "https"
+        self._timeout = timeout
+        self._connection: http.client.HTTPConnection | None = None
+        self._cookie = ""
+        # Like the review UI in a browser, revalidate GETs with the last ETag seen for the URL.
+        self._etags: dict[str, str] = {}
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._connection is None:
+            factory = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+            self._connection = factory(self._host, self._port, timeout=self._timeout)
+        return self._connection
+
+    def request(self, method: str, path: str, payload: dict | None = None) -> tuple[int, bytes]:
+        headers = {"Accept-Encoding": "gzip"}
+        if self._cookie:
+            headers["Cookie"] = self._cookie
+        if method == "GET" and path in self._etags:
+            headers["If-None-Match"] = self._etags[path]
+        body = None
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        for attempt in (0, 1):
+            connection = self._connect()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # The server closed an idle keep-alive connection; reconnect once.
+                self.close()
+                if attempt:
+                    raise
+        if response.getheader("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        cookie = response.getheader("Set-Cookie")
+        if cookie:
+            self._cookie = cookie.split(";", 1)[0]
+        etag = response.getheader("ETag")
+        if method == "GET" and etag:
+            self._etags[path] = etag
+        return response.status, data
+
+    def json(self, method: str, path: str, payload: dict | None = None) -> dict:
+        status, data = self.request(method, path, payload)
+        if status >= 400:
+            raise RuntimeError(f"{method} {path} returned HTTP {status}: {data[:200]!r}")
+        return json.loads(data) if data else {}
+
+    def sign_in(self, email: str, password: str) -> None:
+        self.json("POST", "/auth/email/signin", {"email": email, "password": password})
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def _discover_targets(client: _Client, max_drafts: int) -> tuple[list[int], list[int]]:
+    status, data = client.request("GET", "/api/campaigns")
+    if status != 200:
+        raise RuntimeError(f"GET /api/campaigns returned HTTP {status}")
+    campaign_ids = [int(row["id"]) for row in json.loads(data)["campaigns"]]
+    draft_ids: list[int] = []
+    for campaign_id in campaign_ids:
+        cursor = None
+        while len(draft_ids) < max_drafts:
+            path = f"/api/campaigns/{campaign_id}/drafts?limit=200" + (f"&cursor={cursor}" if cursor else "")
+            page = client.json("GET", path)
+            draft_ids.extend(int(item["id"]) for item in page["items"])
+            cursor = page.get("next_cursor")
+            if not cursor:
+                break
+    return campaign_ids, draft_ids[:max_drafts]
+
+
+def _build_request(name: str, rng: random.Random, campaign_ids: list[int], draft_ids: list[int]) -> tuple:
+    campaign_id = rng.choice(campaign_ids)
+    if name == "list_campaigns":
+        return "GET", "/api/campaigns", None
+    if name == "campaign_details":
+        return "GET", f"/api/campaigns/{campaign_id}", None
+    if name == "campaign_drafts":
+        return "GET", f"/api/campaigns/{campaign_id}/drafts?status=draft&limit=50", None
+    if name == "send_due":
+        return "POST", f"/api/campaigns/{campaign_id}/send-due", {"dry_run": True}
+    draft_id = rng.choice(draft_ids)
+    if name == "approve":
+        return "POST", f"/api/drafts/{draft_id}/approve", {"scheduled_at": ""}
+    if name == "reject":
+        return "POST", f"/api/drafts/{draft_id}/reject", None
+    return "PATCH", f"/api/drafts/{draft_id}", {"subject": UPDATE_SUBJECT, "body": UPDATE_BODY}
+
+
+@dataclass
+class _Sample:
+    endpoint: str
+    status: int
+    latency: float
+    service: float
+    error: str | None = None
+
+
+def _latency_ms(values: list[float]) -> dict | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        "p50": round(percentile(ordered, 0.50) * 1000, 2),
+        "p90": round(percentile(ordered, 0.90) * 1000, 2),
+        "p95": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99": round(percentile(ordered, 0.99) * 1000, 2),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+
+def _summarize(samples: list[_Sample], elapsed: float) -> dict:
+    by_endpoint: dict[str, list[_Sample]] = {}
+    for sample in samples:
+        by_endpoint.setdefault(sample.endpoint, []).append(sample)
+
+    def block(group: list[_Sample]) -> dict:
+        errors = [sample for sample in group if sample.error or sample.status >= 400]
+        return {
+            "requests": len(group),
+            "errors": len(errors),
+            "error_rate": round(len(errors) / len(group), 4) if group else 0.0,
+            "statuses": dict(sorted(Counter(str(sample.status or "error") for sample in group).items())),
+            "latency_ms": _latency_ms([sample.latency for sample in group]),
+            "service_ms": _latency_ms([sample.service for sample in group]),
+            "error_samples": sorted({sample.error for sample in errors if sample.error})[:5],
+        }
+
+    return {
+        "overall": {**block(samples), "achieved_rps": round(len(samples) / elapsed, 2) if elapsed else None},
+        "endpoints": {name: block(group) for name, group in sorted(by_endpoint.items())},
+    }
+
+
+def run_load_test(config: LoadTestConfig, on_progress=None) -> dict:
+    setup = _Client(config.base_url, config.timeout_seconds)
+    try:
+        setup.sign_in(config.email, config.password)
+        campaign_ids, draft_ids = _discover_targets(setup, config.max_drafts)
+    finally:
+        setup.close()
+    if not campaign_ids:
+        raise RuntimeError("The target has no campaigns; seed the database first")
+    mix = {name: weight for name, weight in config.mix.items() if weight > 0}
+    if not draft_ids:
+        mix = {name: weight for name, weight in mix.items() if name not in {"approve", "reject", "update"}}
+        if not mix:
+            raise RuntimeError("The target has no drafts for the configured mix")
+
+    # Open loop: requests are issued on a fixed schedule whether or not earlier ones finished,
+    # and latency runs from the scheduled time, so queueing behind a slow server is not hidden.
+    pending: queue.Queue = queue.Queue()
+    samples: list[_Sample] = []
+    samples_lock = threading.Lock()
+
+    def worker() -> None:
+        client = _Client(config.base_url, config.timeout_seconds)
+        try:
+            client.sign_in(config.email, config.password)
+        except Exception as error:
+            with samples_lock:
+                samples.append(_Sample("sign_in", 0, 0.0, 0.0, f"{type(error).__name__}: {error}"))
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            scheduled, endpoint, method, path, payload = item
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            started = time.perf_counter()
+            status, error = 0, None
+            try:
+                status, data = client.request(method, path, payload)
+                if status >= 500:
+                    error = f"HTTP {status}: {data[:120].decode('utf-8', 'replace')}"
+            except Exception as exc:
+                client.close()
+                error = f"{type(exc).__name__}: {exc}"
+            finished = time.perf_counter()
+            with samples_lock:
+                samples.append(_Sample(endpoint, status, finished - scheduled, finished - started, error))
+        client.close()
+
+    threads = [
+        threading.Thread(target=worker, name=f"cold-ai-load-{index}", daemon=True) for index in range(config.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+
+    rng = random.Random(config.seed)
+    names, weights = list(mix), list(mix.values())
+    total = int(config.rps * config.duration_seconds)
+    interval = 1.0 / config.rps
+    started = time.perf_counter() + 0.5
+    for index in range(total):
+        scheduled = started + index * interval
+        # Keep the queue about a second ahead of the schedule so workers never starve.
+        while scheduled - time.perf_counter() > 1.0:
+            time.sleep(min(0.1, interval))
+        endpoint = rng.choices(names, weights)[0]
+        pending.put((scheduled, endpoint, *_build_request(endpoint, rng, campaign_ids, draft_ids)))
+        if on_progress and index and index % max(1, int(config.rps * 5)) == 0:
+            with samples_lock:
+                done = len(samples)
+            on_progress(done, total)
+    for _ in threads:
+        pending.put(None)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    requests = [sample for sample in samples if sample.endpoint != "sign_in"]
+    sign_in_errors = [sample.error for sample in samples if sample.endpoint == "sign_in"]
+    return {
+        "target": config.base_url,
+        "params": {
+            "rps": config.rps,
+            "duration_seconds": config.duration_seconds,
+            "concurrency": config.concurrency,
+            "mix": mix,
+            "seed": config.seed,
+        },
+        "targets": {"campaigns": len(campaign_ids), "drafts": len(draft_ids)},
+        "elapsed_seconds": round(elapsed, 3),
+        "sign_in_errors": sign_in_errors,
+        **_summarize(requests, elapsed),
+    }
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+MALFORMED_KINDS = ("not_json", "truncated", "wrong_schema", "empty")
+
+
+def mock_llm_reply(system_prompt: str, payload: dict) -> dict:
+    schema = payload.get("output_schema") or {}
+    lead = payload.get("lead") or payload.get("lead_context") or {}
+    specialty = str(lead.get("specialty") or "medical")
+    city = str(lead.get("city") or "Algeria")
+    draft = payload.get("draft") or {}
+    subject = str(draft.get("subject") or f"A practical idea for {specialty} teams")
+    body = str(draft.get("body") or "")
+    if len(body) < 160:
+        body = (
+            f"{body}\n\nMany {specialty} practices in {city} use a short weekly routine to follow up with patients "
+            "and partners. Would you be open to a 15-minute call next week to see if it fits your practice?"
+        ).strip()
+
+    if "query" in schema:
+        return {"query": f"{specialty} {city} doctor Algeria"}
+    if "routing_angle" in schema:
+        return {
+            "routing_angle": f"Patient follow-up workload for {specialty} in {city}",
+            "routing_cta": "Would you be open to a short 15-minute intro call next week?",
+        }
+    if "critique" in schema:
+        return {"subject": subject, "body": body, "critique": "Specific and concise; CTA is clear.", "confidence": 0.78}
+    if "status" in schema:
+        return {"status": "approved", "score": 0.82, "notes": "Personalized, credible, no hype."}
+    if "ping" in payload:
+        return {"ok": True}
+    return {"subject": subject, "body": body, "confidence": 0.81}
+
+
+@dataclass(frozen=True)
+class MockLLMConfig:
+    latency_ms: float = 0.0
+    latency_distribution: str = "fixed"
+    latency_jitter_ms: float = 0.0
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    malformed_rate: float = 0.0
+    failing_models: tuple[str, ...] = field(default=())
+    seed: int = 42
+
+    def __post_init__(self) -> None:
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_distribution must be one of: {', '.join(LATENCY_DISTRIBUTIONS)}")
+        for name in ("error_rate", "rate_limit_rate", "malformed_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if self.error_rate + self.rate_limit_rate + self.malformed_rate > 1.0:
+            raise ValueError("error_rate + rate_limit_rate + malformed_rate must not exceed 1")
+
+
+def _request_texts(provider: str, body: dict) -> tuple[str, str]:
+    if provider == "anthropic":
+        messages = body.get("messages") or [{}]
+        content = messages[-1].get("content") or ""
+        if isinstance(content, list):
+            content = "".join(str(block.get("text") or "") for block in content if isinstance(block, dict))
+        return str(body.get("system") or ""), str(content)
+    if provider == "gemini":
+        system_parts = (body.get("system_instruction") or {}).get("parts") or [{}]
+        user_parts = ((body.get("contents") or [{}])[-1].get("parts")) or [{}]
+        return str(system_parts[0].get("text") or ""), str(user_parts[0].get("text") or "")
+
+    system_prompt = ""
+    user_prompt = ""
+    for message in body.get("messages") or []:
+        if message.get("role") == "system":
+            system_prompt = str(message.get("content") or "")
+        elif message.get("role") == "user":
+            user_prompt = str(message.get("content") or "")
+    return system_prompt, user_prompt
+
+
+def _provider_response(provider: str, model: str, content: str) -> dict:
+    usage_in, usage_out = 180, max(1, len(content) // 4)
+    if provider == "anthropic":
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": content}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": usage_in, "output_tokens": usage_out},
+        }
+    if provider == "gemini":
+        return {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": content}]}, "finishReason": "STOP"}],
+            "usageMetadata": {
+                "promptTokenCount": usage_in,
+                "candidatesTokenCount": usage_out,
+                "totalTokenCount": usage_in + usage_out,
+            },
+            "modelVersion": model,
+        }
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": usage_in, "completion_tokens": usage_out, "total_tokens": usage_in + usage_out},
+    }
+
+
+def _error_response(provider: str, status: int, message: str) -> dict:
+    if provider == "anthropic":
+        kind = "rate_limit_error" if status == 429 else "api_error"
+        return {"type": "error", "error": {"type": kind, "message": message}}
+    if provider == "gemini":
+        return {"error": {"code": status, "message": message, "status": "RESOURCE_EXHAUSTED" if status == 429 else "INTERNAL"}}
+    return {"error": {"message": message, "type": "rate_limit_exceeded" if status == 429 else "server_error"}}
+
+
+class MockLLMServer:
+    def __init__(self, config: MockLLMConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or MockLLMConfig()
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> MockLLMServer:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="cold-ai-mock-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(5)
+            self._thread = None
+
+    def __enter__(self) -> MockLLMServer:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def _draw(self) -> tuple[float, float]:
+        config = self.config
+        with self._lock:
+            roll = self._rng.random()
+            if config.latency_distribution == "uniform":
+                latency = self._rng.uniform(
+                    config.latency_ms - config.latency_jitter_ms, config.latency_ms + config.latency_jitter_ms
+                )
+            elif config.latency_distribution == "exponential":
+                latency = self._rng.expovariate(1 / config.latency_ms) if config.latency_ms > 0 else 0.0
+            elif config.latency_distribution == "lognormal":
+                latency = (
+                    self._rng.lognormvariate(math.log(config.latency_ms), config.latency_sigma)
+                    if config.latency_ms > 0
+                    else 0.0
+                )
+            else:
+                latency = config.latency_ms
+        return roll, max(0.0, latency)
+
+    def _respond(self, provider: str, model: str, body: dict) -> tuple[int, dict, dict[str, str]]:
+        config = self.config
+        roll, latency_ms = self._draw()
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+        def count(outcome: str) -> None:
+            with self._lock:
+                self.stats["requests"] += 1
+                self.stats[outcome] += 1
+                self.stats[f"{provider}:{model}:{outcome}"] += 1
+
+        if model in config.failing_models or roll < config.error_rate:
+            count("error")
+            return 500, _error_response(provider, 500, "Injected server error"), {}
+        roll -= config.error_rate
+        if roll < config.rate_limit_rate:
+            count("rate_limited")
+            return 429, _error_response(provider, 429, "Injected rate limit"), {"Retry-After": "1"}
+        roll -= config.rate_limit_rate
+
+        system_prompt, user_prompt = _request_texts(provider, body)
+        try:
+            payload = json.loads(user_prompt) if user_prompt else {}
+        except ValueError:
+            payload = {}
+        reply = mock_llm_reply(system_prompt, payload if isinstance(payload, dict) else {})
+        content = json.dumps(reply, ensure_ascii=False)
+
+        if roll < config.malformed_rate:
+            count("malformed")
+            kind = MALFORMED_KINDS[int(roll / config.malformed_rate * len(MALFORMED_KINDS)) % len(MALFORMED_KINDS)]
+            if kind == "not_json":
+                content = "Sure! Here is the JSON you asked for: " + content
+            elif kind == "truncated":
+                content = content[: max(1, len(content) // 2)]
+            elif kind == "wrong_schema":
+                content = json.dumps({"result": reply}, ensure_ascii=False)
+            else:
+                content = ""
+        else:
+            count("ok")
+        return 200, _provider_response(provider, model, content), {}
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+            def _send_json(self, status: int, payload: dict, headers: dict[str, str] | None = None) -> None:
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                path = urlsplit(self.path).path
+                if path == "/health":
+                    self._send_json(200, {"ok": True})
+                elif path == "/stats":
+                    self._send_json(200, server.snapshot())
+                else:
+                    self._send_json(404, {"error": {"message": "Not found"}})
+
+            def do_POST(self) -> None:
+                path = unquote(urlsplit(self.path).path)
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send_json(400, {"error": {"message": "Request body is not JSON"}})
+                    return
+
+                if path.endswith("/chat/completions"):
+                    provider, model = "openai", str(body.get("model") or "")
+                elif path.endswith("/v1/messages"):
+                    provider, model = "anthropic", str(body.get("model") or "")
+                elif path.endswith(":generateContent") and "/models/" in path:
+                    provider, model = "gemini", path.rsplit("/models/", 1)[1].removesuffix(":generateContent")
+                else:
+                    self._send_json(404, {"error": {"message": f"Unknown endpoint {path}"}})
+                    return
+                self._send_json(*server._respond(provider, model, body))
+
+        return Handler
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from ..metrics import PIPELINE_STAGE_SECONDS
+from ..tracing import record_span
+
+# Stage order of one lead through generate_drafts; also the row order of the report.
+PIPELINE_STAGES = (
+    "prepare",
+    "research",
+    "template",
+    "memory",
+    "knowledge",
+    "routing",
+    "copywrite",
+    "rewrite",
+    "reflection",
+    "supervision",
+    "persist",
+)
+HISTOGRAM_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_active_timer: ContextVar[PipelineTimer | None] = ContextVar("cold_ai_pipeline_timer", default=None)
+
+
+def percentile(sorted_values: list[float], quantile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(quantile * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+class PipelineTimer:
+    def __init__(self) -> None:
+        self.stages_ms: dict[str, float] = defaultdict(float)
+        self.llm_attempts: Counter[str] = Counter()
+        self.llm_ms: dict[str, float] = defaultdict(float)
+        self.llm_models: dict[str, str] = {}
+        self.total_ms = 0.0
+        self._stage: str | None = None
+
+    # A timer can be entered more than once (drafting, then the batched write); only
+    # the time spent inside it counts towards total_ms, not the wait in between.
+    def __enter__(self) -> PipelineTimer:
+        self._token = _active_timer.set(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.total_ms += (time.perf_counter() - self._started) * 1000
+        _active_timer.reset(self._token)
+
+    def as_payload(self) -> dict:
+        return {
+            "timings_ms": {name: round(value, 3) for name, value in self.stages_ms.items()},
+            "total_ms": round(self.total_ms, 3),
+            "llm_attempts": dict(self.llm_attempts),
+            "llm_ms": {name: round(value, 3) for name, value in self.llm_ms.items()},
+            "llm_models": dict(self.llm_models),
+        }
+
+
+@contextmanager
+def pipeline_stage(name: str) -> Iterator[None]:
+    timer = _active_timer.get()
+    if timer is None:
+        yield
+        return
+    previous, timer._stage = timer._stage, name
+    started = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter_ns() - started) / 1e9
+        timer.stages_ms[name] += elapsed * 1000
+        timer._stage = previous
+        PIPELINE_STAGE_SECONDS.observe(elapsed, name)
+        record_span(name, "stage", started, elapsed * 1e6)
+
+
+def record_llm_attempt(model: str | None, ok: bool, elapsed: float = 0.0) -> None:
+    timer = _active_timer.get()
+    if timer is None:
+        return
+    stage = timer._stage or "other"
+    timer.llm_attempts[stage] += 1
+    timer.llm_ms[stage] += elapsed * 1000
+    if ok and model:
+        timer.llm_models[stage] = model
+
+
+def _histogram(values: list[float]) -> dict[str, int]:
+    buckets = {f"le_{bound:g}": 0 for bound in HISTOGRAM_BUCKETS_MS}
+    buckets["inf"] = 0
+    for value in values:
+        for bound in HISTOGRAM_BUCKETS_MS:
+            if value <= bound:
+                buckets[f"le_{bound:g}"] += 1
+                break
+        else:
+            buckets["inf"] += 1
+    return buckets
+
+
+def _distribution(values: list[float]) -> dict:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50": round(percentile(ordered, 0.50), 3),
+        "p90": round(percentile(ordered, 0.90), 3),
+        "p95": round(percentile(ordered, 0.95), 3),
+        "p99": round(percentile(ordered, 0.99), 3),
+        "max": round(ordered[-1], 3),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "total": round(sum(ordered), 3),
+        "histogram": _histogram(ordered),
+    }
+
+
+def summarize_pipeline(payloads: Iterable[dict]) -> dict:
+    stage_values: dict[str, list[float]] = defaultdict(list)
+    llm_values: dict[str, list[float]] = defaultdict(list)
+    totals: list[float] = []
+    attempts: Counter[str] = Counter()
+    answered: Counter[str] = Counter()
+    models: Counter[str] = Counter()
+    drafts = 0
+
+    for payload in payloads:
+        timings = payload.get("timings_ms")
+        if not isinstance(timings, dict):
+            continue
+        drafts += 1
+        for name, value in timings.items():
+            stage_values[name].append(float(value))
+        for name, value in (payload.get("llm_ms") or {}).items():
+            llm_values[name].append(float(value))
+        if payload.get("total_ms") is not None:
+            totals.append(float(payload["total_ms"]))
+        attempts.update(payload.get("llm_attempts") or {})
+        for stage, model in (payload.get("llm_models") or {}).items():
+            answered[stage] += 1
+            models[model] += 1
+
+    order = [name for name in PIPELINE_STAGES if name in stage_values]
+    order += sorted(name for name in stage_values if name not in PIPELINE_STAGES)
+    return {
+        "drafts": drafts,
+        "total_ms": _distribution(totals) if totals else None,
+        "stages": {name: _distribution(stage_values[name]) for name in order},
+        "llm": {
+            "attempts": dict(attempts),
+            "answered": dict(answered),
+            "latency_ms": {name: _distribution(values) for name, values in llm_values.items()},
+            "models": dict(models.most_common()),
+        },
+    }
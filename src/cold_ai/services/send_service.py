@@ -1,69 +1,104 @@
 from __future__ import annotations
 
+import time
+from collections.abc import Callable
 from datetime import datetime, timezone
+from functools import partial
 
-from ..repositories import DraftRepository, EventRepository, OutreachMemoryRepository
-from .email_provider import ConsoleEmailProvider, SMTPEmailProvider
+from ..metrics import MESSAGES_SENT_TOTAL, SEND_SECONDS
+from ..repositories import DraftRepository, EventRepository, OutreachMemoryRepository, Record, UnitOfWork
+from .email_provider import EmailProvider, SMTPEmailProvider, dry_run_email_provider
 from .outreach_memory import build_memory_seed
-from .whatsapp_provider import ConsoleWhatsAppProvider, UnconfiguredWhatsAppProvider
+from .whatsapp_provider import UnconfiguredWhatsAppProvider, WhatsAppProvider, dry_run_whatsapp_provider
 
 
-def send_due(dry_run: bool = False, campaign_id: int | None = None) -> tuple[int, int]:
-    now_iso = datetime.now(timezone.utc).isoformat()
-    drafts = DraftRepository().list_due(now_iso, campaign_id=campaign_id)
-    repository = DraftRepository()
-    event_repository = EventRepository()
-    memory_repository = OutreachMemoryRepository()
-    email_provider = ConsoleEmailProvider() if dry_run else SMTPEmailProvider()
-    whatsapp_provider = ConsoleWhatsAppProvider() if dry_run else UnconfiguredWhatsAppProvider()
+# Sends are not batched: a message already handed to the provider cannot be taken back, so its
+# outcome is committed before the next one goes out. A crash can then re-send at most the one
+# message in flight. The event, status and memory seed still share that single transaction.
+SEND_COMMIT_BATCH_SIZE = 1
 
-    sent = 0
-    failed = 0
 
-    for draft in drafts:
-        try:
-            channel = (draft.get("channel") or "email").lower()
-            if channel == "whatsapp":
-                to_phone = (draft.get("phone") or "").strip()
-                if not to_phone:
-                    raise ValueError("Missing lead phone number for WhatsApp draft")
-                whatsapp_provider.send(to_phone, draft["body"])
-                event_repository.log("whatsapp_sent", {"to": to_phone}, draft_id=draft["id"])
-            else:
-                to_email = (draft.get("email") or "").strip()
-                if not to_email:
-                    raise ValueError("Missing lead email for email draft")
-                email_provider.send(to_email, draft["subject"], draft["body"])
-                event_repository.log("email_sent", {"to": to_email}, draft_id=draft["id"])
+def _record_sent(draft: Record, event_type: str, recipient: str) -> None:
+    EventRepository().log(event_type, {"to": recipient}, draft_id=draft["id"])
+    DraftRepository().mark_sent(draft["id"])
+
+    memory_candidate = build_memory_seed(
+        context={
+            "owner_key": "global",
+            "channel": draft.get("channel") or "email",
+            "purpose": draft.get("purpose") or "",
+            "specialty": draft.get("specialty") or "",
+        },
+        subject=str(draft.get("subject") or ""),
+        body=str(draft.get("body") or ""),
+        score=0.82,
+        source_event="sent_success",
+    )
+    OutreachMemoryRepository().add_memory(
+        owner_key=memory_candidate.owner_key,
+        channel=memory_candidate.channel,
+        purpose=memory_candidate.purpose,
+        specialty=memory_candidate.specialty,
+        pattern_text=memory_candidate.pattern_text,
+        quality_score=memory_candidate.quality_score,
+        source_event=memory_candidate.source_event,
+    )
+
 
-            repository.mark_sent(draft["id"])
+def _record_failed(draft: Record, error: str) -> None:
+    DraftRepository().mark_failed(draft["id"], error)
+    EventRepository().log("send_failed", {"error": error, "channel": draft.get("channel") or "email"}, draft_id=draft["id"])
 
-            memory_candidate = build_memory_seed(
-                context={
-                    "owner_key": "global",
-                    "channel": draft.get("channel") or "email",
-                    "purpose": draft.get("purpose") or "",
-                    "specialty": draft.get("specialty") or "",
-                },
-                subject=str(draft.get("subject") or ""),
-                body=str(draft.get("body") or ""),
-                score=0.82,
-                source_event="sent_success",
-            )
-            memory_repository.add_memory(
-                owner_key=memory_candidate.owner_key,
-                channel=memory_candidate.channel,
-                purpose=memory_candidate.purpose,
-                specialty=memory_candidate.specialty,
-                pattern_text=memory_candidate.pattern_text,
-                quality_score=memory_candidate.quality_score,
-                source_event=memory_candidate.source_event,
-            )
 
-            sent += 1
-        except Exception as exc:
-            repository.mark_failed(draft["id"], str(exc))
-            event_repository.log("send_failed", {"error": str(exc), "channel": draft.get("channel") or "email"}, draft_id=draft["id"])
-            failed += 1
+def send_due(
+    dry_run: bool = False,
+    campaign_id: int | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    email_provider: EmailProvider | None = None,
+    whatsapp_provider: WhatsAppProvider | None = None,
+) -> tuple[int, int]:
+    now_iso = datetime.now(timezone.utc).isoformat()
+    drafts = DraftRepository().iter_due(now_iso, campaign_id=campaign_id)
+    if email_provider is None:
+        email_provider = dry_run_email_provider() if dry_run else SMTPEmailProvider()
+    if whatsapp_provider is None:
+        whatsapp_provider = dry_run_whatsapp_provider() if dry_run else UnconfiguredWhatsAppProvider()
+
+    sent = 0
+    failed = 0
+
+    # Every outcome is committed as soon as its message has gone out, outside the delivery
+    # try: a delivered draft must never wait in memory or be marked failed by a database error.
+    try:
+        with UnitOfWork(batch_size=SEND_COMMIT_BATCH_SIZE) as unit_of_work:
+            for draft in drafts:
+                channel = (draft.get("channel") or "email").lower()
+                started = time.perf_counter()
+                try:
+                    if channel == "whatsapp":
+                        to_phone = draft.get("phone_e164") or ""
+                        if not to_phone:
+                            raise ValueError("Missing lead phone number for WhatsApp draft")
+                        whatsapp_provider.send(to_phone, draft["body"])
+                        outcome = partial(_record_sent, draft, "whatsapp_sent", to_phone)
+                    else:
+                        to_email = (draft.get("email") or "").strip()
+                        if not to_email:
+                            raise ValueError("Missing lead email for email draft")
+                        email_provider.send(to_email, draft["subject"], draft["body"])
+                        outcome = partial(_record_sent, draft, "email_sent", to_email)
 
+                    sent += 1
+                    MESSAGES_SENT_TOTAL.inc(channel, "sent")
+                except Exception as exc:
+                    outcome = partial(_record_failed, draft, str(exc))
+                    failed += 1
+                    MESSAGES_SENT_TOTAL.inc(channel, "failed")
+                unit_of_work.add(outcome)
+                SEND_SECONDS.observe(time.perf_counter() - started, channel)
+                if on_progress:
+                    on_progress(sent, failed)
+    finally:
+        email_provider.flush()
+        whatsapp_provider.flush()
     return sent, failed
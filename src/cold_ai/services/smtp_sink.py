@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import math
+import random
+import socketserver
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from .delivery_capture import get_delivery_capture
+from .mock_llm import LATENCY_DISTRIBUTIONS
+
+SINK_HOSTNAME = "cold-ai-smtp-sink"
+
+
+@dataclass(frozen=True)
+class SMTPSinkConfig:
+    latency_ms: float = 0.0
+    latency_distribution: str = "fixed"
+    latency_jitter_ms: float = 0.0
+    latency_sigma: float = 0.5
+    connect_latency_ms: float = 0.0
+    reject_rate: float = 0.0
+    temp_failure_rate: float = 0.0
+    disconnect_rate: float = 0.0
+    max_message_bytes: int = 10 * 1024 * 1024
+    seed: int = 42
+
+    def __post_init__(self) -> None:
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_distribution must be one of: {', '.join(LATENCY_DISTRIBUTIONS)}")
+        for name in ("reject_rate", "temp_failure_rate", "disconnect_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if self.reject_rate + self.temp_failure_rate + self.disconnect_rate > 1.0:
+            raise ValueError("reject_rate + temp_failure_rate + disconnect_rate must not exceed 1")
+
+
+class _Disconnect(Exception):
+    pass
+
+
+class SMTPSinkServer:
+    def __init__(
+        self,
+        config: SMTPSinkConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        capture_path: Path | None = None,
+    ) -> None:
+        self.config = config or SMTPSinkConfig()
+        self.capture = get_delivery_capture(capture_path) if capture_path else None
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._server = socketserver.ThreadingTCPServer((host, port), self._handler_class(), bind_and_activate=False)
+        self._server.allow_reuse_address = True
+        self._server.daemon_threads = True
+        self._server.server_bind()
+        self._server.server_activate()
+
+    @property
+    def host(self) -> str:
+        return str(self._server.server_address[0])
+
+    @property
+    def port(self) -> int:
+        return int(self._server.server_address[1])
+
+    def start(self) -> SMTPSinkServer:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="cold-ai-smtp-sink", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(5)
+            self._thread = None
+        if self.capture:
+            self.capture.flush()
+
+    def __enter__(self) -> SMTPSinkServer:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[name] += amount
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _latency_ms(self) -> float:
+        config = self.config
+        with self._lock:
+            if config.latency_distribution == "uniform":
+                latency = self._rng.uniform(
+                    config.latency_ms - config.latency_jitter_ms, config.latency_ms + config.latency_jitter_ms
+                )
+            elif config.latency_distribution == "exponential":
+                latency = self._rng.expovariate(1 / config.latency_ms) if config.latency_ms > 0 else 0.0
+            elif config.latency_distribution == "lognormal":
+                latency = (
+                    self._rng.lognormvariate(math.log(config.latency_ms), config.latency_sigma)
+                    if config.latency_ms > 0
+                    else 0.0
+                )
+            else:
+                latency = config.latency_ms
+        return max(0.0, latency)
+
+    def _handler_class(self) -> type[socketserver.StreamRequestHandler]:
+        server = self
+        config = self.config
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, *lines: str) -> None:
+                text = "".join(
+                    f"{line[:3]}{'-' if index < len(lines) - 1 else ' '}{line[4:]}\r\n"
+                    for index, line in enumerate(lines)
+                )
+                self.wfile.write(text.encode("ascii"))
+                self.wfile.flush()
+
+            def read_line(self) -> str:
+                line = self.rfile.readline(65536)
+                if not line:
+                    raise _Disconnect
+                return line.decode("utf-8", "replace").rstrip("\r\n")
+
+            def read_data(self) -> bytes:
+                chunks: list[bytes] = []
+                size = 0
+                while True:
+                    line = self.rfile.readline(65536)
+                    if not line:
+                        raise _Disconnect
+                    if line in (b".\r\n", b".\n"):
+                        return b"".join(chunks)
+                    # Undo dot-stuffing (RFC 5321 4.5.2).
+                    if line.startswith(b"."):
+                        line = line[1:]
+                    size += len(line)
+                    if size <= config.max_message_bytes:
+                        chunks.append(line)
+
+            def handle(self) -> None:
+                server._count("connections")
+                if config.connect_latency_ms:
+                    time.sleep(config.connect_latency_ms / 1000)
+                self.reply(f"220 {SINK_HOSTNAME} ESMTP ready")
+                sender: str | None = None
+                recipients: list[str] = []
+                roll = 0.0
+                try:
+                    while True:
+                        line = self.read_line()
+                        verb, _, argument = line.partition(" ")
+                        verb = verb.upper()
+                        if verb == "EHLO":
+                            self.reply(
+                                f"250 {SINK_HOSTNAME}",
+                                "250 PIPELINING",
+                                "250 8BITMIME",
+                                "250 SMTPUTF8",
+                                f"250 SIZE {config.max_message_bytes}",
+                                "250 AUTH PLAIN LOGIN",
+                            )
+                        elif verb == "HELO":
+                            self.reply(f"250 {SINK_HOSTNAME}")
+                        elif verb == "AUTH":
+                            self.authenticate(argument)
+                        elif verb == "MAIL":
+                            sender = argument.partition(":")[2].split(" ", 1)[0].strip().strip("<>")
+                            recipients = []
+                            # One draw per message decides its fate, as in the mock LLM server.
+                            roll = server._roll()
+                            self.reply("250 2.1.0 OK")
+                        elif verb == "RCPT":
+                            if sender is None:
+                                self.reply("503 5.5.1 MAIL first")
+                            elif roll < config.reject_rate:
+                                server._count("rejected")
+                                self.reply("550 5.1.1 Injected failure: mailbox unavailable")
+                            else:
+                                recipients.append(argument.partition(":")[2].strip().strip("<>"))
+                                self.reply("250 2.1.5 OK")
+                        elif verb == "DATA":
+                            if not recipients:
+                                self.reply("554 5.5.1 No valid recipients")
+                                continue
+                            self.reply("354 End data with <CR><LF>.<CR><LF>")
+                            data = self.read_data()
+                            self.deliver(sender or "", recipients, data, roll - config.reject_rate)
+                            sender, recipients = None, []
+                        elif verb == "RSET":
+                            sender, recipients = None, []
+                            self.reply("250 2.0.0 OK")
+                        elif verb == "NOOP":
+                            self.reply("250 2.0.0 OK")
+                        elif verb == "QUIT":
+                            self.reply("221 2.0.0 Bye")
+                            return
+                        elif verb == "STARTTLS":
+                            self.reply("454 4.7.0 TLS not available; set COLD_AI_SMTP_STARTTLS=false")
+                        elif verb == "VRFY":
+                            self.reply("252 2.0.0 Cannot verify")
+                        else:
+                            self.reply("502 5.5.2 Command not recognized")
+                except (_Disconnect, ConnectionError):
+                    return
+
+            def authenticate(self, argument: str) -> None:
+                mechanism, _, initial = argument.partition(" ")
+                mechanism = mechanism.upper()
+                if mechanism == "PLAIN":
+                    if not initial:
+                        self.reply("334 ")
+                        self.read_line()
+                elif mechanism == "LOGIN":
+                    if not initial:
+                        self.reply("334 VXNlcm5hbWU6")
+                        self.read_line()
+                    self.reply("334 UGFzc3dvcmQ6")
+                    self.read_line()
+                else:
+                    self.reply("504 5.5.4 Unrecognized authentication type")
+                    return
+                # Any credentials are accepted; the sink only has to look like a real relay.
+                server._count("logins")
+                self.reply("235 2.7.0 Authentication successful")
+
+            def deliver(self, sender: str, recipients: list[str], data: bytes, roll: float) -> None:
+                if roll < config.disconnect_rate:
+                    server._count("disconnected")
+                    raise _Disconnect
+                roll -= config.disconnect_rate
+                latency_ms = server._latency_ms()
+                if latency_ms:
+                    time.sleep(latency_ms / 1000)
+                if roll < config.temp_failure_rate:
+                    server._count("temp_failed")
+                    self.reply("451 4.3.0 Injected failure: try again later")
+                    return
+                if len(data) > config.max_message_bytes:
+                    server._count("too_large")
+                    self.reply("552 5.3.4 Message too big")
+                    return
+                if server.capture:
+                    server.capture.capture_raw(sender, recipients, data)
+                server._count("accepted")
+                server._count("bytes", len(data))
+                self.reply(f"250 2.0.0 OK queued as {uuid.uuid4().hex[:12]}")
+
+        return Handler
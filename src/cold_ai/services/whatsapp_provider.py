@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+from pathlib import Path
+
+from ..config import settings
+from .delivery_capture import get_delivery_capture
+
 
 class WhatsAppProvider:
     def send(self, to_phone: str, body: str) -> None:
         raise NotImplementedError
 
+    def flush(self) -> None:
+        pass
+
 
 class ConsoleWhatsAppProvider(WhatsAppProvider):
     def send(self, to_phone: str, body: str) -> None:
@@ -14,6 +22,22 @@ class ConsoleWhatsAppProvider(WhatsAppProvider):
         print("=" * 80)
 
 
+class CaptureWhatsAppProvider(WhatsAppProvider):
+    def __init__(self, path: Path) -> None:
+        self.capture = get_delivery_capture(path)
+
+    def send(self, to_phone: str, body: str) -> None:
+        self.capture.capture_whatsapp(to_phone, body)
+
+    def flush(self) -> None:
+        self.capture.flush()
+
+
 class UnconfiguredWhatsAppProvider(WhatsAppProvider):
     def send(self, to_phone: str, body: str) -> None:
         raise ValueError("WhatsApp real sending is not configured yet. Use dry-run for WhatsApp campaigns.")
+
+
+def dry_run_whatsapp_provider(capture_path: Path | None = None) -> WhatsAppProvider:
+    path = capture_path or settings.dry_run_capture_path
+    return CaptureWhatsAppProvider(Path(path)) if path else ConsoleWhatsAppProvider()
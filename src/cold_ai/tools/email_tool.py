@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from ..services.email_provider import ConsoleEmailProvider, SMTPEmailProvider
+from ..services.email_provider import SMTPEmailProvider, dry_run_email_provider
 from .base import ToolResult
 
 
@@ -18,9 +18,10 @@ class EmailTool:
         if not to_email or not subject or not body:
             return ToolResult(ok=False, tool=self.name, data={}, error="Missing to/subject/body")
 
-        provider = ConsoleEmailProvider() if dry_run else SMTPEmailProvider()
+        provider = dry_run_email_provider() if dry_run else SMTPEmailProvider()
         try:
             provider.send(to_email, subject, body)
+            provider.flush()
             return ToolResult(ok=True, tool=self.name, data={"to": to_email, "dry_run": dry_run})
         except Exception as exc:
             return ToolResult(ok=False, tool=self.name, data={"to": to_email, "dry_run": dry_run}, error=str(exc))
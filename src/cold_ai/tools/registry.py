@@ -7,6 +7,7 @@ from collections import deque
 from typing import Any
 
 from ..config import settings
+from ..tracing import span
 from .base import AgentTool, ToolCallRecord, ToolPolicy, ToolResult
 
 TOOL_NAME_ALIASES = {
@@ -116,4 +117,7 @@ class ToolRegistry:
                 error=f"Loop protection blocked repeated call to {normalized}",
             )
 
-        return tool.run(payload)
+        with span(f"tool {normalized}", "tool", tool=normalized) as args:
+            result = tool.run(payload)
+            args["ok"] = result.ok
+        return result
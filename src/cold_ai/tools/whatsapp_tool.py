@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from ..services.whatsapp_provider import ConsoleWhatsAppProvider, UnconfiguredWhatsAppProvider
+from ..services.whatsapp_provider import UnconfiguredWhatsAppProvider, dry_run_whatsapp_provider
 from .base import ToolResult
 
 
@@ -17,9 +17,10 @@ class WhatsAppTool:
         if not to_phone or not body:
             return ToolResult(ok=False, tool=self.name, data={}, error="Missing to/body")
 
-        provider = ConsoleWhatsAppProvider() if dry_run else UnconfiguredWhatsAppProvider()
+        provider = dry_run_whatsapp_provider() if dry_run else UnconfiguredWhatsAppProvider()
         try:
             provider.send(to_phone, body)
+            provider.flush()
             return ToolResult(ok=True, tool=self.name, data={"to": to_phone, "dry_run": dry_run})
         except Exception as exc:
             return ToolResult(ok=False, tool=self.name, data={"to": to_phone, "dry_run": dry_run}, error=str(exc))
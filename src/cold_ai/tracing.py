@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import IO
+
+from .config import settings
+
+_active_trace: ContextVar[LeadTrace | None] = ContextVar("cold_ai_lead_trace", default=None)
+# Chrome trace timestamps are microseconds; anchor the monotonic clock to wall time once.
+_CLOCK_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+
+def _now_us(perf_ns: int | None = None) -> float:
+    return ((time.perf_counter_ns() if perf_ns is None else perf_ns) + _CLOCK_OFFSET_NS) / 1000
+
+
+class TraceWriter:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path).absolute()
+        self._handle: IO[str] | None = None
+        self._lock = threading.Lock()
+
+    # JSON Array Format: the closing bracket is optional, so traces from any number of
+    # runs append to one file that Perfetto and chrome://tracing open as is.
+    def write(self, events: list[dict]) -> None:
+        lines = "".join(json.dumps(event, ensure_ascii=False, default=str) + ",\n" for event in events)
+        with self._lock:
+            if self._handle is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._handle = self.path.open("a", encoding="utf-8")
+                if self._handle.tell() == 0:
+                    self._handle.write("[\n")
+                    self._handle.write(
+                        json.dumps(
+                            {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "cold-ai"}}
+                        )
+                        + ",\n"
+                    )
+            self._handle.write(lines)
+            self._handle.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+_trace_writer: TraceWriter | None = None
+_trace_writer_lock = threading.Lock()
+
+
+def get_trace_writer() -> TraceWriter:
+    global _trace_writer
+    if _trace_writer is None:
+        with _trace_writer_lock:
+            if _trace_writer is None:
+                _trace_writer = TraceWriter(Path(settings.trace_path))
+                atexit.register(_trace_writer.close)
+    return _trace_writer
+
+
+class LeadTrace:
+    def __init__(self, name: str, sampled: bool, **args: object) -> None:
+        self.name = name
+        self.sampled = sampled
+        self.args = dict(args)
+        self.events: list[dict] = []
+        self.duration_us = 0.0
+        self._pid = os.getpid()
+        self._root_open = True
+
+    # Entered once for drafting and again for the batched write, like PipelineTimer; the
+    # root span covers the first entry, later spans land on the same track.
+    def __enter__(self) -> LeadTrace:
+        self._token = _active_trace.set(self)
+        self._started_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        _active_trace.reset(self._token)
+        elapsed_us = (time.perf_counter_ns() - self._started_ns) / 1000
+        self.duration_us += elapsed_us
+        if self._root_open:
+            self._root_open = False
+            self.add(self.name, "lead", self._started_ns, elapsed_us, self.args)
+
+    def add(self, name: str, category: str, started_ns: int, duration_us: float, args: dict | None = None) -> None:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(_now_us(started_ns), 3),
+            "dur": round(duration_us, 3),
+            "pid": self._pid,
+            "tid": threading.get_native_id(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def finish(self) -> bool:
+        slow = settings.trace_slow_ms > 0 and self.duration_us >= settings.trace_slow_ms * 1000
+        if not (self.sampled or slow) or not self.events:
+            return False
+        get_trace_writer().write(self.events)
+        return True
+
+
+def start_lead_trace(name: str, **args: object) -> LeadTrace | None:
+    sampled = settings.trace_sample_rate > 0 and random.random() < settings.trace_sample_rate
+    # With a slow-lead threshold every lead is recorded and kept only if it turns out slow.
+    if not sampled and settings.trace_slow_ms <= 0:
+        return None
+    return LeadTrace(name, sampled, **args)
+
+
+def tracing_active() -> bool:
+    return _active_trace.get() is not None
+
+
+@contextmanager
+def span(name: str, category: str, **args: object) -> Iterator[dict]:
+    trace = _active_trace.get()
+    if trace is None:
+        yield args
+        return
+    started = time.perf_counter_ns()
+    try:
+        yield args
+    finally:
+        trace.add(name, category, started, (time.perf_counter_ns() - started) / 1000, args)
+
+
+def record_span(name: str, category: str, started_ns: int, duration_us: float, **args: object) -> None:
+    trace = _active_trace.get()
+    if trace is not None:
+        trace.add(name, category, started_ns, duration_us, args)
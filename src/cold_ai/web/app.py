@@ -1,28 +1,48 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterable, Iterator
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from pathlib import Path
 
 from authlib.integrations.starlette_client import OAuth
 from dateutil import parser
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import FileResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr, Field
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
 from ..config import settings
+from ..db import init_db
+from ..metrics import CACHE_REQUESTS_TOTAL, CONTENT_TYPE, HTTP_REQUEST_SECONDS, render_metrics
 from ..repositories import (
+    DRAFT_SORTS,
     AgentSettingsRepository,
     CampaignRepository,
+    CampaignStatsRepository,
     DraftRepository,
+    EventRepository,
+    JobRepository,
     OutreachMemoryRepository,
+    RevisionRepository,
     TemplateLibraryRepository,
     UserRepository,
 )
-from ..services.draft_service import generate_drafts
-from ..services.ai_agent_runtime import list_provider_options, resolve_agent_llm_config
+from ..services.approval_service import apply_approval, apply_rejection, bulk_apply
+from ..services.ai_agent_runtime import list_provider_options, resolve_agent_llm_config, save_agent_settings
+from ..services.draft_service import update_draft_content
+from ..services.job_service import JobWorkerPool, submit_generate_drafts
 from ..services.guardrails import (
     GuardrailError,
     validate_campaign_channel,
@@ -33,18 +53,29 @@ from ..services.guardrails import (
 )
 from ..services.llm_router import LLMRouter
 from ..services.send_service import send_due
+from .assets import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, Asset, AssetPipeline
 
-app = FastAPI(title="cold-AI Review UI", version="0.1.1")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    init_db()
+    await run_in_threadpool(assets.warm)
+    job_workers = JobWorkerPool() if settings.job_workers > 0 else None
+    if job_workers:
+        job_workers.start()
+    try:
+        yield
+    finally:
+        if job_workers:
+            job_workers.stop(timeout=30)
+
+
+router = APIRouter()
 
 WEB_DIR = Path(__file__).resolve().parent
 STATIC_DIR = WEB_DIR / "static"
 
-app.mount("/assets", StaticFiles(directory=str(STATIC_DIR)), name="assets")
-app.add_middleware(
-    SessionMiddleware,
-    secret_key=settings.session_secret,
-    max_age=settings.session_max_age_seconds,
-)
+assets = AssetPipeline(STATIC_DIR)
 
 oauth = OAuth()
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
@@ -68,10 +99,161 @@ def _to_utc_iso(value: str) -> str:
     return dt.astimezone(timezone.utc).isoformat()
 
 
+def _stream_json_list(fields: dict, key: str, rows: Iterable, chunk_size: int = 64 * 1024) -> StreamingResponse:
+    def encode() -> Iterator[bytes]:
+        head = json.dumps(fields, ensure_ascii=False, default=str)[:-1]
+        buffer = [head, ", " if fields else "", json.dumps(key), ": ["]
+        buffered = 0
+        for index, row in enumerate(rows):
+            item = json.dumps(dict(row), ensure_ascii=False, default=str)
+            buffer.append(f", {item}" if index else item)
+            buffered += len(item)
+            if buffered >= chunk_size:
+                yield "".join(buffer).encode("utf-8")
+                buffer, buffered = [], 0
+        buffer.append("]}")
+        yield "".join(buffer).encode("utf-8")
+
+    return StreamingResponse(encode(), media_type="application/json")
+
+
+# Part of every ETag so validators issued by a previous process (or for another database) never match.
+ETAG_EPOCH = uuid.uuid4().hex[:8]
+
+
+def _revision_validators(request: Request, resource: str) -> tuple[dict[str, str], bool]:
+    revision = RevisionRepository().get(resource) or {"revision": 0, "updated_at": None}
+    digest = hashlib.sha1(
+        f"{ETAG_EPOCH}|{resource}|{revision['revision']}|{request.url.query}".encode("utf-8")
+    ).hexdigest()[:20]
+    headers = {"ETag": f'"{digest}"', "Cache-Control": "private, no-cache"}
+
+    last_modified = parser.isoparse(revision["updated_at"]).replace(microsecond=0) if revision["updated_at"] else None
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+    not_modified = False
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        not_modified = headers["ETag"] in tags or "*" in tags
+    elif if_modified_since and last_modified:
+        try:
+            not_modified = last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            not_modified = False
+    CACHE_REQUESTS_TOTAL.inc("http_revalidation", "hit" if not_modified else "miss")
+    return headers, not_modified
+
+
+def _asset_response(request: Request, asset: Asset, immutable: bool = False) -> Response:
+    encoding, body = asset.negotiate(request.headers.get("accept-encoding"))
+    etag = f'"{asset.digest[:20]}-{encoding}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=asset.media_type, headers=headers)
+
+
+LIVE_EVENT_BATCH_SIZE = 500
+LIVE_KEEPALIVE_SECONDS = 15.0
+ACTIVE_JOB_STATUSES = {"queued", "running"}
+
+
+def _sse_message(event: str, data: dict, event_id: int | None = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, default=str))
+    return "\n".join(lines) + "\n\n"
+
+
+# Runs once per open stream and interval: a few indexed reads (see COLD_AI_LIVE_POLL_INTERVAL).
+def _poll_campaign_updates(
+    campaign_id: int,
+    after_event_id: int,
+    job_states: dict[int, tuple],
+    owner_key: str,
+) -> tuple[int, list[str]]:
+    messages: list[str] = []
+    event_repository = EventRepository()
+    latest_event_id = event_repository.latest_id()
+    if latest_event_id > after_event_id:
+        events = event_repository.list_for_campaign_between(
+            campaign_id, after_event_id, latest_event_id, limit=LIVE_EVENT_BATCH_SIZE
+        )
+        if len(events) == LIVE_EVENT_BATCH_SIZE:
+            latest_event_id = events[-1]["id"]
+        if events:
+            draft_repository = DraftRepository()
+            draft_ids = sorted({int(event["draft_id"]) for event in events})
+            data = {
+                "events": [{**event, "payload": json.loads(event["payload"] or "{}")} for event in events],
+                "drafts": [dict(row) for row in draft_repository.get_many(draft_ids)],
+                "status_counts": draft_repository.status_counts(campaign_id),
+                "stats": CampaignStatsRepository().get(campaign_id),
+            }
+            messages.append(_sse_message("drafts", data, event_id=latest_event_id))
+        after_event_id = latest_event_id
+
+    for job in JobRepository().list_for_campaign(campaign_id, limit=5):
+        if job.get("owner_key") != owner_key:
+            continue
+        state = (job["status"], job["processed"], job["total"], job["created"], job["ignored"])
+        known = job_states.get(job["id"])
+        job_states[job["id"]] = state
+        if known == state or (known is None and job["status"] not in ACTIVE_JOB_STATUSES):
+            continue
+        messages.append(_sse_message("job", {"job": job}))
+    return after_event_id, messages
+
+
+def _encode_cursor(row: dict, sort: str) -> str:
+    sort_value = row.get("id") if sort in {"id", "-id"} else row.get("supervisor_score")
+    if sort_value is None:
+        sort_value = -1
+    raw = json.dumps([sort_value, row.get("id")]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, draft_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return sort_value, int(draft_id)
+    except Exception as error:
+        raise HTTPException(status_code=422, detail="Invalid cursor") from error
+
+
 class ApproveDraftPayload(BaseModel):
     scheduled_at: str = ""
 
 
+class BulkDraftFilterPayload(BaseModel):
+    campaign_id: int
+    status: str | None = None
+    min_score: float | None = None
+    max_score: float | None = None
+    q: str | None = None
+
+
+class BulkDraftActionPayload(BaseModel):
+    action: str
+    ids: list[int] | None = None
+    filter: BulkDraftFilterPayload | None = None
+    scheduled_at: str = ""
+
+
 class SendDuePayload(BaseModel):
     dry_run: bool = True
 
@@ -172,30 +354,57 @@ def require_user(request: Request) -> dict:
     return user
 
 
-@app.get("/")
-def index():
-    return FileResponse(STATIC_DIR / "start.html")
+@router.get("/")
+def index(request: Request):
+    return _asset_response(request, assets.get("start.html"))
 
 
-@app.get("/app")
+@router.get("/app")
 def app_index(request: Request):
     if not request.session.get("user"):
         return RedirectResponse(url="/", status_code=303)
-    return FileResponse(STATIC_DIR / "index.html")
+    return _asset_response(request, assets.get("index.html"))
+
 
+@router.get("/assets/{name}", include_in_schema=False)
+def static_asset(name: str, request: Request):
+    resolved = assets.resolve(name)
+    if resolved is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    asset, immutable = resolved
+    return _asset_response(request, asset, immutable=immutable)
 
-@app.get("/api/me")
+
+@router.get("/api/me")
 def me(request: Request) -> dict:
     user = request.session.get("user")
     return {"authenticated": bool(user), "user": user}
 
 
-@app.get("/health")
+@router.get("/health")
 def health() -> dict:
     return {"ok": True, "service": "cold-ai-review-ui"}
 
 
-@app.get("/auth/providers")
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+
+# Without COLD_AI_METRICS_TOKEN, only clients on the same host may scrape.
+def _metrics_allowed(request: Request) -> bool:
+    if settings.metrics_token:
+        supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        return hmac.compare_digest(supplied.encode("utf-8"), settings.metrics_token.encode("utf-8"))
+    return bool(request.client and request.client.host in LOOPBACK_HOSTS)
+
+
+@router.get("/metrics")
+def metrics(request: Request) -> Response:
+    if not _metrics_allowed(request):
+        raise HTTPException(status_code=403, detail="Metrics access denied")
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+
+@router.get("/auth/providers")
 def auth_providers() -> dict:
     return {
         "google": bool(settings.oauth_google_client_id and settings.oauth_google_client_secret),
@@ -203,14 +412,18 @@ def auth_providers() -> dict:
     }
 
 
-@app.get("/api/campaigns")
-def list_campaigns(request: Request) -> dict:
+@router.get("/api/campaigns")
+def list_campaigns(request: Request) -> Response:
     require_user(request)
-    campaigns = CampaignRepository().list_all()
-    return {"campaigns": campaigns}
+    headers, not_modified = _revision_validators(request, "campaigns")
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response = _stream_json_list({}, "campaigns", CampaignRepository().iter_all())
+    response.headers.update(headers)
+    return response
 
 
-@app.post("/api/campaigns")
+@router.post("/api/campaigns")
 def create_campaign(payload: CreateCampaignPayload, request: Request) -> dict:
     require_user(request)
     try:
@@ -238,32 +451,171 @@ def create_campaign(payload: CreateCampaignPayload, request: Request) -> dict:
     return {"ok": True, "campaign_id": campaign_id}
 
 
-@app.get("/api/campaigns/{campaign_id}")
-def campaign_details(campaign_id: int, request: Request) -> dict:
+@router.get("/api/campaigns/{campaign_id}")
+def campaign_details(campaign_id: int, request: Request, response: Response) -> dict:
     require_user(request)
+    headers, not_modified = _revision_validators(request, f"campaign:{campaign_id}")
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
     campaign = CampaignRepository().get(campaign_id)
     if not campaign:
-        return {"campaign": None, "drafts": []}
+        return {"campaign": None, "status_counts": {}, "stats": None}
 
-    drafts = DraftRepository().list_for_campaign(campaign_id)
-    return {"campaign": campaign, "drafts": drafts}
+    stats = CampaignStatsRepository().get(campaign_id)
+    return {
+        "campaign": campaign,
+        "status_counts": DraftRepository().status_counts(campaign_id),
+        "stats": stats,
+    }
 
 
-@app.post("/api/drafts/{draft_id}/approve")
+@router.get("/api/campaigns/{campaign_id}/stats")
+def campaign_stats(campaign_id: int, request: Request) -> dict:
+    require_user(request)
+    stats = CampaignStatsRepository().get(campaign_id)
+    if not stats:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return {"stats": stats}
+
+
+@router.get("/api/campaigns/{campaign_id}/drafts")
+def list_campaign_drafts(
+    campaign_id: int,
+    request: Request,
+    status: str | None = None,
+    min_score: float | None = None,
+    max_score: float | None = None,
+    q: str | None = None,
+    sort: str = "id",
+    cursor: str | None = None,
+    limit: int = 50,
+) -> dict:
+    require_user(request)
+    if sort not in DRAFT_SORTS:
+        raise HTTPException(status_code=422, detail=f"Unsupported sort: {sort}")
+
+    page_size = max(1, min(limit, 200))
+    rows = DraftRepository().page_for_campaign(
+        campaign_id,
+        status=status if status and status != "all" else None,
+        min_score=min_score,
+        max_score=max_score,
+        query=q,
+        sort=sort,
+        after=_decode_cursor(cursor) if cursor else None,
+        limit=page_size + 1,
+    )
+    items = [dict(row) for row in rows[:page_size]]
+    has_more = len(rows) > page_size
+    return {
+        "items": items,
+        "next_cursor": _encode_cursor(items[-1], sort) if has_more and items else None,
+        "has_more": has_more,
+    }
+
+
+@router.get("/api/drafts")
+def get_drafts(request: Request, ids: str = "") -> dict:
+    require_user(request)
+    try:
+        draft_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail="ids must be a comma-separated list of integers") from error
+    if len(draft_ids) > 200:
+        raise HTTPException(status_code=422, detail="At most 200 ids per request")
+    return {"drafts": [dict(row) for row in DraftRepository().get_many(draft_ids)]}
+
+
+@router.get("/api/campaigns/{campaign_id}/events")
+async def campaign_events(campaign_id: int, request: Request) -> StreamingResponse:
+    owner_key = _owner_key_from_session_user(require_user(request))
+    if not await run_in_threadpool(CampaignRepository().get, campaign_id):
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        after_event_id = int(last_event_id)
+    else:
+        after_event_id = await run_in_threadpool(EventRepository().latest_id)
+
+    async def stream() -> AsyncIterator[str]:
+        cursor = after_event_id
+        job_states: dict[int, tuple] = {}
+        idle = 0.0
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            cursor, messages = await run_in_threadpool(
+                _poll_campaign_updates, campaign_id, cursor, job_states, owner_key
+            )
+            for message in messages:
+                yield message
+            if messages:
+                idle = 0.0
+            elif idle >= LIVE_KEEPALIVE_SECONDS:
+                yield ": keepalive\n\n"
+                idle = 0.0
+            await asyncio.sleep(settings.live_poll_interval)
+            idle += settings.live_poll_interval
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+BULK_MAX_IDS = 10000
+
+
+@router.post("/api/drafts/bulk")
+def bulk_draft_action(payload: BulkDraftActionPayload, request: Request) -> dict:
+    require_user(request)
+    if (payload.ids is None) == (payload.filter is None):
+        raise HTTPException(status_code=422, detail="Pass either ids or filter")
+    if payload.ids is not None and len(payload.ids) > BULK_MAX_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {BULK_MAX_IDS} ids per request")
+
+    selection = payload.filter.model_dump() if payload.filter else {}
+    try:
+        scheduled_at = _to_utc_iso(payload.scheduled_at)
+        outcomes = bulk_apply(
+            payload.action,
+            draft_ids=payload.ids,
+            campaign_id=selection.get("campaign_id"),
+            status=selection.get("status"),
+            min_score=selection.get("min_score"),
+            max_score=selection.get("max_score"),
+            query=selection.get("q"),
+            scheduled_at=scheduled_at,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error)) from error
+
+    return {
+        "ok": True,
+        "action": payload.action,
+        "matched": len(outcomes),
+        "updated": sum(1 for outcome in outcomes if outcome["outcome"] not in {"skipped", "not_found"}),
+        "outcomes": outcomes,
+    }
+
+
+@router.post("/api/drafts/{draft_id}/approve")
 def approve_draft(draft_id: int, payload: ApproveDraftPayload, request: Request) -> dict:
     require_user(request)
-    DraftRepository().approve_and_schedule(draft_id, _to_utc_iso(payload.scheduled_at))
+    apply_approval(draft_id, _to_utc_iso(payload.scheduled_at))
     return {"ok": True, "draft_id": draft_id}
 
 
-@app.post("/api/drafts/{draft_id}/reject")
+@router.post("/api/drafts/{draft_id}/reject")
 def reject_draft(draft_id: int, request: Request) -> dict:
     require_user(request)
-    DraftRepository().mark_rejected(draft_id)
+    apply_rejection(draft_id)
     return {"ok": True, "draft_id": draft_id}
 
 
-@app.patch("/api/drafts/{draft_id}")
+@router.patch("/api/drafts/{draft_id}")
 def update_draft(draft_id: int, payload: UpdateDraftPayload, request: Request) -> dict:
     require_user(request)
     try:
@@ -271,7 +623,7 @@ def update_draft(draft_id: int, payload: UpdateDraftPayload, request: Request) -
     except GuardrailError as error:
         raise HTTPException(status_code=422, detail=str(error)) from error
 
-    DraftRepository().update_content(
+    update_draft_content(
         draft_id=draft_id,
         subject=validated["subject"],
         body=validated["body"],
@@ -279,7 +631,7 @@ def update_draft(draft_id: int, payload: UpdateDraftPayload, request: Request) -
     return {"ok": True, "draft_id": draft_id}
 
 
-@app.post("/api/campaigns/{campaign_id}/send-due")
+@router.post("/api/campaigns/{campaign_id}/send-due")
 def send_due_campaign(campaign_id: int, payload: SendDuePayload, request: Request) -> dict:
     require_user(request)
     sent, failed = send_due(dry_run=payload.dry_run, campaign_id=campaign_id)
@@ -292,27 +644,59 @@ def send_due_campaign(campaign_id: int, payload: SendDuePayload, request: Reques
     }
 
 
-@app.post("/api/campaigns/{campaign_id}/generate-drafts")
+@router.post("/api/campaigns/{campaign_id}/generate-drafts", status_code=202)
 def generate_campaign_drafts(campaign_id: int, payload: GenerateDraftsPayload, request: Request) -> dict:
     session_user = require_user(request)
     owner_key = _owner_key_from_session_user(session_user)
-    created, ignored = generate_drafts(
-        campaign_id=campaign_id,
-        limit=max(1, payload.limit),
-        owner_key=owner_key,
-    )
+    try:
+        job_id = submit_generate_drafts(campaign_id, payload.limit, owner_key=owner_key)
+    except ValueError as error:
+        raise HTTPException(status_code=404, detail=str(error)) from error
     return {
         "ok": True,
         "campaign_id": campaign_id,
-        "created": created,
-        "ignored": ignored,
+        "job": JobRepository().get(job_id),
     }
 
 
-@app.get("/api/agent-settings")
-def get_agent_settings(request: Request) -> dict:
+# Jobs started from the CLI have no owner and are not visible to web users.
+def _job_for_owner(job_id: int, owner_key: str) -> dict:
+    job = JobRepository().get(job_id)
+    if not job or job.get("owner_key") != owner_key:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/api/campaigns/{campaign_id}/jobs")
+def list_campaign_jobs(campaign_id: int, request: Request) -> dict:
     session_user = require_user(request)
     owner_key = _owner_key_from_session_user(session_user)
+    jobs = JobRepository().list_for_campaign(campaign_id)
+    return {"jobs": [job for job in jobs if job.get("owner_key") == owner_key]}
+
+
+@router.get("/api/jobs/{job_id}")
+def get_job(job_id: int, request: Request) -> dict:
+    session_user = require_user(request)
+    return {"job": _job_for_owner(job_id, _owner_key_from_session_user(session_user))}
+
+
+@router.post("/api/jobs/{job_id}/cancel")
+def cancel_job(job_id: int, request: Request) -> dict:
+    session_user = require_user(request)
+    _job_for_owner(job_id, _owner_key_from_session_user(session_user))
+    cancelled = JobRepository().request_cancel(job_id)
+    return {"ok": cancelled, "job": JobRepository().get(job_id)}
+
+
+@router.get("/api/agent-settings")
+def get_agent_settings(request: Request, response: Response) -> dict:
+    session_user = require_user(request)
+    owner_key = _owner_key_from_session_user(session_user)
+    headers, not_modified = _revision_validators(request, f"agent_settings:{owner_key}")
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
     settings_row = AgentSettingsRepository().get_by_owner(owner_key) or {}
     llm_models = settings_row.get("llm_models") or list(settings.llm_models)
     llm_provider = settings_row.get("llm_provider") or "openai"
@@ -340,7 +724,7 @@ def get_agent_settings(request: Request) -> dict:
     }
 
 
-@app.put("/api/agent-settings")
+@router.put("/api/agent-settings")
 def update_agent_settings(payload: AgentSettingsPayload, request: Request) -> dict:
     session_user = require_user(request)
     owner_key = _owner_key_from_session_user(session_user)
@@ -349,8 +733,8 @@ def update_agent_settings(payload: AgentSettingsPayload, request: Request) -> di
     except GuardrailError as error:
         raise HTTPException(status_code=422, detail=str(error)) from error
 
-    AgentSettingsRepository().upsert_for_owner(
-        owner_key=owner_key,
+    save_agent_settings(
+        owner_key,
         llm_provider=validated["llm_provider"],
         llm_base_url=validated["llm_base_url"],
         llm_api_key=validated["llm_api_key"] or None,
@@ -365,7 +749,7 @@ def update_agent_settings(payload: AgentSettingsPayload, request: Request) -> di
     return {"ok": True}
 
 
-@app.post("/api/agent-settings/test")
+@router.post("/api/agent-settings/test")
 def test_agent_settings(payload: AgentSettingsTestPayload, request: Request) -> dict:
     session_user = require_user(request)
     owner_key = _owner_key_from_session_user(session_user)
@@ -387,10 +771,14 @@ def test_agent_settings(payload: AgentSettingsTestPayload, request: Request) ->
     return result
 
 
-@app.get("/api/outreach-memory")
-def list_outreach_memory(request: Request, limit: int = 20, channel: str | None = None) -> dict:
+@router.get("/api/outreach-memory")
+def list_outreach_memory(request: Request, response: Response, limit: int = 20, channel: str | None = None) -> dict:
     session_user = require_user(request)
     owner_key = _owner_key_from_session_user(session_user)
+    headers, not_modified = _revision_validators(request, f"outreach_memory:{owner_key}")
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
     items = OutreachMemoryRepository().list_by_owner(
         owner_key=owner_key,
         limit=max(1, min(limit, 100)),
@@ -399,7 +787,7 @@ def list_outreach_memory(request: Request, limit: int = 20, channel: str | None
     return {"items": items, "count": len(items)}
 
 
-@app.delete("/api/outreach-memory")
+@router.delete("/api/outreach-memory")
 def clear_outreach_memory(payload: OutreachMemoryClearPayload, request: Request) -> dict:
     session_user = require_user(request)
     owner_key = _owner_key_from_session_user(session_user)
@@ -410,7 +798,7 @@ def clear_outreach_memory(payload: OutreachMemoryClearPayload, request: Request)
     return {"ok": True, "deleted": deleted}
 
 
-@app.get("/api/templates/defaults")
+@router.get("/api/templates/defaults")
 def default_templates(request: Request) -> dict:
     require_user(request)
     templates_dir = WEB_DIR.parents[2] / "templates"
@@ -419,7 +807,7 @@ def default_templates(request: Request) -> dict:
     return {"subject_template": subject, "body_template": body}
 
 
-@app.get("/api/template-library")
+@router.get("/api/template-library")
 def list_template_library(request: Request) -> dict:
     session_user = require_user(request)
     owner_key = _owner_key_from_session_user(session_user)
@@ -427,7 +815,7 @@ def list_template_library(request: Request) -> dict:
     return {"entries": entries}
 
 
-@app.post("/api/template-library")
+@router.post("/api/template-library")
 def create_template_library_entry(payload: TemplateLibraryPayload, request: Request) -> dict:
     session_user = require_user(request)
     owner_key = _owner_key_from_session_user(session_user)
@@ -445,7 +833,7 @@ def create_template_library_entry(payload: TemplateLibraryPayload, request: Requ
     return {"ok": True, "entry_id": entry_id}
 
 
-@app.patch("/api/template-library/{entry_id}")
+@router.patch("/api/template-library/{entry_id}")
 def update_template_library_entry(entry_id: int, payload: TemplateLibraryPayload, request: Request) -> dict:
     session_user = require_user(request)
     owner_key = _owner_key_from_session_user(session_user)
@@ -466,7 +854,7 @@ def update_template_library_entry(entry_id: int, payload: TemplateLibraryPayload
     return {"ok": True, "entry_id": entry_id}
 
 
-@app.delete("/api/template-library/{entry_id}")
+@router.delete("/api/template-library/{entry_id}")
 def delete_template_library_entry(entry_id: int, request: Request) -> dict:
     session_user = require_user(request)
     owner_key = _owner_key_from_session_user(session_user)
@@ -476,7 +864,7 @@ def delete_template_library_entry(entry_id: int, request: Request) -> dict:
     return {"ok": True, "entry_id": entry_id}
 
 
-@app.post("/auth/email/signup")
+@router.post("/auth/email/signup")
 def auth_email_signup(request: Request, payload: EmailSignupPayload) -> dict:
     repo = UserRepository()
     email = payload.email.strip().lower()
@@ -500,7 +888,7 @@ def auth_email_signup(request: Request, payload: EmailSignupPayload) -> dict:
     return {"ok": True, "user": request.session["user"]}
 
 
-@app.post("/auth/email/signin")
+@router.post("/auth/email/signin")
 def auth_email_signin(request: Request, payload: EmailSigninPayload) -> dict:
     repo = UserRepository()
     email = payload.email.strip().lower()
@@ -518,7 +906,7 @@ def auth_email_signin(request: Request, payload: EmailSigninPayload) -> dict:
     return {"ok": True, "user": request.session["user"]}
 
 
-@app.post("/auth/email/change-password")
+@router.post("/auth/email/change-password")
 def auth_email_change_password(request: Request, payload: ChangePasswordPayload) -> dict:
     session_user = require_user(request)
     if session_user.get("provider") != "email":
@@ -540,7 +928,7 @@ def auth_email_change_password(request: Request, payload: ChangePasswordPayload)
     return {"ok": True}
 
 
-@app.get("/auth/login/google")
+@router.get("/auth/login/google")
 async def auth_login_google(request: Request):
     client = oauth.create_client("google")
     if not client:
@@ -549,7 +937,7 @@ async def auth_login_google(request: Request):
     return await client.authorize_redirect(request, redirect_uri)
 
 
-@app.get("/auth/callback/google")
+@router.get("/auth/callback/google")
 async def auth_callback_google(request: Request):
     client = oauth.create_client("google")
     if not client:
@@ -568,7 +956,52 @@ async def auth_callback_google(request: Request):
     return RedirectResponse(url="/app", status_code=303)
 
 
-@app.post("/auth/logout")
+@router.post("/auth/logout")
 def auth_logout(request: Request) -> dict:
     request.session.clear()
     return {"ok": True}
+
+
+# Pure ASGI rather than @app.middleware("http"), which would buffer streamed responses.
+class MetricsMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Label by route template, not raw path, to keep one series per endpoint.
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status),
+            )
+
+
+def create_app() -> FastAPI:
+    web_app = FastAPI(title="cold-AI Review UI", version="0.1.1", lifespan=lifespan)
+    # Static assets carry their own Content-Encoding, which GZipMiddleware leaves alone.
+    web_app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
+    web_app.add_middleware(
+        SessionMiddleware,
+        secret_key=settings.session_secret,
+        max_age=settings.session_max_age_seconds,
+    )
+    web_app.add_middleware(MetricsMiddleware)
+    web_app.include_router(router)
+    return web_app
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..metrics import CACHE_REQUESTS_TOTAL
+
+try:
+    import brotli
+except ImportError:  # optional: pip install "cold-ai[compression]"
+    brotli = None
+
+ASSET_URL_PREFIX = "/assets/"
+FINGERPRINTED_SUFFIXES = {".js", ".css"}
+COMPRESSIBLE_SUFFIXES = {".js", ".css", ".html", ".json", ".svg", ".txt"}
+COMPRESS_MIN_SIZE = 512
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]*$")
+_FINGERPRINTED_NAME = re.compile(r"^(?P<stem>.+)\.(?P<digest>[0-9a-f]{12})(?P<suffix>\.[A-Za-z0-9]+)$")
+_ASSET_REFERENCE = re.compile(r"""(?P<quote>["'])/assets/(?P<name>[A-Za-z0-9_.-]+)(?P=quote)""")
+
+
+@dataclass(frozen=True)
+class Asset:
+    name: str
+    url: str
+    media_type: str
+    digest: str
+    variants: dict[str, bytes]
+    stamp: tuple[int, int]
+    dependencies: tuple[tuple[str, str], ...] = field(default=())
+
+    def negotiate(self, accept_encoding: str | None) -> tuple[str, bytes]:
+        accepted = _accepted_encodings(accept_encoding or "")
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and (encoding in accepted or "*" in accepted):
+                return encoding, self.variants[encoding]
+        return "identity", self.variants["identity"]
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted: set[str] = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip() and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _compress(body: bytes) -> dict[str, bytes]:
+    variants = {"identity": body}
+    compressed = gzip.compress(body, compresslevel=9, mtime=0)
+    if len(compressed) < len(body):
+        variants["gzip"] = compressed
+    if brotli is not None:
+        compressed = brotli.compress(body, quality=11)
+        if len(compressed) < len(body):
+            variants["br"] = compressed
+    return variants
+
+
+# Assets are built on first use and rebuilt whenever the file on disk changes, so
+# editing app.js during development needs no build step.
+class AssetPipeline:
+    def __init__(self, directory: Path, url_prefix: str = ASSET_URL_PREFIX) -> None:
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self._assets: dict[str, Asset] = {}
+        self._lock = threading.RLock()
+
+    def get(self, name: str) -> Asset | None:
+        if not _SAFE_NAME.match(name):
+            return None
+        path = self.directory / name
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._assets.get(name)
+        if cached and cached.stamp == stamp and self._dependencies_fresh(cached):
+            CACHE_REQUESTS_TOTAL.inc("assets", "hit")
+            return cached
+        with self._lock:
+            cached = self._assets.get(name)
+            if cached and cached.stamp == stamp and self._dependencies_fresh(cached):
+                CACHE_REQUESTS_TOTAL.inc("assets", "hit")
+                return cached
+            CACHE_REQUESTS_TOTAL.inc("assets", "miss")
+            asset = self._build(name, path, stamp)
+            self._assets[name] = asset
+            return asset
+
+    def resolve(self, requested: str) -> tuple[Asset, bool] | None:
+        match = _FINGERPRINTED_NAME.match(requested)
+        if match:
+            asset = self.get(match.group("stem") + match.group("suffix"))
+            # A stale digest must not be cached forever under the current content.
+            if asset and asset.digest.startswith(match.group("digest")):
+                return asset, True
+        asset = self.get(requested)
+        return (asset, False) if asset else None
+
+    def warm(self) -> None:
+        for path in self.directory.iterdir():
+            if path.is_file():
+                self.get(path.name)
+
+    def _dependencies_fresh(self, asset: Asset) -> bool:
+        for name, digest in asset.dependencies:
+            current = self.get(name)
+            if current is None or current.digest != digest:
+                return False
+        return True
+
+    def _build(self, name: str, path: Path, stamp: tuple[int, int]) -> Asset:
+        body = path.read_bytes()
+        suffix = path.suffix.lower()
+        dependencies: list[tuple[str, str]] = []
+
+        if suffix == ".html":
+            text = body.decode("utf-8")
+
+            def rewrite(match: re.Match) -> str:
+                referenced = self.get(match.group("name")) if match.group("name") != name else None
+                if referenced is None:
+                    return match.group(0)
+                dependencies.append((referenced.name, referenced.digest))
+                return f"{match.group('quote')}{referenced.url}{match.group('quote')}"
+
+            body = _ASSET_REFERENCE.sub(rewrite, text).encode("utf-8")
+
+        digest = hashlib.sha256(body).hexdigest()
+        url = f"{self.url_prefix}{name}"
+        if suffix in FINGERPRINTED_SUFFIXES:
+            url = f"{self.url_prefix}{path.stem}.{digest[:12]}{path.suffix}"
+
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or suffix in {".js", ".json", ".svg"}:
+            media_type = f"{media_type}; charset=utf-8"
+
+        if suffix in COMPRESSIBLE_SUFFIXES and len(body) >= COMPRESS_MIN_SIZE:
+            variants = _compress(body)
+        else:
+            variants = {"identity": body}
+        return Asset(
+            name=name,
+            url=url,
+            media_type=media_type,
+            digest=digest,
+            variants=variants,
+            stamp=stamp,
+            dependencies=tuple(dependencies),
+        )
@@ -1,4 +1,4 @@
-import React, { useEffect, useMemo, useState } from "https://esm.sh/react@18.3.1";
+import React, { useEffect, useMemo, useRef, useState } from "https://esm.sh/react@18.3.1";
 import { createRoot } from "https://esm.sh/react-dom@18.3.1/client";
 
 async function api(path, options = {}) {
@@ -20,13 +20,75 @@ async function api(path, options = {}) {
   return response.json();
 }
 
+const DRAFT_PAGE_SIZE = 50;
+const DRAFT_BODY_BATCH_SIZE = 200;
+const DRAFT_ROW_HEIGHTS = { grid: 320, list: 280, compact: 200 };
+const DRAFT_CARD_MIN_WIDTH = 320;
+const DRAFT_OVERSCAN_ROWS = 2;
+const DEFAULT_DRAFT_FILTERS = { status: "all", minScore: "", sort: "id", query: "" };
+const JOB_POLL_INTERVAL_MS = 1500;
+const ACTIVE_JOB_STATUSES = ["queued", "running"];
+
+function jobProgressText(job) {
+  return `processed ${job.processed}/${job.total}, created=${job.created}, ignored=${job.ignored}`;
+}
+
+function draftQueryString(filters, cursor) {
+  const params = new URLSearchParams({ sort: filters.sort, limit: String(DRAFT_PAGE_SIZE) });
+  if (filters.status !== "all") {
+    params.set("status", filters.status);
+  }
+  if (String(filters.minScore).trim()) {
+    params.set("min_score", String(filters.minScore).trim());
+  }
+  if (filters.query.trim()) {
+    params.set("q", filters.query.trim());
+  }
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  return params.toString();
+}
+
+function summarizeDraft(draft) {
+  const { body, ...rest } = draft;
+  return { ...rest, body_preview: (body || "").slice(0, 180) };
+}
+
+function draftMatchesFilters(draft, filters) {
+  if (filters.status !== "all" && draft.status !== filters.status) {
+    return false;
+  }
+  const minScore = String(filters.minScore).trim();
+  if (minScore && !(Number(draft.supervisor_score ?? -1) >= Number(minScore))) {
+    return false;
+  }
+  const query = filters.query.trim().toLowerCase();
+  if (!query) {
+    return true;
+  }
+  const text = `${draft.full_name || ""} ${draft.email || ""} ${draft.phone || ""} ${draft.subject || ""} ${draft.specialty || ""} ${draft.city || ""}`.toLowerCase();
+  return text.includes(query);
+}
+
 function App() {
   const [activeTab, setActiveTab] = useState("campaigns");
   const [currentUser, setCurrentUser] = useState(null);
   const [campaigns, setCampaigns] = useState([]);
   const [templateEntries, setTemplateEntries] = useState([]);
   const [selectedCampaignId, setSelectedCampaignId] = useState(null);
-  const [campaignData, setCampaignData] = useState({ campaign: null, drafts: [] });
+  const [campaignData, setCampaignData] = useState({ campaign: null, status_counts: {} });
+  const [drafts, setDrafts] = useState([]);
+  const [draftCursor, setDraftCursor] = useState(null);
+  const [draftHasMore, setDraftHasMore] = useState(false);
+  const [draftsLoading, setDraftsLoading] = useState(false);
+  const [draftBodies, setDraftBodies] = useState({});
+  const [draftFilters, setDraftFilters] = useState(DEFAULT_DRAFT_FILTERS);
+  const draftGeneration = useRef(0);
+  const draftsLoadingRef = useRef(false);
+  const draftBodiesRef = useRef({});
+  const pendingDraftBodies = useRef(new Set());
+  draftBodiesRef.current = draftBodies;
 
   const [message, setMessage] = useState("");
   const [error, setError] = useState("");
@@ -37,6 +99,12 @@ function App() {
   const [showCreateModal, setShowCreateModal] = useState(false);
   const [showPasswordModal, setShowPasswordModal] = useState(false);
   const [draftLimit, setDraftLimit] = useState(100);
+  const [draftJob, setDraftJob] = useState(null);
+  const [liveCampaignId, setLiveCampaignId] = useState(null);
+  const draftJobRef = useRef(null);
+  const draftFiltersRef = useRef(DEFAULT_DRAFT_FILTERS);
+  const draftHasMoreRef = useRef(false);
+  const liveCampaignIdRef = useRef(null);
   const [passwordForm, setPasswordForm] = useState({
     current_password: "",
     new_password: "",
@@ -81,19 +149,22 @@ function App() {
 
   const selectedCampaign = campaignData.campaign;
 
-  const statusCounts = useMemo(() => {
-    const counts = { draft: 0, approved: 0, rejected: 0, sent: 0, failed: 0 };
-    for (const draft of campaignData.drafts) {
-      counts[draft.status] = (counts[draft.status] || 0) + 1;
-    }
-    return counts;
-  }, [campaignData.drafts]);
-
-  const selectedDraft = useMemo(
-    () => campaignData.drafts.find((draft) => draft.id === selectedDraftId) || null,
-    [campaignData.drafts, selectedDraftId],
+  const statusCounts = useMemo(
+    () => ({ draft: 0, approved: 0, rejected: 0, sent: 0, failed: 0, ...(campaignData.status_counts || {}) }),
+    [campaignData.status_counts],
   );
 
+  const selectedDraftBody = selectedDraftId != null ? draftBodies[selectedDraftId] : undefined;
+  const selectedDraft = useMemo(() => {
+    const draft = drafts.find((item) => item.id === selectedDraftId);
+    return draft ? { ...draft, body: selectedDraftBody } : null;
+  }, [drafts, selectedDraftId, selectedDraftBody]);
+
+  draftJobRef.current = draftJob;
+  draftFiltersRef.current = draftFilters;
+  draftHasMoreRef.current = draftHasMore;
+  liveCampaignIdRef.current = liveCampaignId;
+
   useEffect(() => {
     bootstrap();
   }, []);
@@ -117,14 +188,117 @@ function App() {
   }
 
   useEffect(() => {
-    if (selectedDraft) {
+    if (selectedDraftId != null) {
+      ensureDraftBodies([selectedDraftId]);
+    }
+  }, [selectedDraftId]);
+
+  useEffect(() => {
+    if (selectedDraft && selectedDraftBody !== undefined) {
       setEditorSubject(selectedDraft.subject || "");
-      setEditorBody(selectedDraft.body || "");
+      setEditorBody(selectedDraftBody || "");
       setPersonalizeOpener("");
       setPersonalizeCTA("");
       setPersonalizeResource("");
     }
-  }, [selectedDraftId]);
+  }, [selectedDraftId, selectedDraftBody === undefined]);
+
+  useEffect(() => {
+    if (!selectedCampaignId) {
+      return undefined;
+    }
+    const timer = setTimeout(() => reloadDrafts(selectedCampaignId, draftFilters), 250);
+    return () => clearTimeout(timer);
+  }, [draftFilters]);
+
+  useEffect(() => {
+    if (!selectedCampaignId) {
+      return undefined;
+    }
+    const source = new EventSource(`/api/campaigns/${selectedCampaignId}/events`);
+    source.onopen = () => setLiveCampaignId(selectedCampaignId);
+    source.onerror = () => setLiveCampaignId(null);
+    source.addEventListener("drafts", (event) => applyDraftDeltas(JSON.parse(event.data)));
+    source.addEventListener("job", (event) => applyJobUpdate(JSON.parse(event.data).job));
+    return () => {
+      source.close();
+      setLiveCampaignId(null);
+    };
+  }, [selectedCampaignId]);
+
+  // The live stream pushes every change for the open campaign. While it is not connected
+  // (blocked, buffered by a proxy, or reconnecting), refetch so the list never goes stale.
+  async function refreshUnlessLive(campaignId, draftId = null) {
+    if (!campaignId || liveCampaignIdRef.current === campaignId) {
+      return;
+    }
+    await openCampaign(campaignId);
+    if (draftId) {
+      setSelectedDraftId(draftId);
+    }
+  }
+
+  function applyDraftDeltas(data) {
+    const rows = data.drafts || [];
+    const filters = draftFiltersRef.current;
+    setCampaignData((prev) => ({
+      ...prev,
+      status_counts: data.status_counts || prev.status_counts,
+      stats: data.stats || prev.stats,
+    }));
+    setDraftBodies((prev) => {
+      const next = { ...prev };
+      for (const row of rows) {
+        next[row.id] = row.body || "";
+      }
+      return next;
+    });
+    setDrafts((prev) => {
+      const updates = new Map(rows.map((row) => [row.id, summarizeDraft(row)]));
+      const next = [];
+      for (const draft of prev) {
+        const update = updates.get(draft.id);
+        updates.delete(draft.id);
+        if (!update) {
+          next.push(draft);
+        } else if (draftMatchesFilters(update, filters)) {
+          next.push({ ...draft, ...update });
+        }
+      }
+      const added = [...updates.values()].filter((draft) => draftMatchesFilters(draft, filters));
+      if (filters.sort === "-id") {
+        return [...added.reverse(), ...next];
+      }
+      if (filters.sort === "id" && !draftHasMoreRef.current) {
+        return [...next, ...added];
+      }
+      // Score-sorted lists pick new drafts up on the next page load or filter change.
+      return next;
+    });
+  }
+
+  function applyJobUpdate(job) {
+    const previous = draftJobRef.current;
+    const active = ACTIVE_JOB_STATUSES.includes(job.status);
+    if (previous && previous.id !== job.id && !active) {
+      return;
+    }
+    setDraftJob(job);
+    if (active) {
+      setMessage(`Generating drafts (job #${job.id}): ${jobProgressText(job)}`);
+      return;
+    }
+    if (previous && previous.id === job.id && ACTIVE_JOB_STATUSES.includes(previous.status)) {
+      setMessage(`Draft generation ${job.status}: ${jobProgressText(job)}.`);
+      if (job.status === "failed" && job.error) {
+        setError(job.error);
+      }
+      loadCampaigns();
+      if (job.campaign_id === selectedCampaignId) {
+        refreshUnlessLive(job.campaign_id);
+      }
+    }
+  }
 
   async function loadCampaigns() {
     try {
@@ -266,15 +440,98 @@ function App() {
     }
   }
 
+  useEffect(() => {
+    if (!draftJob || !ACTIVE_JOB_STATUSES.includes(draftJob.status) || draftJob.campaign_id === liveCampaignId) {
+      return undefined;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const result = await api(`/api/jobs/${draftJob.id}`);
+        applyJobUpdate(result.job);
+      } catch (err) {
+        setError(String(err.message || err));
+      }
+    }, JOB_POLL_INTERVAL_MS);
+    return () => clearTimeout(timer);
+  }, [draftJob, liveCampaignId]);
+
+  async function loadCampaignSummary(campaignId) {
+    const data = await api(`/api/campaigns/${campaignId}`);
+    setCampaignData(data);
+    return data;
+  }
+
+  async function loadDraftPage(campaignId, filters, cursor) {
+    const generation = draftGeneration.current;
+    draftsLoadingRef.current = true;
+    setDraftsLoading(true);
+    try {
+      const data = await api(`/api/campaigns/${campaignId}/drafts?${draftQueryString(filters, cursor)}`);
+      if (generation !== draftGeneration.current) {
+        return;
+      }
+      setDrafts((prev) => (cursor ? [...prev, ...data.items] : data.items));
+      setDraftCursor(data.next_cursor || null);
+      setDraftHasMore(Boolean(data.has_more));
+    } catch (err) {
+      setError(String(err.message || err));
+    } finally {
+      if (generation === draftGeneration.current) {
+        draftsLoadingRef.current = false;
+        setDraftsLoading(false);
+      }
+    }
+  }
+
+  function reloadDrafts(campaignId = selectedCampaignId, filters = draftFilters) {
+    draftGeneration.current += 1;
+    setDrafts([]);
+    setDraftCursor(null);
+    setDraftHasMore(false);
+    return loadDraftPage(campaignId, filters, null);
+  }
+
+  function loadMoreDrafts() {
+    if (!draftHasMore || draftsLoadingRef.current || !selectedCampaignId) {
+      return;
+    }
+    loadDraftPage(selectedCampaignId, draftFilters, draftCursor);
+  }
+
+  async function ensureDraftBodies(ids) {
+    const missing = ids.filter(
+      (id) => !(id in draftBodiesRef.current) && !pendingDraftBodies.current.has(id),
+    );
+    for (let start = 0; start < missing.length; start += DRAFT_BODY_BATCH_SIZE) {
+      const batch = missing.slice(start, start + DRAFT_BODY_BATCH_SIZE);
+      batch.forEach((id) => pendingDraftBodies.current.add(id));
+      try {
+        const data = await api(`/api/drafts?ids=${batch.join(",")}`);
+        setDraftBodies((prev) => {
+          const next = { ...prev };
+          for (const draft of data.drafts || []) {
+            next[draft.id] = draft.body || "";
+          }
+          return next;
+        });
+      } catch (err) {
+        setError(String(err.message || err));
+      } finally {
+        batch.forEach((id) => pendingDraftBodies.current.delete(id));
+      }
+    }
+  }
+
   async function openCampaign(campaignId) {
     try {
       setBusy(true);
-      const data = await api(`/api/campaigns/${campaignId}`);
+      await loadCampaignSummary(campaignId);
       setSelectedCampaignId(campaignId);
-      setCampaignData(data);
       setMessage("");
       setError("");
       setSelectedDraftId(null);
+      setDraftBodies({});
+      await reloadDrafts(campaignId, draftFilters);
     } catch (err) {
       setError(String(err.message || err));
     } finally {
@@ -291,8 +548,7 @@ function App() {
       });
       setMessage(`Draft #${draftId} approved.`);
       setError("");
-      await openCampaign(selectedCampaignId);
-      setSelectedDraftId(draftId);
+      await refreshUnlessLive(selectedCampaignId, draftId);
     } catch (err) {
       setError(String(err.message || err));
     }
@@ -306,8 +562,7 @@ function App() {
       });
       setMessage(`Draft #${draftId} rejected.`);
       setError("");
-      await openCampaign(selectedCampaignId);
-      setSelectedDraftId(draftId);
+      await refreshUnlessLive(selectedCampaignId, draftId);
     } catch (err) {
       setError(String(err.message || err));
     }
@@ -327,8 +582,7 @@ function App() {
       });
       setMessage(`Draft #${selectedDraft.id} saved.`);
       setError("");
-      await openCampaign(selectedCampaignId);
-      setSelectedDraftId(selectedDraft.id);
+      await refreshUnlessLive(selectedCampaignId, selectedDraft.id);
     } catch (err) {
       setError(String(err.message || err));
     }
@@ -361,7 +615,7 @@ function App() {
       });
       setMessage(`Send complete (${dryRun ? "dry-run" : "real"}): sent=${result.sent}, failed=${result.failed}`);
       setError("");
-      await openCampaign(selectedCampaignId);
+      await refreshUnlessLive(selectedCampaignId);
     } catch (err) {
       setError(String(err.message || err));
     }
@@ -373,10 +627,49 @@ function App() {
         method: "POST",
         body: JSON.stringify({ limit: Number(draftLimit) || 100 }),
       });
-      setMessage(`Draft generation done: created=${result.created}, ignored=${result.ignored}.`);
+      setDraftJob(result.job);
+      setMessage(`Draft generation queued (job #${result.job.id}).`);
       setError("");
-      await loadCampaigns();
-      await openCampaign(campaignId);
+    } catch (err) {
+      setError(String(err.message || err));
+    }
+  }
+
+  async function bulkDraftAction(action) {
+    const label = action === "approve" ? "Approve" : "Reject";
+    if (!window.confirm(`${label} every draft matching the current filters?`)) {
+      return;
+    }
+    try {
+      const minScore = String(draftFilters.minScore).trim();
+      const result = await api("/api/drafts/bulk", {
+        method: "POST",
+        body: JSON.stringify({
+          action,
+          filter: {
+            campaign_id: selectedCampaignId,
+            status: draftFilters.status,
+            min_score: minScore ? Number(minScore) : null,
+            q: draftFilters.query.trim() || null,
+          },
+        }),
+      });
+      setMessage(`${action === "approve" ? "Approved" : "Rejected"} ${result.updated} of ${result.matched} matching drafts.`);
+      setError("");
+      await refreshUnlessLive(selectedCampaignId);
+    } catch (err) {
+      setError(String(err.message || err));
+    }
+  }
+
+  async function cancelDraftJob() {
+    if (!draftJob) {
+      return;
+    }
+    try {
+      const result = await api(`/api/jobs/${draftJob.id}/cancel`, { method: "POST" });
+      setDraftJob(result.job);
+      setMessage(`Cancelling draft generation (job #${draftJob.id})…`);
     } catch (err) {
       setError(String(err.message || err));
     }
@@ -414,7 +707,10 @@ function App() {
 
   function goHome() {
     setSelectedCampaignId(null);
-    setCampaignData({ campaign: null, drafts: [] });
+    setCampaignData({ campaign: null, status_counts: {} });
+    draftGeneration.current += 1;
+    setDrafts([]);
+    setDraftBodies({});
     setMessage("");
     setError("");
     setSelectedDraftId(null);
@@ -614,18 +910,30 @@ function App() {
 
         activeTab === "campaigns" && selectedCampaign && React.createElement(CampaignDetails, {
           campaign: selectedCampaign,
-          drafts: campaignData.drafts,
+          drafts,
+          activeDraft: selectedDraft,
+          draftBodies,
+          hasMoreDrafts: draftHasMore,
+          draftsLoading,
+          onLoadMoreDrafts: loadMoreDrafts,
+          onVisibleDraftsChange: ensureDraftBodies,
+          filters: draftFilters,
+          setFilters: setDraftFilters,
           selectedDraftId,
           setSelectedDraftId,
           statusCounts,
+          stats: campaignData.stats,
           sendMode,
           setSendMode,
           onSendDue: sendDue,
           onGenerateDrafts: generateDraftsForCampaign,
+          draftJob: draftJob && draftJob.campaign_id === selectedCampaign.id ? draftJob : null,
+          onCancelDraftJob: cancelDraftJob,
           draftLimit,
           setDraftLimit,
           onApprove: approveDraft,
           onReject: rejectDraft,
+          onBulkAction: bulkDraftAction,
           scheduleByDraft,
           setScheduleByDraft,
           editorSubject,
@@ -973,20 +1281,96 @@ function CampaignList({ campaigns, onOpen, draftLimit, setDraftLimit, onGenerate
   );
 }
 
+function VirtualDraftList({ items, viewMode, hasMore, loading, onLoadMore, onVisibleIdsChange, renderItem }) {
+  const scrollRef = useRef(null);
+  const [viewport, setViewport] = useState({ scrollTop: 0, height: 600, width: 800 });
+
+  useEffect(() => {
+    const element = scrollRef.current;
+    if (!element) {
+      return undefined;
+    }
+    const measure = () => setViewport((prev) => ({ ...prev, height: element.clientHeight, width: element.clientWidth }));
+    measure();
+    const observer = new ResizeObserver(measure);
+    observer.observe(element);
+    return () => observer.disconnect();
+  }, []);
+
+  const rowHeight = DRAFT_ROW_HEIGHTS[viewMode] || DRAFT_ROW_HEIGHTS.grid;
+  const columns = viewMode === "grid" ? Math.max(1, Math.floor(viewport.width / DRAFT_CARD_MIN_WIDTH)) : 1;
+  const rowCount = Math.ceil(items.length / columns);
+  const firstRow = Math.max(0, Math.floor(viewport.scrollTop / rowHeight) - DRAFT_OVERSCAN_ROWS);
+  const lastRow = Math.min(rowCount, Math.ceil((viewport.scrollTop + viewport.height) / rowHeight) + DRAFT_OVERSCAN_ROWS);
+  const visibleItems = items.slice(firstRow * columns, lastRow * columns);
+  const visibleKey = visibleItems.map((item) => item.id).join(",");
+
+  useEffect(() => {
+    if (!visibleItems.length) {
+      return undefined;
+    }
+    const timer = setTimeout(() => onVisibleIdsChange(visibleItems.map((item) => item.id)), 120);
+    return () => clearTimeout(timer);
+  }, [visibleKey]);
+
+  useEffect(() => {
+    if (hasMore && !loading && lastRow >= rowCount - DRAFT_OVERSCAN_ROWS) {
+      onLoadMore();
+    }
+  }, [lastRow, rowCount, hasMore, loading]);
+
+  const rows = [];
+  for (let row = firstRow; row < lastRow; row += 1) {
+    rows.push(React.createElement("div", {
+      key: row,
+      className: "virtual-row",
+      style: {
+        top: `${row * rowHeight}px`,
+        height: `${rowHeight}px`,
+        gridTemplateColumns: `repeat(${columns}, minmax(0, 1fr))`,
+      },
+    }, items.slice(row * columns, (row + 1) * columns).map(renderItem)));
+  }
+
+  return React.createElement("div", {
+    ref: scrollRef,
+    className: "virtual-scroll",
+    onScroll: (event) => {
+      const scrollTop = event.currentTarget.scrollTop;
+      setViewport((prev) => ({ ...prev, scrollTop }));
+    },
+  },
+    React.createElement("div", { className: "virtual-inner", style: { height: `${rowCount * rowHeight}px` } }, rows),
+    loading && React.createElement("div", { className: "muted virtual-loading" }, "Loading more drafts…")
+  );
+}
+
 function CampaignDetails({
   campaign,
   drafts,
+  activeDraft,
+  draftBodies,
+  hasMoreDrafts,
+  draftsLoading,
+  onLoadMoreDrafts,
+  onVisibleDraftsChange,
+  filters,
+  setFilters,
   selectedDraftId,
   setSelectedDraftId,
   statusCounts,
+  stats,
   sendMode,
   setSendMode,
   onSendDue,
   onGenerateDrafts,
+  draftJob,
+  onCancelDraftJob,
   draftLimit,
   setDraftLimit,
   onApprove,
   onReject,
+  onBulkAction,
   scheduleByDraft,
   setScheduleByDraft,
   editorSubject,
@@ -1002,23 +1386,8 @@ function CampaignDetails({
   setPersonalizeResource,
   onApplyQuickPersonalization,
 }) {
-  const [statusFilter, setStatusFilter] = useState("all");
-  const [query, setQuery] = useState("");
   const [viewMode, setViewMode] = useState("grid");
-
-  const visibleDrafts = useMemo(() => {
-    const lowered = query.trim().toLowerCase();
-    return drafts.filter((draft) => {
-      const statusOk = statusFilter === "all" || draft.status === statusFilter;
-      const text = `${draft.full_name || ""} ${draft.email || ""} ${draft.phone || ""} ${draft.subject || ""} ${draft.specialty || ""} ${draft.city || ""}`.toLowerCase();
-      const queryOk = !lowered || text.includes(lowered);
-      return statusOk && queryOk;
-    });
-  }, [drafts, statusFilter, query]);
-
-  const activeDraft = visibleDrafts.find((draft) => draft.id === selectedDraftId)
-    || drafts.find((draft) => draft.id === selectedDraftId)
-    || null;
+  const updateFilter = (name, value) => setFilters((prev) => ({ ...prev, [name]: value }));
 
   return React.createElement(React.Fragment, null,
     React.createElement("div", { className: "row", style: { marginBottom: "12px" } },
@@ -1027,7 +1396,9 @@ function CampaignDetails({
       React.createElement("span", { className: "pill" }, `Sent: ${statusCounts.sent || 0}`),
       React.createElement("span", { className: "pill" }, `Failed: ${statusCounts.failed || 0}`),
       React.createElement("span", { className: "pill" }, `Rejected: ${statusCounts.rejected || 0}`),
-      React.createElement("span", { className: "pill" }, `Channel: ${campaign.channel || "email"}`)
+      React.createElement("span", { className: "pill" }, `Channel: ${campaign.channel || "email"}`),
+      stats && stats.avg_supervisor_score != null
+        && React.createElement("span", { className: "pill" }, `Avg score: ${Number(stats.avg_supervisor_score).toFixed(2)}`)
     ),
 
     React.createElement("div", { className: "card", style: { padding: "12px", marginBottom: "12px" } },
@@ -1042,7 +1413,9 @@ function CampaignDetails({
           onChange: (event) => setDraftLimit(event.target.value),
           placeholder: "Draft limit",
         }),
-        React.createElement("button", { className: "btn btn-soft", onClick: () => onGenerateDrafts(campaign.id) }, "Generate Drafts"),
+        draftJob && ACTIVE_JOB_STATUSES.includes(draftJob.status)
+          ? React.createElement("button", { className: "btn btn-bad", onClick: onCancelDraftJob }, `Cancel (${draftJob.processed}/${draftJob.total})`)
+          : React.createElement("button", { className: "btn btn-soft", onClick: () => onGenerateDrafts(campaign.id) }, "Generate Drafts"),
         React.createElement("select", {
           className: "select",
           style: { maxWidth: "240px" },
@@ -1061,14 +1434,14 @@ function CampaignDetails({
         React.createElement("input", {
           className: "input",
           placeholder: "Search name, email/phone, subject…",
-          value: query,
-          onChange: (event) => setQuery(event.target.value),
+          value: filters.query,
+          onChange: (event) => updateFilter("query", event.target.value),
         }),
         React.createElement("select", {
           className: "select",
           style: { maxWidth: "170px" },
-          value: statusFilter,
-          onChange: (event) => setStatusFilter(event.target.value),
+          value: filters.status,
+          onChange: (event) => updateFilter("status", event.target.value),
         },
           React.createElement("option", { value: "all" }, "All statuses"),
           React.createElement("option", { value: "draft" }, "Draft"),
@@ -1077,6 +1450,30 @@ function CampaignDetails({
           React.createElement("option", { value: "failed" }, "Failed"),
           React.createElement("option", { value: "rejected" }, "Rejected")
         ),
+        React.createElement("input", {
+          className: "input",
+          style: { maxWidth: "130px" },
+          type: "number",
+          min: "0",
+          max: "1",
+          step: "0.05",
+          placeholder: "Min score",
+          value: filters.minScore,
+          onChange: (event) => updateFilter("minScore", event.target.value),
+        }),
+        React.createElement("select", {
+          className: "select",
+          style: { maxWidth: "170px" },
+          value: filters.sort,
+          onChange: (event) => updateFilter("sort", event.target.value),
+        },
+          React.createElement("option", { value: "id" }, "Oldest first"),
+          React.createElement("option", { value: "-id" }, "Newest first"),
+          React.createElement("option", { value: "-score" }, "Highest score"),
+          React.createElement("option", { value: "score" }, "Lowest score")
+        ),
+        React.createElement("button", { className: "btn btn-ok", onClick: () => onBulkAction("approve") }, "Approve matching"),
+        React.createElement("button", { className: "btn btn-bad", onClick: () => onBulkAction("reject") }, "Reject matching"),
         React.createElement("div", { className: "row" },
           React.createElement("button", { className: `btn ${viewMode === "grid" ? "btn-dark" : "btn-soft"}`, onClick: () => setViewMode("grid") }, "Grid"),
           React.createElement("button", { className: `btn ${viewMode === "list" ? "btn-dark" : "btn-soft"}`, onClick: () => setViewMode("list") }, "List"),
@@ -1086,32 +1483,43 @@ function CampaignDetails({
     ),
 
     React.createElement("div", { className: "draft-layout" },
-      React.createElement("div", { className: `draft-grid view-${viewMode}` },
-        !visibleDrafts.length
+      React.createElement("div", { className: `draft-list view-${viewMode}` },
+        !drafts.length && !draftsLoading
           ? React.createElement("div", { className: "card empty" }, "No drafts for this campaign.")
-          : visibleDrafts.map((draft) => React.createElement("div", {
-              key: draft.id,
-              className: `card draft-card clickable ${selectedDraftId === draft.id ? "active" : ""}`,
-              onClick: () => setSelectedDraftId(draft.id),
-            },
-              (() => {
+          : React.createElement(VirtualDraftList, {
+              key: `${campaign.id}:${JSON.stringify(filters)}`,
+              items: drafts,
+              viewMode,
+              hasMore: hasMoreDrafts,
+              loading: draftsLoading,
+              onLoadMore: onLoadMoreDrafts,
+              onVisibleIdsChange: onVisibleDraftsChange,
+              renderItem: (draft) => {
+                const body = draftBodies[draft.id] ?? draft.body_preview ?? "";
                 const recipient = campaign.channel === "whatsapp"
                   ? (draft.phone || draft.email || "-")
                   : (draft.email || draft.phone || "-");
-                return React.createElement("div", { className: "draft-top" },
-                  React.createElement("div", null,
-                    React.createElement("div", { className: "draft-name" }, draft.full_name || "-"),
-                    React.createElement("div", { className: "muted" }, recipient),
-                    React.createElement("div", { className: "muted" }, `${draft.specialty || "-"} / ${draft.city || "-"}`)
+                return React.createElement("div", {
+                  key: draft.id,
+                  className: `card draft-card clickable ${selectedDraftId === draft.id ? "active" : ""}`,
+                  onClick: () => setSelectedDraftId(draft.id),
+                },
+                  React.createElement("div", { className: "draft-top" },
+                    React.createElement("div", null,
+                      React.createElement("div", { className: "draft-name" }, draft.full_name || "-"),
+                      React.createElement("div", { className: "muted" }, recipient),
+                      React.createElement("div", { className: "muted" }, `${draft.specialty || "-"} / ${draft.city || "-"}`)
+                    ),
+                    React.createElement("span", { className: "status" },
+                      draft.supervisor_score != null ? `${draft.status} · ${Number(draft.supervisor_score).toFixed(2)}` : draft.status)
                   ),
-                  React.createElement("span", { className: "status" }, draft.status)
+                  React.createElement("div", { className: "draft-label" }, "Subject"),
+                  React.createElement("div", { className: "draft-subject" }, draft.subject),
+                  React.createElement("div", { className: "draft-label" }, "Body"),
+                  React.createElement("div", { className: "body-preview" }, viewMode === "compact" ? `${body.slice(0, 180)}${body.length > 180 ? "…" : ""}` : body)
                 );
-              })(),
-              React.createElement("div", { className: "draft-label" }, "Subject"),
-              React.createElement("div", { className: "draft-subject" }, draft.subject),
-              React.createElement("div", { className: "draft-label" }, "Body"),
-              React.createElement("div", { className: "body-preview" }, viewMode === "compact" ? `${(draft.body || "").slice(0, 180)}${(draft.body || "").length > 180 ? "…" : ""}` : draft.body)
-            ))
+              },
+            })
       ),
 
       React.createElement("div", { className: "card editor-card" },